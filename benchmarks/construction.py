@@ -0,0 +1,51 @@
+"""
+Measures how many rules per second can be built with the constructors and fluent setters, comparing the per-field
+validation of `Rule.set_if_valid` with validating the whole spec on every change (as it used to).
+
+    $ python -m benchmarks.construction
+"""
+from copy import deepcopy
+from datetime import datetime
+import timeit
+import turoboro
+from turoboro.rules import Rule
+
+
+def set_if_valid_whole_spec(self, field, value):
+    spec = deepcopy(self.spec)
+    spec[field] = value
+    self.validate_spec(spec)
+    self.spec = spec
+
+
+CASES = (
+    ('DailyRule', lambda: turoboro.DailyRule(
+        datetime(2014, 1, 1), end_on=datetime(2015, 1, 1), every_nth_day=2, except_weekdays=turoboro.WEEKEND,
+        except_months=(turoboro.JULY,), on_hour=8
+    )),
+    ('WeeklyRule', lambda: turoboro.WeeklyRule(
+        datetime(2014, 1, 1), turoboro.WEEKEND, repeat_n_times=10, every_nth_week=2, on_hour=8
+    )),
+    ('MonthlyRule', lambda: turoboro.MonthlyRule(
+        datetime(2014, 1, 1), weekday_count=2, weekday=turoboro.TUESDAY, every_nth_month=3, on_hour=8
+    )),
+    ('DailyRule, fluent', lambda: turoboro.DailyRule(datetime(2014, 1, 1)).every_nth_day(3).on_hour(9).except_months(
+        turoboro.JUNE).end_on(datetime(2015, 1, 1))),
+)
+
+
+def main(number=2000):
+    fast_set_if_valid = Rule.set_if_valid
+    print('%-20s %16s %16s %8s' % ('', 'whole spec', 'per field', 'speedup'))
+    for name, build in CASES:
+        Rule.set_if_valid = set_if_valid_whole_spec
+        try:
+            whole_spec = number / timeit.timeit(build, number=number)
+        finally:
+            Rule.set_if_valid = fast_set_if_valid
+        per_field = number / timeit.timeit(build, number=number)
+        print('%-20s %12.0f/sec %12.0f/sec %7.1fx' % (name, whole_spec, per_field, per_field / whole_spec))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Measures how many JSONL rule specs per second can be loaded into rules, comparing `turoboro.loader` (in this process,
+memory-mapped and on all cores) with calling `Rule.from_spec` per line through the factories as they used to be, which
+built a throwaway rule from `datetime.utcnow()` and validated the spec twice. The same catalog is then loaded from
+binary records with `turoboro.binary`.
+
+    $ python -m benchmarks.load_catalog [number of specs]
+"""
+from datetime import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import turoboro
+import turoboro.binary
+import turoboro.loader
+
+
+def old_factory(cls, spec):
+    """ The factories as they were before specs were validated once """
+    if cls is turoboro.WeeklyRule:
+        rule = cls(datetime.utcnow(), (0,))
+    elif cls is turoboro.MonthlyRule:
+        rule = cls(datetime.utcnow(), day_of_month=1)
+    else:
+        rule = cls(datetime.utcnow())
+    if rule.validate_spec(spec):
+        rule.spec = spec
+    return rule
+
+
+def old_load(path):
+    rules = []
+    with open(path) as f:
+        for line in f:
+            spec = json.loads(line)
+            rules.append(old_factory(turoboro.Rule.rule_class(spec['rule']), spec))
+    return rules
+
+
+def write_catalog(path, count):
+    rules = (
+        turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=2, except_weekdays=turoboro.WEEKEND, on_hour=8),
+        turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, every_nth_week=2, timezone='Europe/Stockholm'),
+        turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=2, weekday=turoboro.TUESDAY, repeat_n_times=12),
+    )
+    lines = [repr(rule) + '\n' for rule in rules]
+    with open(path, 'w') as f:
+        for n in range(count):
+            f.write(lines[n % len(lines)])
+
+
+def timed(name, count, function):
+    started = time.time()
+    rules = function()
+    elapsed = time.time() - started
+    assert len(rules) == count
+    print('%-36s %8.2fs %12.0f specs/sec' % (name, elapsed, count / elapsed))
+    return rules
+
+
+def main(count=100000):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'catalog.jsonl')
+        write_catalog(path, count)
+        print('%d specs' % count)
+        expected = [repr(rule) for rule in timed('from_spec per line (old factories)', count, lambda: old_load(path))]
+        for name, kwargs in (
+            ('loader.load_catalog', {}),
+            ('loader.load_catalog(use_mmap=True)', {'use_mmap': True}),
+            ('loader.load_catalog(processes=0)', {'processes': 0}),
+        ):
+            rules = timed(name, count, lambda: turoboro.loader.load_catalog(path, **kwargs)[0])
+            assert [repr(rule) for rule in rules] == expected
+
+        binary_path = os.path.join(directory, 'catalog.bin')
+        with open(binary_path, 'wb') as f:
+            f.write(turoboro.binary.dumps(rules))
+        print('%d bytes as JSONL, %d bytes as binary records' % (os.path.getsize(path), os.path.getsize(binary_path)))
+        for name, validate in (('binary.load', True), ('binary.load(validate=False)', False)):
+            rules = timed(name, count, lambda: list(turoboro.binary.load(binary_path, validate)))
+            assert [repr(rule) for rule in rules] == expected
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""
+Measures how expanding JSON specs with turoboro.parallel scales with the number of worker processes.
+
+    $ python -m benchmarks.parallel_expand [number of specs]
+"""
+from datetime import datetime
+import multiprocessing
+import sys
+import time
+import turoboro
+import turoboro.parallel
+
+
+def make_specs(count):
+    specs = []
+    for n in range(count):
+        if n % 2:
+            rule = turoboro.DailyRule(datetime(2014, 1, n % 28 + 1), every_nth_day=n % 5 + 1, on_hour=n % 24,
+                                      except_months=(turoboro.JULY,) if n % 3 else None)
+        else:
+            rule = turoboro.WeeklyRule(datetime(2014, 1, n % 28 + 1), (n % 7, (n + 3) % 7), every_nth_week=n % 4 + 1)
+        specs.append(repr(rule))
+    return specs
+
+
+def main(count=20000):
+    specs = make_specs(count)
+    window = (datetime(2019, 1, 1), datetime(2019, 4, 1))
+
+    started = time.time()
+    rules = [turoboro.Rule.from_spec(spec) for spec in specs]
+    turoboro.compute_many(rules, *window, return_as=turoboro.POSIX)
+    single = time.time() - started
+    print('%-12s %8.2fs %10.0f specs/s' % ('in process', single, count / single))
+
+    for workers in sorted(set([1, 2, 4, multiprocessing.cpu_count()])):
+        with turoboro.parallel.ParallelExpander(max_workers=workers, chunk_size=500) as expander:
+            started = time.time()
+            for _ in expander.expand(specs, *window):
+                pass
+            elapsed = time.time() - started
+        print('%-12s %8.2fs %10.0f specs/s %6.1fx' % ('%d workers' % workers, elapsed, count / elapsed,
+                                                        single / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,59 @@
+"""
+Measures how many POSIX timestamps per second a rule produces, comparing the native path (straight from day ordinals
+to integers) with formatting an aware datetime per occurrence through `Rule.repr_dt` as it used to.
+
+    $ python -m benchmarks.posix_output [number of occurrences]
+"""
+from datetime import datetime
+import sys
+import time
+import turoboro
+import turoboro.common
+import turoboro.tz
+
+try:
+    import turoboro.vectorized
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def old_repr_dt(dt, to=turoboro.ISO, timezone=turoboro.tz.timezone('UTC')):
+    """ `Rule.repr_dt` as it was before POSIX timestamps were produced natively """
+    try:
+        localized_dt = timezone.localize(dt)
+    except ValueError:  # dt is probably already localized
+        localized_dt = dt
+    dt = localized_dt.astimezone(turoboro.tz.UTC)
+    return turoboro.common.convert_datetime_to(dt, to)
+
+
+def timed(name, count, function):
+    started = time.time()
+    timestamps = function()
+    elapsed = time.time() - started
+    assert len(timestamps) == count
+    print('%-36s %8.2fs %14.0f/sec' % (name, elapsed, count / elapsed))
+    return timestamps
+
+
+def main(count=1000000):
+    rule = turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=count, on_hour=8, timezone='Europe/Stockholm')
+    timezone = rule.timezone
+
+    print('%d POSIX timestamps' % count)
+    expected = timed('datetime per occurrence (repr_dt)', count, lambda: [
+        old_repr_dt(dt, turoboro.POSIX, timezone)
+        for dt in rule.compute(return_as=turoboro.DATETIME_INSTANCE).datetimes
+    ])
+    native = timed('compute(return_as=POSIX).all', count, lambda: rule.compute(return_as=turoboro.POSIX).all)
+    iterated = timed('list(result(return_as=POSIX))', count, lambda: list(rule.result(return_as=turoboro.POSIX)))
+    assert native == iterated == expected
+    if numpy is not None:
+        vectorized = timed('vectorized.compute(...).all', count,
+                           lambda: turoboro.vectorized.compute(rule, return_as=turoboro.POSIX).all)
+        assert vectorized == expected
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,52 @@
+"""
+Measures the cost of a tick of a polling loop over many rules, comparing asking every rule for its next occurrence on
+every tick (as with `compute(from_dt=now)`) with popping the due occurrences off a `turoboro.scheduler.Scheduler`.
+
+    $ python -m benchmarks.scheduler [number of rules] [number of ticks]
+"""
+from datetime import datetime, timedelta
+import sys
+import time
+import turoboro
+import turoboro.tz
+import turoboro.scheduler
+
+
+def make_rules(count):
+    return dict(
+        (n, turoboro.DailyRule(datetime(2014, 1, 1 + n % 28), every_nth_day=1 + n % 5, on_hour=n % 24))
+        for n in range(count)
+    )
+
+
+def poll(rules, ticks, start):
+    for tick in range(ticks):
+        now = start + timedelta(minutes=tick)
+        for rule in rules.values():
+            rule.compute(from_dt=now, max_count_if_infinite=1, return_as=turoboro.POSIX).first
+
+
+def schedule(rules, ticks, start):
+    scheduler = turoboro.scheduler.Scheduler()
+    for key, rule in rules.items():
+        scheduler.add(key, rule, since=start)
+    due = []
+    for tick in range(ticks):
+        due.extend(scheduler.pop_due(start + timedelta(minutes=tick)))
+    return due
+
+
+def main(count=10000, ticks=60 * 24):
+    rules = make_rules(count)
+    start = datetime(2019, 6, 1, tzinfo=turoboro.tz.UTC)
+    # Polling is slow enough that a few ticks tell
+    cases = (('compute(from_dt=now) per rule', poll, 5), ('Scheduler.pop_due', schedule, ticks))
+    for name, function, tick_count in cases:
+        started = time.time()
+        function(rules, tick_count, start)
+        elapsed = time.time() - started
+        print('%-32s %10.3fms per tick (%d rules, %d ticks)' % (name, elapsed * 1000 / tick_count, count, tick_count))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
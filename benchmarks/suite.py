@@ -0,0 +1,205 @@
+"""
+Times `Rule.compute` for every rule type, mode (end date, repeat n times, infinite) and output format, as well as
+seeking far into the future with `from_dt` and finding the next occurrence with `next_after`. Each case reports calls
+per second, the cost per occurrence and the peak memory allocated while computing, and the results can be saved as
+JSON and compared with an earlier run.
+
+    $ python -m benchmarks.suite --save before.json
+    $ python -m benchmarks.suite --save after.json --compare before.json
+
+Cases can be picked with `--only`, e.g. `--only monthly` or `--only seek`.
+"""
+from datetime import datetime
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import turoboro
+import turoboro.tz
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover, Python 2
+    tracemalloc = None
+
+START = datetime(2014, 1, 1)
+END = datetime(2033, 12, 31)
+REPEAT = 1000
+INFINITE = 1000
+FAR_FUTURE = datetime(2900, 6, 15)
+NOW = datetime(2019, 5, 5, 12, tzinfo=turoboro.tz.UTC)
+
+RULES = (
+    ('daily', lambda: turoboro.DailyRule(
+        START, every_nth_day=2, except_weekdays=turoboro.WEEKEND, except_months=(turoboro.JULY,), on_hour=8
+    )),
+    ('weekly', lambda: turoboro.WeeklyRule(
+        START, (turoboro.MONDAY, turoboro.THURSDAY), every_nth_week=2, except_months=(turoboro.JULY,), on_hour=8
+    )),
+    ('monthly', lambda: turoboro.MonthlyRule(
+        START, weekday_count=2, weekday=turoboro.TUESDAY, except_months=(turoboro.JULY,), on_hour=8
+    )),
+)
+
+MODES = (
+    ('end', lambda rule: rule.end_on(END)),
+    ('repeat', lambda rule: rule.repeat_n_times(REPEAT)),
+    ('infinite', lambda rule: rule),
+)
+
+FORMATS = (
+    ('iso', turoboro.ISO),
+    ('posix', turoboro.POSIX),
+    ('datetime', turoboro.DATETIME_INSTANCE),
+)
+
+
+def cases():
+    """
+    Yields (name, function) pairs, where the function computes a rule and returns every occurrence in the requested
+    format.
+    """
+    for rule_name, make_rule in RULES:
+        for mode_name, apply_mode in MODES:
+            rule = apply_mode(make_rule())
+            for format_name, return_as in FORMATS:
+                yield '%s/%s/%s' % (rule_name, mode_name, format_name), _compute(rule, None, return_as)
+
+        rule = make_rule()
+        yield '%s/seek/iso' % rule_name, _compute(rule, FAR_FUTURE, turoboro.ISO)
+        yield '%s/next_after/posix' % rule_name, _next_after(rule, NOW, turoboro.POSIX)
+
+
+def _compute(rule, from_dt, return_as):
+    def compute():
+        return rule.compute(from_dt=from_dt, max_count_if_infinite=INFINITE, return_as=return_as).all
+    return compute
+
+
+def _next_after(rule, dt, return_as):
+    def next_after():
+        return [rule.next_after(dt, return_as)]
+    return next_after
+
+
+def _peak_memory(function):
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(function, min_time=0.2):
+    """
+    Times a function, calling it as many times as fit in `min_time` seconds (at least once).
+    :param function: The function to time, returning a list of occurrences
+    :type function: callable
+    :param min_time: The minimum number of seconds to spend timing
+    :type min_time: float
+    :return: dict
+    """
+    occurrences = len(function())
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    per_call = elapsed / number
+    return {
+        'ops_per_sec': 1 / per_call,
+        'occurrences': occurrences,
+        'us_per_occurrence': per_call * 1e6 / occurrences if occurrences else None,
+        'peak_memory_bytes': _peak_memory(function),
+    }
+
+
+def run(only=None, min_time=0.2):
+    results = {}
+    for name, function in cases():
+        if only and not any(part in name for part in only):
+            continue
+        results[name] = measure(function, min_time)
+        report(name, results[name])
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def _format_memory(peak):
+    return 'n/a' if peak is None else '%.1fKiB' % (peak / 1024.0)
+
+
+def report(name, result):
+    per_occurrence = result['us_per_occurrence']
+    print('%-28s %12.1f/sec %8d occ %10s/occ %12s' % (
+        name, result['ops_per_sec'], result['occurrences'],
+        'n/a' if per_occurrence is None else '%.2fus' % per_occurrence, _format_memory(result['peak_memory_bytes'])
+    ))
+
+
+def compare(before, after, threshold=0.1):
+    """
+    Prints the change in ops/sec and peak memory of every case found in both runs.
+    :param before: A run, as returned by `run` or loaded from JSON
+    :type before: dict
+    :param after: A later run
+    :type after: dict
+    :param threshold: How much slower (as a fraction) a case may get before it counts as a regression
+    :type threshold: float
+    :return: list, the names of the cases that regressed
+    """
+    regressions = []
+    print('\n%-28s %14s %14s %8s %12s' % ('compared to ' + before['created'], 'before', 'after', 'speed', 'memory'))
+    for name in sorted(set(before['results']) & set(after['results'])):
+        old, new = before['results'][name], after['results'][name]
+        speed = new['ops_per_sec'] / old['ops_per_sec']
+        memory = 'n/a'
+        if old['peak_memory_bytes'] and new['peak_memory_bytes'] is not None:
+            memory = '%.2fx' % (new['peak_memory_bytes'] / float(old['peak_memory_bytes']))
+        regressed = speed < 1 - threshold
+        if regressed:
+            regressions.append(name)
+        print('%-28s %10.1f/sec %10.1f/sec %7.2fx %12s%s' % (
+            name, old['ops_per_sec'], new['ops_per_sec'], speed, memory, '  REGRESSION' if regressed else ''
+        ))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks turoboro rule computation.')
+    parser.add_argument('--only', nargs='*', help='Only run cases whose name contains one of these')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds to spend timing each case')
+    parser.add_argument('--save', help='Save the results as JSON to this file')
+    parser.add_argument('--compare', help='Compare the results with an earlier run saved with --save')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Slowdown (as a fraction) that counts as a regression when comparing')
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.min_time)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(json.load(f), results, args.threshold):
+                return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
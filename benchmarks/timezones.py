@@ -0,0 +1,60 @@
+"""
+Compares the timezone backends (see `turoboro.tz`): how long importing turoboro and building a first rule takes, and
+what localizing, constructing rules and computing occurrences costs per call with each.
+
+    $ python -m benchmarks.timezones [number of occurrences]
+"""
+from datetime import datetime, timedelta
+import subprocess
+import sys
+import timeit
+import turoboro
+import turoboro.tz
+
+TIMEZONE = 'Europe/Stockholm'
+IMPORT = (
+    'import time; started = time.time(); from datetime import datetime; import turoboro, turoboro.tz; '
+    'turoboro.tz.set_backend(%r); turoboro.DailyRule(datetime(2014, 1, 1), timezone=%r); '
+    'print(time.time() - started)'
+)
+
+
+def import_time(backend, repeat=5):
+    """ The best time, in a fresh interpreter, to import turoboro and build a first rule in a timezone """
+    code = IMPORT % (backend, TIMEZONE)
+    return min(float(subprocess.check_output([sys.executable, '-c', code])) for _ in range(repeat))
+
+
+def per_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def measure(backend, count):
+    turoboro.tz.set_backend(backend)
+    timezone = turoboro.tz.timezone(TIMEZONE)
+    wall = datetime(2014, 7, 1, 8)
+    rule = turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=count, on_hour=8, timezone=TIMEZONE)
+    walls = [datetime(2014, 1, 1, 8) + timedelta(days=n) for n in range(count)]
+    return [
+        ('import and first rule (ms)', import_time(backend) * 1e3),
+        ('timezone.localize(dt) (us)', 1e6 * per_call(lambda: timezone.localize(wall), 100000)),
+        ('localize, per occurrence (us)', 1e6 * per_call(lambda: [timezone.localize(dt) for dt in walls], 1) / count),
+        ('DailyRule(...) (us)', 1e6 * per_call(
+            lambda: turoboro.DailyRule(datetime(2014, 1, 1), on_hour=8, timezone=TIMEZONE), 2000
+        )),
+        ('compute(DATETIME), per occurrence (us)', 1e6 * per_call(
+            lambda: rule.compute(return_as=turoboro.DATETIME_INSTANCE).all, 1
+        ) / count),
+        ('compute(ISO), per occurrence (us)', 1e6 * per_call(lambda: rule.compute().all, 1) / count),
+    ]
+
+
+def main(count=100000):
+    print('%-40s %10s %10s' % ('', turoboro.tz.ZONEINFO, turoboro.tz.PYTZ))
+    results = [measure(backend, count) for backend in turoboro.tz.BACKENDS]
+    for (name, zoneinfo_time), (_, pytz_time) in zip(*results):
+        print('%-40s %10.2f %10.2f' % (name, zoneinfo_time, pytz_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
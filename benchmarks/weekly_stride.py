@@ -0,0 +1,50 @@
+"""
+Compares the arithmetic WeeklyRule engine with the day by day stepping it replaced, for rules with sparse `on_days`.
+
+    $ python -m benchmarks.weekly_stride
+"""
+from datetime import datetime, timedelta
+import timeit
+import turoboro
+
+
+def stepping_compute(rule):
+    """
+    The WeeklyRule engine as it was before it moved to turoboro.arithmetic: visit every day of every included week
+    and check whether it is allowed.
+    """
+    working_date = rule.start_datetime
+    end_date = rule.end_datetime
+    result = []
+    while working_date < end_date:
+        if rule._is_allowed(working_date):
+            result.append(working_date)
+        if working_date.weekday() == turoboro.SUNDAY and rule.spec['every_nth_week'] > 1:
+            working_date += timedelta(days=7 * rule.spec['every_nth_week'] - 6)
+        working_date += timedelta(days=1)
+    return result
+
+
+def arithmetic_compute(rule):
+    return list(rule.compute(return_as=turoboro.DATETIME_INSTANCE).datetimes)
+
+
+def main(number=20):
+    cases = (
+        ('Wednesdays, every week', dict(on_days=(turoboro.WEDNESDAY,))),
+        ('Wednesdays, every 4th week', dict(on_days=(turoboro.WEDNESDAY,), every_nth_week=4)),
+        ('Weekends, every 2nd week, except summer', dict(
+            on_days=turoboro.WEEKEND, every_nth_week=2, except_months=(turoboro.JUNE, turoboro.JULY, turoboro.AUGUST)
+        )),
+    )
+    print('%-42s %12s %12s %8s' % ('20 years of', 'stepping', 'arithmetic', 'speedup'))
+    for name, kwargs in cases:
+        rule = turoboro.WeeklyRule(datetime(2014, 1, 1), end_on=datetime(2033, 12, 31), **kwargs)
+        assert stepping_compute(rule) == arithmetic_compute(rule)
+        stepping = timeit.timeit(lambda: stepping_compute(rule), number=number) / number
+        arithmetic = timeit.timeit(lambda: arithmetic_compute(rule), number=number) / number
+        print('%-42s %10.2fms %10.2fms %7.1fx' % (name, stepping * 1000, arithmetic * 1000, stepping / arithmetic))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,8 @@ setuptools.setup(
     author="Jon Nylander",
     author_email="pellepim@gmail.com",
     description="A python library for specifying recurring time rules and getting timestamps in return.",
-    install_requires=['voluptuous', 'pytz'],
+    install_requires=['voluptuous', 'pytz; python_version < "3.9"', 'tzdata; python_version >= "3.9"'],
+    extras_require={'numpy': ['numpy'], 'pytz': ['pytz']},
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/pellepim/turoboro",
@@ -0,0 +1,103 @@
+""" The asyncio tests, collected by tests/test_aio.py on Python 3.6 and later (their syntax is a SyntaxError before) """
+import asyncio
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import turoboro
+import turoboro.aio
+import turoboro.scheduler
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class OccurrenceStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.rule = turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=3, except_weekdays=turoboro.WEEKEND,
+                                       repeat_n_times=250)
+
+    def collect(self, **kwargs):
+        async def collect():
+            return [occurrence async for occurrence in self.rule.aiter(**kwargs)]
+        return run(collect())
+
+    def test_aiter(self):
+        self.assertEqual(self.collect(), self.rule.compute().all)
+        self.assertEqual(self.collect(from_dt=datetime(2014, 6, 1), return_as=turoboro.POSIX, chunk_size=7),
+                         list(self.rule.result(from_dt=datetime(2014, 6, 1), return_as=turoboro.POSIX)))
+
+    def test_big_chunks_in_an_executor(self):
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(self.collect(chunk_size=turoboro.aio.INLINE_LIMIT + 1, executor=executor),
+                             self.rule.compute().all)
+
+    def test_other_tasks_run_in_between(self):
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def both():
+            ticker = asyncio.ensure_future(tick())
+            occurrences = [occurrence async for occurrence in self.rule.aiter(chunk_size=10)]
+            await ticker
+            return occurrences
+
+        self.assertEqual(len(run(both())), 250)
+        self.assertEqual(ticks, [0, 1, 2, 3, 4])
+
+    def test_compute_many(self):
+        rules = [self.rule, turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND)]
+        self.assertEqual(run(turoboro.aio.compute_many(rules, datetime(2014, 2, 1), datetime(2014, 3, 1))),
+                         turoboro.compute_many(rules, datetime(2014, 2, 1), datetime(2014, 3, 1)))
+        self.assertEqual(repr(pickle.loads(pickle.dumps(self.rule))), repr(self.rule))
+
+
+class AsyncSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = turoboro.scheduler.to_timestamp(datetime(2014, 1, 1, 12))
+        self.scheduler = turoboro.aio.AsyncScheduler(return_as=turoboro.POSIX, clock=lambda: self.now)
+        self.calls = []
+
+    def test_run(self):
+        scheduler = self.scheduler
+
+        def callback(key, occurrence):
+            # Time flies, so that the next occurrence is due straight away
+            self.calls.append((key, occurrence))
+            self.now += 86400
+            if len(self.calls) == 6:
+                scheduler.stop()
+
+        async def coroutine_callback(key, occurrence):
+            self.calls.append((key, occurrence))
+
+        async def add_later():
+            await asyncio.sleep(0)
+            scheduler.add('late', turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=1, repeat_n_times=1),
+                          coroutine_callback, since=0)
+
+        scheduler.add('daily', turoboro.DailyRule(datetime(2014, 1, 1), on_hour=12), callback)
+        self.assertIsNone(scheduler.add('gone', turoboro.DailyRule(datetime(2013, 1, 1), repeat_n_times=1), callback))
+
+        async def main():
+            asyncio.ensure_future(add_later())
+            await asyncio.wait_for(scheduler.run(), 5)
+            await asyncio.sleep(0)
+
+        run(main())
+        first = turoboro.scheduler.to_timestamp(datetime(2014, 1, 1, 12))
+        daily = [occurrence for key, occurrence in self.calls if key == 'daily']
+        self.assertEqual(daily, [first + n * 86400 for n in range(len(daily))])
+        self.assertIn(('late', turoboro.scheduler.to_timestamp(datetime(2014, 1, 1))), self.calls)
+        self.assertNotIn('gone', scheduler)
+        self.assertNotIn('late', scheduler)
+        self.assertEqual(len(scheduler), 1)
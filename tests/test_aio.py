@@ -0,0 +1,5 @@
+import sys
+
+# The tests are written with async syntax, which Python 2 can't even parse
+if sys.version_info >= (3, 6):
+    from .aio_tests import AsyncSchedulerTests, OccurrenceStreamTests  # noqa: F401
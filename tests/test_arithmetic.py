@@ -0,0 +1,71 @@
+import unittest
+from datetime import date, datetime
+import turoboro
+import turoboro.arithmetic
+
+
+class CalendarTests(unittest.TestCase):
+    def test_month_start(self):
+        for year in (1900, 2000, 2014, 2016):
+            for month in turoboro.MONTHS:
+                self.assertEqual(turoboro.arithmetic.month_start(year, month), date(year, month, 1).toordinal())
+        self.assertEqual(turoboro.arithmetic.month_start(2014, 13), date(2015, 1, 1).toordinal())
+
+    def test_weekday(self):
+        for day in range(1, 15):
+            ordinal = date(2014, 1, day).toordinal()
+            self.assertEqual(turoboro.arithmetic.weekday(ordinal), date(2014, 1, day).weekday())
+
+
+class OrdinalPatternTests(unittest.TestCase):
+    def setUp(self):
+        # Every third day from 2014-01-01, except Saturdays and February
+        self.start = date(2014, 1, 1).toordinal()
+        offsets = [o for o in range(0, 21, 3) if turoboro.arithmetic.weekday(self.start + o) != turoboro.SATURDAY]
+        self.pattern = turoboro.arithmetic.OrdinalPattern(self.start, 21, offsets, self.start, (turoboro.FEBRUARY,))
+        self.expected = [
+            o for o in range(self.start, date(2016, 1, 1).toordinal(), 3)
+            if date.fromordinal(o).weekday() != turoboro.SATURDAY and date.fromordinal(o).month != turoboro.FEBRUARY
+        ]
+
+    def test_count(self):
+        self.assertEqual(self.pattern.count(self.start, date(2016, 1, 1).toordinal()), len(self.expected))
+        self.assertEqual(self.pattern.count(self.start - 100, self.start + 1), 1)
+        self.assertEqual(self.pattern.count(date(2014, 2, 1).toordinal(), date(2014, 3, 1).toordinal()), 0)
+
+    def test_nth(self):
+        for n, ordinal in enumerate(self.expected):
+            self.assertEqual(self.pattern.nth(n), ordinal)
+        self.assertEqual(self.pattern.nth(0, date(2014, 2, 1).toordinal()), date(2014, 3, 2).toordinal())
+        self.assertIsNone(self.pattern.nth(10 ** 9))
+
+    def test_last_before(self):
+        for hi in range(self.start - 3, date(2016, 1, 1).toordinal()):
+            before = [o for o in self.expected if o < hi]
+            self.assertEqual(self.pattern.last_before(hi), before[-1] if before else None)
+
+    def test_iterate(self):
+        self.assertEqual(list(self.pattern.iterate(hi=date(2016, 1, 1).toordinal())), self.expected)
+
+    def test_masks(self):
+        self.assertEqual(self.pattern.weekday_mask, turoboro.arithmetic.WEEKDAY_MASK & ~(1 << turoboro.SATURDAY))
+        self.assertEqual(self.pattern.month_mask, turoboro.arithmetic.MONTH_MASK & ~(1 << turoboro.FEBRUARY - 1))
+
+    def test_day_filter(self):
+        table = turoboro.arithmetic.day_filter(self.pattern.weekday_mask, self.pattern.month_mask)
+        for o in range(self.start, self.start + 366):
+            day = date.fromordinal(o)
+            allowed = day.weekday() != turoboro.SATURDAY and day.month != turoboro.FEBRUARY
+            self.assertEqual(bool(table >> (7 * day.month + day.weekday()) & 1), allowed)
+
+
+class OccurrenceSequenceTests(unittest.TestCase):
+    def test_result_is_not_materialized(self):
+        daily_rule = turoboro.DailyRule(datetime(2014, 1, 1), end_on=datetime(2033, 12, 31),
+                                        except_weekdays=turoboro.WEEKEND, except_months=(turoboro.JULY,))
+        result = daily_rule.compute()
+        self.assertIsInstance(result.datetimes, turoboro.arithmetic.OccurrenceSequence)
+        self.assertEqual(result.count, 4775)
+        self.assertEqual(result.first, '2014-01-01T00:00:00+00:00')
+        self.assertEqual(result.last, '2033-12-30T00:00:00+00:00')
+        self.assertEqual(list(result.datetimes[1:3]), list(result.datetimes)[1:3])
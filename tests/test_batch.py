@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime
+import turoboro
+
+
+class ComputeManyTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND, on_hour=8),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, every_nth_week=2, timezone='Asia/Kathmandu'),
+            turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND, on_hour=9),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=15, repeat_n_times=3),
+            turoboro.DailyRule(datetime(2014, 3, 1), end_on=datetime(2014, 3, 4)),
+        ]
+
+    def test(self):
+        columns = turoboro.compute_many(self.rules, datetime(2014, 2, 1), datetime(2014, 4, 1),
+                                        return_as=turoboro.POSIX)
+        self.assertEqual(len(columns.rule_index), len(columns.occurrence))
+        for index, rule in enumerate(self.rules):
+            window_lo = rule.timezone.localize(datetime(2014, 2, 1))
+            window_hi = rule.timezone.localize(datetime(2014, 4, 1))
+            expected = [
+                rule.repr_dt(dt, turoboro.POSIX) for dt in rule.compute(return_as=turoboro.DATETIME_INSTANCE,
+                                                                       max_count_if_infinite=1000).datetimes
+                if window_lo <= dt < window_hi
+            ]
+            self.assertEqual([o for i, o in zip(*columns) if i == index], expected)
+
+        self.assertEqual([o for i, o in zip(*columns) if i == 3], [1392422400, 1394841600])
+        self.assertEqual([o for i, o in zip(*columns) if i == 4], [1393632000, 1393718400, 1393804800, 1393891200])
+
+    def test_return_as(self):
+        columns = turoboro.compute_many(self.rules[3:], datetime(2014, 1, 1), datetime(2015, 1, 1))
+        self.assertEqual(columns.rule_index, [0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual(columns.occurrence[:3], self.rules[3].compute().all)
+        columns = turoboro.compute_many(self.rules[3:], datetime(2014, 1, 1), datetime(2015, 1, 1),
+                                        return_as=turoboro.DATETIME_INSTANCE)
+        self.assertEqual(columns.occurrence[3:], self.rules[4].compute(return_as=turoboro.DATETIME_INSTANCE).all)
+
+    def test_open_window(self):
+        finite = self.rules[3:]
+        columns = turoboro.compute_many(finite, None, None)
+        self.assertEqual(columns.occurrence, finite[0].compute().all + finite[1].compute().all)
+        columns = turoboro.compute_many(finite, datetime(2014, 3, 3), None)
+        self.assertEqual(columns.occurrence, finite[0].compute().all[2:] + finite[1].compute().all[2:])
+        columns = turoboro.compute_many(self.rules, None, datetime(2014, 1, 3))
+        self.assertEqual(columns.rule_index, [0, 0, 2, 2])
+        self.assertRaises(ValueError, turoboro.compute_many, self.rules, datetime(2014, 1, 1), None)
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+import voluptuous
+import turoboro
+import turoboro.binary
+
+
+class BinaryTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=2, except_weekdays=turoboro.WEEKEND,
+                               except_months=(turoboro.JULY, turoboro.AUGUST), on_hour=8),
+            # Ends on the day summer time ends, and so with the UTC offset of summer time
+            turoboro.DailyRule(datetime(2014, 3, 30), on_hour=2, timezone='Europe/Stockholm',
+                               end_on=datetime(2014, 10, 26)),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), [turoboro.MONDAY, turoboro.THURSDAY], every_nth_week=53,
+                                repeat_n_times=10 ** 6, timezone='America/St_Johns'),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31, every_nth_month=12, timezone='Asia/Kathmandu'),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=5, weekday=turoboro.SUNDAY, on_hour=23,
+                                 end_on=datetime(2015, 1, 1)),
+            # Before standard time, with an offset of +01:12:12
+            turoboro.WeeklyRule(datetime(1850, 6, 1), [turoboro.SATURDAY], timezone='Europe/Stockholm'),
+        ]
+
+    def test_round_trip(self):
+        for rule in self.rules:
+            data = rule.to_bytes()
+            self.assertEqual(len(data), turoboro.binary.RECORD_SIZE)
+            self.assertEqual(repr(type(rule).from_bytes(data)), repr(rule))
+            self.assertEqual(repr(turoboro.Rule.from_bytes(data, validate=False)), repr(rule))
+
+        self.assertEqual(self.rules[0].compute().all, turoboro.Rule.from_bytes(self.rules[0].to_bytes()).compute().all)
+
+    def test_lists_come_back_sorted(self):
+        rule = turoboro.WeeklyRule(datetime(2014, 1, 1), [turoboro.SUNDAY, turoboro.MONDAY, turoboro.SUNDAY])
+        self.assertEqual(turoboro.Rule.from_bytes(rule.to_bytes()).spec['on_days'], [turoboro.MONDAY, turoboro.SUNDAY])
+
+    def test_invalid_records(self):
+        data = self.rules[0].to_bytes()
+        self.assertRaises(ValueError, turoboro.WeeklyRule.from_bytes, data)
+        self.assertRaises(ValueError, turoboro.Rule.from_bytes, data[:-1])
+        self.assertRaises(ValueError, turoboro.Rule.from_bytes, b'\x02' + data[1:])
+        self.assertRaises(ValueError, turoboro.Rule.from_bytes, data[:1] + b'\x04' + data[2:])
+        # An hour of 24
+        self.assertRaises(voluptuous.Invalid, turoboro.Rule.from_bytes, data[:3] + b'\x18' + data[4:])
+        self.assertRaises(ValueError, turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=2 ** 32).to_bytes)
+
+    def test_decode(self):
+        data = turoboro.binary.dumps(self.rules)
+        self.assertEqual(len(data), len(self.rules) * turoboro.binary.RECORD_SIZE)
+        self.assertEqual([repr(rule) for rule in turoboro.binary.decode(data)], [repr(rule) for rule in self.rules])
+        self.assertEqual(
+            [repr(rule) for rule in turoboro.binary.decode(memoryview(data)[turoboro.binary.RECORD_SIZE:])],
+            [repr(rule) for rule in self.rules[1:]]
+        )
+        self.assertRaises(ValueError, list, turoboro.binary.decode(data[1:]))
+
+    def test_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'catalog.bin')
+            with open(path, 'wb') as f:
+                f.write(turoboro.binary.dumps(self.rules))
+            self.assertEqual([repr(rule) for rule in turoboro.binary.load(path)], [repr(rule) for rule in self.rules])
+
+            # Stopping early lets go of the memory map
+            rules = turoboro.binary.load(path, validate=False)
+            self.assertEqual(repr(next(rules)), repr(self.rules[0]))
+            rules.close()
+
+            open(path, 'wb').close()
+            self.assertEqual(list(turoboro.binary.load(path)), [])
+        finally:
+            shutil.rmtree(directory)
@@ -46,3 +46,13 @@ class ConvertDatetimeToTest(unittest.TestCase):
         self.assertEqual(turoboro.common.convert_datetime_to(dt, to=turoboro.ISO), '2014-01-01T00:00:00')
         self.assertEqual(turoboro.common.convert_datetime_to(dt, to=turoboro.POSIX), 1388534400)
         self.assertEqual(turoboro.common.convert_datetime_to(dt, to=turoboro.DATETIME_INSTANCE), dt)
+
+
+class MaskTest(unittest.TestCase):
+    def test(self):
+        self.assertEqual(turoboro.common.to_mask(turoboro.WEEKEND), 0b1100000)
+        self.assertEqual(turoboro.common.to_mask([turoboro.DECEMBER, turoboro.JANUARY], turoboro.JANUARY), 0x801)
+        self.assertEqual(turoboro.common.to_mask(None), 0)
+        self.assertEqual(turoboro.common.from_mask(0x801, turoboro.JANUARY), [turoboro.JANUARY, turoboro.DECEMBER])
+        self.assertEqual(turoboro.common.from_mask(0b1100000), list(turoboro.WEEKEND))
+        self.assertIsNone(turoboro.common.from_mask(0))
@@ -0,0 +1,81 @@
+import pickle
+import threading
+import unittest
+from datetime import datetime
+import turoboro
+import turoboro.tz
+
+
+class CompiledRuleTests(unittest.TestCase):
+    def setUp(self):
+        self.rule = turoboro.DailyRule(
+            datetime(2014, 1, 1), every_nth_day=2, except_weekdays=turoboro.WEEKEND, timezone='Europe/Stockholm'
+        ).on_hour(8).end_on(datetime(2014, 12, 31))
+        self.compiled = self.rule.compile()
+
+    def test_state(self):
+        compiled = self.compiled
+        self.assertIs(compiled.timezone, turoboro.tz.timezone('Europe/Stockholm'))
+        self.assertEqual(compiled.start, 1388559600)  # 2014-01-01T07:00:00Z
+        self.assertEqual(compiled.end, 1420095600)  # 2015-01-01T07:00:00Z
+        self.assertEqual(compiled.weekday_mask, self.rule.weekday_mask)
+        self.assertEqual(compiled.month_mask, self.rule.month_mask)
+        self.assertEqual(compiled.spec, self.rule.spec)
+
+    def test_occurrences(self):
+        dt = datetime(2014, 6, 3, 12)
+        self.assertEqual(self.compiled.compute().all, self.rule.compute().all)
+        self.assertEqual(list(self.compiled.result(dt)), list(self.rule.result(dt)))
+        self.assertEqual(self.compiled.next_after(dt), self.rule.next_after(dt))
+        self.assertEqual(self.compiled.previous_before(dt), self.rule.previous_before(dt))
+        self.assertEqual(self.compiled.nth(-1), self.rule.nth(-1))
+        self.assertEqual(self.compiled.index_of(datetime(2014, 1, 3, 8)), 1)
+
+    def test_does_not_follow_the_rule(self):
+        occurrences = self.compiled.compute().all
+        self.rule.on_hour(10).except_months(turoboro.JUNE)
+        self.assertEqual(self.compiled.compute().all, occurrences)
+        self.assertNotEqual(self.rule.compile(), self.compiled)
+
+        rule = self.compiled.to_rule()
+        rule.on_hour(10)
+        self.assertEqual(self.compiled.compute().all, occurrences)
+
+        # Nor does changing the rule of a result
+        self.compiled.compute().rule.on_hour(5)
+        self.compiled.result().rule.except_months(turoboro.JULY).spec['start'] = None
+        self.assertEqual(self.compiled.compute().all, occurrences)
+        self.assertEqual(self.compiled.spec['on_hour'], 8)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.compiled.start = 0
+        with self.assertRaises(AttributeError):
+            del self.compiled.timezone
+        with self.assertRaises(AttributeError):
+            self.compiled.extra = 1
+
+    def test_hashable(self):
+        self.assertEqual(self.compiled, self.rule.compile())
+        weekly = turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND).compile()
+        self.assertEqual(len(set([self.compiled, self.rule.compile(), weekly])), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(self.compiled)), self.compiled)
+        # Days and months are sets
+        self.assertEqual(turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.SATURDAY, turoboro.SUNDAY)).compile(),
+                         turoboro.WeeklyRule(datetime(2014, 1, 1), [turoboro.SUNDAY, turoboro.SATURDAY]).compile())
+
+    def test_threads(self):
+        compiled = turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31).compile()
+        expected = compiled.compute(max_count_if_infinite=500).all
+        results = []
+
+        def compute():
+            for _ in range(20):
+                results.append(compiled.compute(max_count_if_infinite=500).all == expected)
+
+        threads = [threading.Thread(target=compute) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [True] * 160)
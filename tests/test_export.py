@@ -0,0 +1,80 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+import turoboro
+import turoboro.export
+
+# The writers write native strings, bytes on Python 2
+NativeStringIO = io.StringIO if sys.version_info[0] >= 3 else io.BytesIO
+
+
+class ChunkCountingFile(NativeStringIO):
+    def __init__(self):
+        super(ChunkCountingFile, self).__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super(ChunkCountingFile, self).write(s)
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = {
+            'weekdays': turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND, on_hour=8),
+            'weekends, "fortnightly"': turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, every_nth_week=2,
+                                                           timezone='Asia/Kathmandu'),
+            'monthly': turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=15, repeat_n_times=3),
+        }
+        self.window = (datetime(2014, 2, 1), datetime(2014, 4, 1))
+        self.expected = []
+        for rule_id, rule in self.rules.items():
+            columns = turoboro.compute_many([rule], *self.window)
+            self.expected.extend((rule_id, occurrence) for occurrence in columns.occurrence)
+
+    def test_ndjson(self):
+        f = ChunkCountingFile()
+        written = turoboro.export.write_ndjson(self.rules, f, *self.window, chunk_size=10)
+        lines = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(written, len(self.expected))
+        self.assertEqual([(line['rule'], line['occurrence']) for line in lines], self.expected)
+        self.assertEqual(f.writes, -(-len(self.expected) // 10))
+
+    def test_csv(self):
+        f = NativeStringIO()
+        turoboro.export.write_csv(self.rules, f, *self.window, return_as=turoboro.POSIX)
+        rows = list(csv.reader(NativeStringIO(f.getvalue())))
+        self.assertEqual(rows[0], ['rule', 'occurrence'])
+        expected = turoboro.compute_many(list(self.rules.values()), *self.window, return_as=turoboro.POSIX)
+        self.assertEqual([int(occurrence) for _, occurrence in rows[1:]], expected.occurrence)
+        self.assertEqual(rows[1][0], list(self.rules)[0])
+
+    def test_rules_without_ids(self):
+        occurrences = list(turoboro.export.occurrences([self.rules['monthly']], window_end=datetime(2015, 1, 1)))
+        self.assertEqual(occurrences, [(0, occurrence) for occurrence in self.rules['monthly'].compute().all])
+
+    def test_infinite_rules_need_a_window(self):
+        f = NativeStringIO()
+        self.assertRaises(ValueError, turoboro.export.write_ndjson, self.rules, f)
+        self.assertRaises(ValueError, turoboro.export.write_ndjson, self.rules, f, *self.window,
+                          return_as=turoboro.DATETIME_INSTANCE)
+
+    def test_export_gzip(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'occurrences.ndjson.gz')
+            written = turoboro.export.export(self.rules, path, window_start=self.window[0], window_end=self.window[1])
+            self.assertEqual(written, len(self.expected))
+            with gzip.open(path) as f:
+                lines = [json.loads(line.decode('utf-8')) for line in f]
+            self.assertEqual([(line['rule'], line['occurrence']) for line in lines], self.expected)
+            self.assertRaises(ValueError, turoboro.export.export, self.rules, path, 'xml')
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,79 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+import voluptuous
+import turoboro
+import turoboro.loader
+
+
+class LoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND, on_hour=8),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, every_nth_week=2, timezone='Asia/Kathmandu'),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=15, repeat_n_times=3),
+        ]
+        self.lines = [repr(rule) for rule in self.rules]
+        self.lines[1:1] = [
+            '{"rule": "daily", "start": ',
+            repr(self.rules[0]).replace('"on_hour": 8', '"on_hour": 25'),
+            '',
+            '{"rule": "yearly"}',
+        ]
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'catalog.jsonl')
+        with open(self.path, 'w') as f:
+            f.write('\n'.join(self.lines) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertLoaded(self, loaded):
+        self.assertEqual([item.line_number for item in loaded], [1, 2, 3, 5, 6, 7])
+        self.assertEqual([repr(item.rule) for item in loaded if item.error is None], [repr(r) for r in self.rules])
+        errors = [item for item in loaded if item.error is not None]
+        self.assertEqual([item.rule for item in errors], [None, None, None])
+        self.assertIsInstance(errors[0].error, ValueError)
+        self.assertIsInstance(errors[1].error, voluptuous.Invalid)
+        self.assertIsInstance(errors[2].error, ValueError)
+
+    def test_load(self):
+        loaded = list(turoboro.loader.load(self.lines))
+        self.assertLoaded(loaded)
+        self.assertEqual(loaded[0].rule.compute().all, self.rules[0].compute().all)
+
+    def test_load_jsonl(self):
+        self.assertLoaded(list(turoboro.loader.load_jsonl(self.path)))
+        self.assertLoaded(list(turoboro.loader.load_jsonl(self.path, use_mmap=True)))
+
+    @unittest.skipIf(sys.version_info[0] < 3, 'concurrent.futures requires Python 3')
+    def test_load_in_processes(self):
+        self.assertLoaded(list(turoboro.loader.load_jsonl(self.path, processes=2, chunk_size=2)))
+
+    def test_load_catalog(self):
+        rules, errors = turoboro.loader.load_catalog(self.path)
+        self.assertEqual([repr(rule) for rule in rules], [repr(rule) for rule in self.rules])
+        self.assertEqual([error.line_number for error in errors], [2, 3, 5])
+
+    def test_empty_catalog(self):
+        open(self.path, 'w').close()
+        self.assertEqual(turoboro.loader.load_catalog(self.path, use_mmap=True), ([], []))
+
+    def test_specs_are_validated_once(self):
+        calls = []
+        validate_spec = turoboro.DailyRule.validate_spec
+
+        def counting(rule, spec):
+            calls.append(spec)
+            return validate_spec(rule, spec)
+
+        turoboro.DailyRule.validate_spec = counting
+        try:
+            list(turoboro.loader.load(self.lines[:1]))
+            turoboro.Rule.from_spec(self.lines[0])
+        finally:
+            turoboro.DailyRule.validate_spec = validate_spec
+        self.assertEqual(len(calls), 2)
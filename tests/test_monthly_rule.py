@@ -70,8 +70,50 @@ class WeeklyRuleSetupTests(unittest.TestCase):
 
 
 class MonthlyRuleWithEndDatesTests(unittest.TestCase):
-    def _test_day_of_month(self):
+    def test_day_of_month(self):
         day_of_month_rule = turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31, end_on=datetime(2014, 12, 31))
 
+        # Months without a 31st are skipped
         result = day_of_month_rule.compute()
-        
\ No newline at end of file
+        self.assertEqual(result.all, ['2014-01-31T00:00:00+00:00', '2014-03-31T00:00:00+00:00',
+                                      '2014-05-31T00:00:00+00:00', '2014-07-31T00:00:00+00:00',
+                                      '2014-08-31T00:00:00+00:00', '2014-10-31T00:00:00+00:00',
+                                      '2014-12-31T00:00:00+00:00'])
+        result = day_of_month_rule.compute(from_dt=datetime(2014, 7, 31))
+        self.assertEqual(result.first, '2014-08-31T00:00:00+00:00')
+        self.assertEqual(result.count, 3)
+
+    def test_weekday(self):
+        weekday_rule = turoboro.MonthlyRule(
+            datetime(2014, 1, 1), every_nth_month=3, end_on=datetime(2015, 1, 2), weekday_count=3,
+            weekday=turoboro.THURSDAY, except_months=(turoboro.JULY, turoboro.AUGUST), on_hour=4
+        )
+        self.assertEqual(weekday_rule.compute().all, ['2014-01-16T04:00:00+00:00', '2014-04-17T04:00:00+00:00',
+                                                      '2014-10-16T04:00:00+00:00'])
+
+
+class MonthlyRuleWithRepeatNTimesTests(unittest.TestCase):
+    def test(self):
+        # The fifth Monday of every other month, skipping the months that only have four
+        weekday_rule = turoboro.MonthlyRule(datetime(2014, 1, 1), every_nth_month=2, weekday_count=5,
+                                            weekday=turoboro.MONDAY, repeat_n_times=4)
+        expected = ['2014-03-31T00:00:00+00:00', '2014-09-29T00:00:00+00:00', '2015-03-30T00:00:00+00:00',
+                    '2015-11-30T00:00:00+00:00']
+        self.assertEqual(weekday_rule.compute().all, expected)
+        self.assertEqual(weekday_rule.compute(from_dt=datetime(2014, 9, 1)).all, expected[1:])
+
+
+class MonthlyInfiniteRuleTests(unittest.TestCase):
+    def test(self):
+        day_of_month_rule = turoboro.MonthlyRule(datetime(2014, 1, 15), day_of_month=10, on_hour=9)
+        result = day_of_month_rule.compute(max_count_if_infinite=12)
+        self.assertTrue(result.infinite)
+        self.assertEqual(result.count, 12)
+        self.assertEqual(result.first, '2014-02-10T09:00:00+00:00')
+        self.assertEqual(result.last, '2015-01-10T09:00:00+00:00')
+        result = day_of_month_rule.compute(from_dt=datetime(2020, 5, 10), max_count_if_infinite=2)
+        self.assertEqual(result.all, ['2020-06-10T09:00:00+00:00', '2020-07-10T09:00:00+00:00'])
+
+    def test_from_spec(self):
+        monthly_rule = turoboro.Rule.from_spec(repr(turoboro.MonthlyRule(datetime(2014, 1, 15), day_of_month=10)))
+        self.assertEqual(monthly_rule.compute(max_count_if_infinite=1).first, '2014-02-10T00:00:00+00:00')
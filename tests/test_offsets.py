@@ -0,0 +1,73 @@
+import calendar
+import unittest
+from datetime import datetime, timedelta
+import pytz
+import turoboro
+import turoboro.offsets
+
+
+def wall(*args):
+    return calendar.timegm(datetime(*args).timetuple())
+
+
+class OffsetTableTests(unittest.TestCase):
+    def test_fixed_offset(self):
+        table = turoboro.offsets.table(pytz.UTC)
+        self.assertEqual(table.fixed_offset, 0)
+        self.assertEqual(table.to_utc(wall(2014, 7, 1, 8)), wall(2014, 7, 1, 8))
+        self.assertEqual(turoboro.offsets.table(pytz.timezone('Etc/GMT-3')).to_utc(wall(2014, 7, 1, 8)),
+                         wall(2014, 7, 1, 5))
+
+    def test_to_utc(self):
+        table = turoboro.offsets.table(pytz.timezone('Europe/Stockholm'))
+        self.assertIsNone(table.fixed_offset)
+        self.assertEqual(table.to_utc(wall(2014, 1, 1, 8)), wall(2014, 1, 1, 7))
+        self.assertEqual(table.to_utc(wall(2014, 7, 1, 8)), wall(2014, 7, 1, 6))
+        self.assertEqual(table.utc_offset(wall(2014, 7, 1, 6)), 7200)
+        self.assertEqual(table.to_wall(wall(2014, 7, 1, 6)), wall(2014, 7, 1, 8))
+
+    def test_skipped_and_repeated_times(self):
+        timezone = pytz.timezone('America/New_York')
+        table = turoboro.offsets.table(timezone)
+        # 02:30 doesn't exist on the 9th of March 2014, and 01:30 happens twice on the 2nd of November
+        for dt in (datetime(2014, 3, 9, 2, 30), datetime(2014, 11, 2, 1, 30)):
+            self.assertEqual(table.to_utc(turoboro.offsets.wall_seconds(dt)),
+                             calendar.timegm(timezone.localize(dt).utctimetuple()))
+
+    def test_same_as_pytz(self):
+        for name in ('Europe/Stockholm', 'Australia/Sydney', 'America/Sao_Paulo', 'Asia/Kolkata', 'Europe/Moscow'):
+            timezone = pytz.timezone(name)
+            table = turoboro.offsets.table(timezone)
+            dt = datetime(2000, 1, 1, 0, 30)
+            while dt.year < 2025:
+                self.assertEqual(table.to_utc(turoboro.offsets.wall_seconds(dt)),
+                                 calendar.timegm(timezone.localize(dt).utctimetuple()), '%s %s' % (name, dt))
+                dt += timedelta(hours=37)
+
+    def test_built_once(self):
+        timezone = pytz.timezone('Europe/Stockholm')
+        self.assertIs(turoboro.offsets.table(timezone), turoboro.offsets.table(timezone))
+
+
+class DaylightSavingTimeTests(unittest.TestCase):
+    def setUp(self):
+        self.rule = turoboro.DailyRule(datetime(2014, 3, 28), timezone='Europe/Stockholm', on_hour=8,
+                                       repeat_n_times=5)
+
+    def test_same_wall_clock_time(self):
+        self.assertEqual(self.rule.compute().all, [
+            '2014-03-28T07:00:00+00:00', '2014-03-29T07:00:00+00:00', '2014-03-30T06:00:00+00:00',
+            '2014-03-31T06:00:00+00:00', '2014-04-01T06:00:00+00:00'
+        ])
+        self.assertEqual(self.rule.compute(return_as=turoboro.DATETIME_INSTANCE).all[2].hour, 6)
+        self.assertEqual(list(self.rule.result()), self.rule.compute().all)
+        self.assertEqual(self.rule.nth(3), '2014-03-31T06:00:00+00:00')
+
+    def test_next_after(self):
+        self.assertEqual(self.rule.next_after(datetime(2014, 3, 30, 8, 30)), '2014-03-31T06:00:00+00:00')
+        self.assertEqual(self.rule.previous_before(datetime(2014, 3, 30, 8, 30)), '2014-03-30T06:00:00+00:00')
+        self.assertEqual(self.rule.index_of(datetime(2014, 3, 31, 8)), 3)
+
+    def test_compute_many(self):
+        columns = turoboro.compute_many([self.rule], datetime(2014, 3, 30, 8), datetime(2014, 3, 31, 8))
+        self.assertEqual(columns.occurrence, ['2014-03-30T06:00:00+00:00'])
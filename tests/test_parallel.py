@@ -0,0 +1,31 @@
+import unittest
+from datetime import datetime
+import turoboro
+import turoboro.parallel
+
+
+@unittest.skipIf(turoboro.parallel.ProcessPoolExecutor is None, 'concurrent.futures requires Python 3')
+class ParallelExpanderTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            turoboro.DailyRule(datetime(2014, 1, n), every_nth_day=n, on_hour=n % 24) for n in range(1, 29)
+        ] + [
+            turoboro.WeeklyRule(datetime(2014, 1, n), (n % 7,), every_nth_week=n % 3 + 1) for n in range(1, 29)
+        ]
+        self.specs = [repr(rule) for rule in self.rules]
+        self.window = (datetime(2014, 2, 1), datetime(2014, 6, 1))
+
+    def test_expand(self):
+        expected = turoboro.compute_many(self.rules, *self.window)
+        columns = turoboro.parallel.expand(self.specs, *self.window, return_as=turoboro.ISO, max_workers=2,
+                                           chunk_size=5)
+        self.assertEqual(columns, expected)
+
+    def test_unordered(self):
+        expected = turoboro.compute_many(self.rules, *self.window, return_as=turoboro.POSIX)
+        with turoboro.parallel.ParallelExpander(max_workers=2, chunk_size=7) as expander:
+            chunks = list(expander.expand(iter(self.specs), *self.window, ordered=False))
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(
+            sorted(pair for columns in chunks for pair in zip(*columns)), sorted(zip(*expected))
+        )
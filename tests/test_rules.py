@@ -1,6 +1,11 @@
 import unittest
 import turoboro
 import voluptuous
+import itertools
+import turoboro.arithmetic
+import turoboro.common
+import turoboro.result
+from datetime import datetime, timedelta
 
 
 class FromSpecTests(unittest.TestCase):
@@ -65,3 +70,282 @@ class FromSpecTests(unittest.TestCase):
             "timezone": "UTC"
         }"""
         self.assertRaises(voluptuous.MultipleInvalid, turoboro.Rule.from_spec, json_spec)
+
+
+class ResultIteratorTests(unittest.TestCase):
+    def setUp(self):
+        self.weekly_rule = turoboro.WeeklyRule(datetime(2014, 1, 1), on_days=turoboro.WEEKEND, every_nth_week=5,
+                                               on_hour=8)
+
+    def test_matches_compute(self):
+        result = self.weekly_rule.result()
+        self.assertEqual(result.take(100), self.weekly_rule.compute().all)
+        repeating = self.weekly_rule.repeat_n_times(10)
+        self.assertEqual(list(repeating.result(from_dt=datetime(2014, 2, 8))),
+                         repeating.compute(datetime(2014, 2, 8)).all)
+
+    def test_unbounded(self):
+        """ Iterating is not limited by the recursion depth, and skipping does not compute what is skipped """
+        result = self.weekly_rule.result()
+        self.assertEqual(next(itertools.islice(result, 5000, None)), '2253-07-30T08:00:00+00:00')
+        self.assertEqual(self.weekly_rule.result().skip(5000).take(1), ['2253-07-30T08:00:00+00:00'])
+
+    def test_skip_and_resume(self):
+        expected = self.weekly_rule.compute(max_count_if_infinite=30).all
+        result = self.weekly_rule.result()
+        self.assertEqual(result.skip(3).take(2), expected[3:5])
+        cursor = result.cursor
+        resumed = self.weekly_rule.result(cursor=cursor)
+        self.assertEqual(resumed.skip(10).take(15), expected[15:30])
+
+    def test_exhausted(self):
+        daily_rule = turoboro.DailyRule(datetime(2014, 1, 1), end_on=datetime(2014, 1, 10))
+        result = daily_rule.result()
+        self.assertEqual(len(result.take(100)), 10)
+        self.assertRaises(StopIteration, next, result)
+        self.assertEqual(daily_rule.result().skip(20).take(1), [])
+
+
+class ResultSegmentTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = (
+            turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=300, every_nth_day=3,
+                               except_months=(turoboro.JULY,), on_hour=8, timezone='Europe/Stockholm'),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, end_on=datetime(2017, 1, 1), on_hour=8),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31, repeat_n_times=50),
+        )
+        self.points = [datetime(2013, 12, 31), datetime(2014, 1, 1), datetime(2014, 1, 4, 8), datetime(2015, 3, 31),
+                       datetime(2016, 7, 15, 12), datetime(2016, 12, 31, 8), datetime(2100, 1, 1)]
+
+    def assertLikeList(self, result):
+        timezone = result.rule.timezone
+        occurrences = list(result.datetimes)
+        for _from in self.points:
+            localized = timezone.localize(_from)
+            self.assertEqual(result.before(_from), result.formatted_list([dt for dt in occurrences if dt < localized]))
+            self.assertEqual(result.after(_from), result.formatted_list([dt for dt in occurrences if dt > localized]))
+            self.assertEqual(result.segment(_from),
+                             result.formatted_list([dt for dt in occurrences if dt >= localized]))
+            for to in self.points:
+                localized_to = timezone.localize(to)
+                expected = [dt for dt in occurrences if localized_to >= dt >= localized]
+                self.assertEqual(result.segment(_from, to), result.formatted_list(expected))
+                self.assertEqual(result.count_between(_from, to), len(expected))
+
+    def test_like_a_list(self):
+        for rule in self.rules:
+            result = rule.compute(return_as=turoboro.DATETIME_INSTANCE)
+            self.assertLikeList(result)
+            self.assertLikeList(rule.compute(from_dt=datetime(2015, 6, 1), return_as=turoboro.DATETIME_INSTANCE))
+            self.assertLikeList(turoboro.result.Result(list(result.datetimes), rule, return_as=turoboro.ISO))
+
+    def test_segments_are_views(self):
+        result = self.rules[0].compute(return_as=turoboro.DATETIME_INSTANCE)
+        segment = result._raw_segment(datetime(2015, 1, 1), datetime(2016, 1, 1))
+        self.assertIsInstance(segment, turoboro.arithmetic.OccurrenceSequence)
+        self.assertEqual(segment[0], result.datetimes[result.count_between(datetime(2013, 1, 1), datetime(2015, 1, 1))])
+        self.assertEqual(turoboro.result.Result(segment, result.rule, return_as=turoboro.DATETIME_INSTANCE).first,
+                         result.after(datetime(2015, 1, 1))[0])
+
+
+class CompactResultTests(unittest.TestCase):
+    def test_same_as_lazy(self):
+        rules = (
+            turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=300, every_nth_day=3,
+                               except_months=(turoboro.JULY,), on_hour=8, timezone='Europe/Stockholm'),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, end_on=datetime(2017, 1, 1), on_hour=8),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=29, every_nth_month=5, repeat_n_times=50),
+        )
+        for rule in rules:
+            for return_as in (turoboro.ISO, turoboro.POSIX, turoboro.DATETIME_INSTANCE):
+                lazy = rule.compute(from_dt=datetime(2014, 3, 1), return_as=return_as)
+                compact = lazy.compact()
+                self.assertIsInstance(compact.datetimes, turoboro.result.TimestampArray)
+                self.assertEqual(list(compact.datetimes), list(lazy.datetimes))
+                self.assertEqual((compact.first, compact.last, compact.count), (lazy.first, lazy.last, lazy.count))
+                self.assertEqual(compact.all, lazy.all)
+                for _from, to in ((datetime(2014, 1, 4, 8), datetime(2015, 3, 31)), (datetime(2016, 7, 15, 12), None)):
+                    self.assertEqual(compact.segment(_from, to), lazy.segment(_from, to))
+                    self.assertEqual(compact.before(_from), lazy.before(_from))
+                    self.assertEqual(compact.after(_from), lazy.after(_from))
+
+    def test_decodes_into_the_rule_timezone(self):
+        daily_rule = turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=3, on_hour=8, timezone='Asia/Kathmandu')
+        result = daily_rule.compute(return_as=turoboro.DATETIME_INSTANCE).compact()
+        self.assertEqual(result.datetimes[0].utcoffset(), timedelta(hours=5, minutes=45))
+        self.assertEqual(result.datetimes[0], daily_rule.timezone.localize(datetime(2014, 1, 1, 8)))
+        timestamps = result.datetimes.timestamps
+        self.assertEqual(timestamps.itemsize * len(timestamps), 3 * 8)
+        self.assertFalse(hasattr(result, '__dict__'))
+
+
+class NativeTimestampTests(unittest.TestCase):
+    def test_no_datetimes_are_created(self):
+        weekly_rule = turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, repeat_n_times=100, on_hour=8,
+                                          timezone='America/Chicago')
+        expected = [weekly_rule.repr_dt(dt, turoboro.POSIX) for dt in weekly_rule.compute().datetimes]
+        result = weekly_rule.compute(return_as=turoboro.POSIX)
+        result.datetimes.to_datetime = None
+        self.assertEqual(result.all, expected)
+        self.assertEqual(result.segment(datetime(2014, 2, 1), datetime(2014, 3, 1)), expected[8:16])
+        self.assertEqual(result.compact().all, expected)
+        self.assertEqual(list(weekly_rule.result(return_as=turoboro.POSIX)), expected)
+
+
+class SeekTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = (
+            turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=100, every_nth_day=3,
+                               except_months=(turoboro.FEBRUARY,), on_hour=8, timezone='Europe/Stockholm'),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, end_on=datetime(2014, 6, 1), every_nth_week=2,
+                                except_months=(turoboro.MARCH, turoboro.APRIL), on_hour=8),
+            turoboro.MonthlyRule(datetime(2014, 1, 15), day_of_month=31, end_on=datetime(2016, 1, 1), on_hour=23,
+                                 timezone='America/New_York'),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=1, weekday=turoboro.MONDAY,
+                                 except_months=(turoboro.JULY,), repeat_n_times=12),
+            # At 02:00, which is skipped on 2016-03-27 and repeated on 2016-10-30
+            turoboro.DailyRule(datetime(2016, 3, 20), on_hour=2, end_on=datetime(2016, 11, 5),
+                               timezone='Europe/Stockholm'),
+        )
+
+    def test_like_a_list(self):
+        for rule in self.rules:
+            # In UTC, as datetimes in the same timezone compare (and add up) by the wall clock
+            occurrences = rule.compute(return_as=turoboro.DATETIME_INSTANCE).all
+            points = [occurrences[0].replace(year=2013)]
+            for dt in occurrences + [occurrences[-1].replace(year=2017)]:
+                points.extend([dt - timedelta(seconds=1), dt, dt + timedelta(microseconds=1), dt + timedelta(hours=12)])
+            for point in points:
+                after = [dt for dt in occurrences if dt > point]
+                before = [dt for dt in occurrences if dt < point]
+                self.assertEqual(rule.next_after(point, turoboro.DATETIME_INSTANCE), after[0] if after else None)
+                self.assertEqual(rule.previous_before(point, turoboro.DATETIME_INSTANCE),
+                                 before[-1] if before else None)
+
+    def test_naive_and_infinite(self):
+        weekly_rule = turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.TUESDAY,), on_hour=8,
+                                          timezone='Asia/Kathmandu')
+        self.assertEqual(weekly_rule.next_after(datetime(2014, 1, 7, 8)), '2014-01-14T02:15:00+00:00')
+        self.assertEqual(weekly_rule.next_after(datetime(2014, 1, 7, 7, 59)), '2014-01-07T02:15:00+00:00')
+        self.assertEqual(weekly_rule.previous_before(datetime(2014, 1, 7, 8)), None)
+        self.assertEqual(weekly_rule.previous_before(datetime(2214, 1, 1), turoboro.POSIX), 7699544100)
+        self.assertEqual(weekly_rule.next_after(datetime(9999, 12, 31)), None)
+
+    def test_nth_and_index_of(self):
+        for rule in self.rules:
+            occurrences = rule.compute(return_as=turoboro.DATETIME_INSTANCE).all
+            for k, dt in enumerate(occurrences):
+                self.assertEqual(rule.nth(k, turoboro.DATETIME_INSTANCE), dt)
+                self.assertEqual(rule.nth(k - len(occurrences), turoboro.DATETIME_INSTANCE), dt)
+                self.assertEqual(rule.index_of(dt), k)
+                self.assertRaises(ValueError, rule.index_of, dt + timedelta(seconds=1))
+                if dt - timedelta(days=1) not in occurrences:
+                    self.assertRaises(ValueError, rule.index_of, dt - timedelta(days=1))
+            self.assertRaises(IndexError, rule.nth, len(occurrences))
+            self.assertRaises(IndexError, rule.nth, -len(occurrences) - 1)
+            self.assertRaises(ValueError, rule.index_of, occurrences[0] - timedelta(days=7))
+
+    def test_skipped_hour(self):
+        daily_rule = turoboro.DailyRule(datetime(2016, 3, 20), on_hour=2, timezone='Europe/Stockholm',
+                                        repeat_n_times=14)
+        skipped = daily_rule.nth(7, turoboro.DATETIME_INSTANCE)
+        self.assertEqual(daily_rule.nth(7), '2016-03-27T01:00:00+00:00')
+        self.assertEqual(daily_rule.index_of(skipped), 7)
+        self.assertEqual(daily_rule.index_of(datetime(2016, 3, 27, 2)), 7)
+        self.assertEqual(daily_rule.previous_before(skipped), '2016-03-26T01:00:00+00:00')
+        self.assertEqual(daily_rule.next_after(skipped), '2016-03-28T00:00:00+00:00')
+
+    def test_nth_of_infinite_rule(self):
+        daily_rule = turoboro.DailyRule(datetime(2014, 1, 1), except_months=(turoboro.JULY,), on_hour=8)
+        self.assertEqual(daily_rule.nth(100000), daily_rule.result().skip(100000).take(1)[0])
+        self.assertEqual(daily_rule.index_of(datetime(2300, 1, 1, 8)), 95593)
+        self.assertRaises(IndexError, daily_rule.nth, -1)
+        self.assertRaises(IndexError, daily_rule.nth, 10 ** 7)
+
+
+class MaskTests(unittest.TestCase):
+    def test_masks(self):
+        weekdays = turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND,
+                                      except_months=(turoboro.JULY, turoboro.AUGUST))
+        fortnightly = turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=14)
+        weekends = turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, except_months=(turoboro.JULY,))
+        quarterly = turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=1, weekday=turoboro.MONDAY,
+                                         every_nth_month=3)
+        long_months = turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31)
+
+        def weekdays_of(*rules):
+            mask = turoboro.arithmetic.WEEKDAY_MASK
+            for rule in rules:
+                mask &= rule.weekday_mask
+            return turoboro.common.from_mask(mask)
+
+        self.assertEqual(weekdays_of(weekdays), [0, 1, 2, 3, 4])
+        self.assertEqual(weekdays_of(fortnightly), [turoboro.WEDNESDAY])
+        self.assertIsNone(weekdays_of(weekdays, weekends))
+        self.assertEqual(weekdays_of(weekdays, quarterly), [turoboro.MONDAY])
+        self.assertEqual(turoboro.common.from_mask(weekdays.month_mask | weekends.month_mask, turoboro.JANUARY),
+                         [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12])
+        self.assertEqual(turoboro.common.from_mask(quarterly.month_mask, turoboro.JANUARY), [1, 4, 7, 10])
+        self.assertEqual(turoboro.common.from_mask(long_months.month_mask, turoboro.JANUARY), [1, 3, 5, 7, 8, 10, 12])
+
+    def test_masks_follow_the_spec(self):
+        rule = turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.MONDAY,))
+        self.assertEqual(rule.weekday_mask, 1)
+        rule.on_days(turoboro.MONDAY, turoboro.FRIDAY)
+        self.assertEqual(rule.weekday_mask, 0b10001)
+        self.assertTrue(rule._is_allowed(datetime(2014, 1, 3)))
+
+
+class DerivedStateTests(unittest.TestCase):
+    def test_cached_until_spec_changes(self):
+        daily_rule = turoboro.DailyRule(datetime(2014, 1, 1), repeat_n_times=10, timezone='Asia/Kathmandu')
+        daily_rule.compute()
+        pattern = daily_rule._pattern()
+        start = daily_rule.start_datetime
+        self.assertIs(daily_rule.timezone, daily_rule.timezone)
+        daily_rule.compute()
+        self.assertIs(daily_rule._pattern(), pattern)
+        self.assertIs(daily_rule.start_datetime, start)
+
+        daily_rule.on_hour(8)
+        self.assertIsNot(daily_rule._pattern(), pattern)
+        self.assertEqual(daily_rule.start_datetime.hour, 8)
+        self.assertEqual(daily_rule.compute().first, '2014-01-01T02:15:00+00:00')
+        daily_rule.repeat_n_times(3)
+        self.assertEqual(daily_rule.compute().last, '2014-01-03T02:15:00+00:00')
+
+
+class SetIfValidTests(unittest.TestCase):
+    def assertSameOutcome(self, rule, field, value):
+        """ Setting a single field must fail exactly as validating the whole spec does """
+        spec = dict(rule.spec)
+        spec[field] = value
+        try:
+            expected = rule.validate_spec(spec)
+        except (ValueError, voluptuous.Invalid) as error:
+            expected = (type(error), str(error))
+        try:
+            rule.set_if_valid(field, value)
+            outcome = rule.spec
+        except (ValueError, voluptuous.Invalid) as error:
+            outcome = (type(error), str(error))
+        self.assertEqual(outcome, expected)
+
+    def test_same_errors(self):
+        rules = (
+            lambda: turoboro.DailyRule(datetime(2014, 1, 1), end_on=datetime(2014, 2, 1)),
+            lambda: turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.MONDAY,), repeat_n_times=3),
+            lambda: turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=3),
+        )
+        values = (
+            ('start', '2013-01-01T00:00:00+00:00'), ('start', '2015-01-01T00:00:00+00:00'), ('start', 'yesterday'),
+            ('end', None), ('end', '2013-01-01T00:00:00+00:00'), ('repeat', 5), ('repeat', 0),
+            ('every_nth_day', 366), ('every_nth_week', 3), ('except_days', (turoboro.TUESDAY,)),
+            ('except_days', (turoboro.WEDNESDAY,)), ('on_days', None), ('on_days', (9,)),
+            ('except_months', (turoboro.JANUARY,)), ('except_months', turoboro.MONTHS), ('on_hour', 24),
+            ('timezone', 'Mars/Olympus_Mons'), ('timezone', 'Europe/Stockholm'), ('rule', 'yearly'),
+            ('day_of_month_rule', {'day': 32, 'every_nth': 1}), ('weekday_rule', None), ('unknown', 1),
+        )
+        for make_rule in rules:
+            for field, value in values:
+                self.assertSameOutcome(make_rule(), field, value)
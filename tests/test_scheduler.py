@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime
+import turoboro
+import turoboro.scheduler
+
+
+def timestamp(*args):
+    return turoboro.scheduler.to_timestamp(datetime(*args))
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = {
+            'weekdays': turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND, on_hour=8),
+            'weekends': turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, on_hour=10,
+                                            timezone='Europe/Stockholm'),
+            'monthly': turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=15, repeat_n_times=3),
+        }
+        self.scheduler = turoboro.scheduler.Scheduler(clock=lambda: timestamp(2014, 1, 1))
+        for key, rule in self.rules.items():
+            self.scheduler.add(key, rule)
+
+    def expected(self, lo, hi, keys=None):
+        return sorted(
+            (occurrence, key)
+            for key, rule in self.rules.items() if keys is None or key in keys
+            for occurrence in rule.compute(max_count_if_infinite=100, return_as=turoboro.POSIX).all
+            if timestamp(*lo) <= occurrence <= timestamp(*hi)
+        )
+
+    def test_pop_due(self):
+        self.assertEqual(len(self.scheduler), 3)
+        self.assertEqual(self.scheduler.next_timestamp(), timestamp(2014, 1, 1, 8))
+        due = []
+        for day in range(1, 32):
+            popped = self.scheduler.pop_due(datetime(2014, 1, day, 12))
+            self.assertTrue(all(occurrence <= timestamp(2014, 1, day, 12) for _, occurrence in popped))
+            due.extend(popped)
+        self.assertEqual(sorted((occurrence, key) for key, occurrence in due), self.expected((2014, 1, 1),
+                                                                                             (2014, 1, 31, 12)))
+        self.assertEqual(due[0], ('weekdays', timestamp(2014, 1, 1, 8)))
+        self.assertEqual(self.scheduler.pop_due(datetime(2014, 1, 31, 12)), [])
+
+    def test_pop_due_catches_up(self):
+        due = self.scheduler.pop_due(timestamp(2014, 6, 1), return_as=turoboro.ISO)
+        self.assertEqual(due[:2], [
+            ('weekdays', '2014-01-01T08:00:00+00:00'), ('weekdays', '2014-01-02T08:00:00+00:00')
+        ])
+        self.assertEqual(len([key for key, _ in due if key == 'monthly']), 3)
+        # The monthly rule is done, and has left the scheduler
+        self.assertNotIn('monthly', self.scheduler)
+        self.assertEqual(len(self.scheduler), 2)
+
+    def test_add_since(self):
+        self.assertRaises(KeyError, self.scheduler.add, 'weekdays', self.rules['weekdays'])
+        self.scheduler.add('later', self.rules['weekdays'], since=timestamp(2014, 1, 2, 8))
+        self.assertIn(('later', timestamp(2014, 1, 2, 8)), self.scheduler.pop_due(timestamp(2014, 1, 2, 8)))
+        self.assertEqual(self.scheduler.add('past', self.rules['monthly'], since=datetime(2015, 1, 1)), None)
+        self.assertNotIn('past', self.scheduler)
+
+    def test_remove_and_update(self):
+        self.assertIs(self.scheduler.remove('weekdays'), self.rules['weekdays'])
+        self.assertRaises(KeyError, self.scheduler.remove, 'weekdays')
+        self.rules['weekends'] = turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.SUNDAY,))
+        self.scheduler.update('weekends', self.rules['weekends'])
+        self.scheduler.update('new', turoboro.DailyRule(datetime(2014, 1, 10)))
+        self.assertEqual(
+            sorted((occurrence, key) for key, occurrence in self.scheduler.pop_due(timestamp(2014, 1, 10))),
+            [(timestamp(2014, 1, 5), 'weekends'), (timestamp(2014, 1, 10), 'new')]
+        )
+
+    def test_many_removals(self):
+        scheduler = turoboro.scheduler.Scheduler()
+        rule = turoboro.DailyRule(datetime(2014, 1, 1))
+        for n in range(1000):
+            scheduler.add(n, rule, since=0)
+        for n in range(999):
+            scheduler.remove(n)
+        self.assertLess(len(scheduler._heap), 100)
+        self.assertEqual(scheduler.pop_due(timestamp(2014, 1, 1)), [(999, timestamp(2014, 1, 1))])
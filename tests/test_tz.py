@@ -0,0 +1,128 @@
+import calendar
+import pickle
+import unittest
+from datetime import datetime, timedelta
+import pytz
+import voluptuous
+import turoboro
+import turoboro.offsets
+import turoboro.tz
+
+
+@unittest.skipIf(turoboro.tz.zoneinfo is None, 'zoneinfo requires Python 3.9')
+class BackendTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = turoboro.tz.get_backend()
+        turoboro.tz.set_backend(turoboro.tz.ZONEINFO)
+
+    def tearDown(self):
+        turoboro.tz.set_backend(self.backend)
+
+    def test_zoneinfo(self):
+        self.assertEqual(turoboro.tz.get_backend(), turoboro.tz.ZONEINFO)
+        self.assertIsInstance(turoboro.tz.timezone('Europe/Stockholm'), turoboro.tz.ZoneInfo)
+
+    def test_set_backend(self):
+        turoboro.tz.set_backend(turoboro.tz.PYTZ)
+        self.assertIs(turoboro.tz.timezone('Europe/Stockholm'), pytz.timezone('Europe/Stockholm'))
+        self.assertEqual(turoboro.DailyRule(datetime(2014, 1, 1), timezone='Asia/Tokyo').timezone,
+                         pytz.timezone('Asia/Tokyo'))
+        self.assertRaises(ValueError, turoboro.tz.set_backend, 'dateutil')
+
+    def test_is_timezone(self):
+        for backend in turoboro.tz.BACKENDS:
+            turoboro.tz.set_backend(backend)
+            self.assertEqual(turoboro.tz.is_timezone('Europe/Stockholm'), 'Europe/Stockholm')
+            for name in ('Europe/Nowhere', '', None, 3, '../etc/passwd', 'right/UTC', 'posix/Europe/Stockholm',
+                         'posixrules', 'localtime', 'Factory'):
+                self.assertRaises(ValueError, turoboro.tz.is_timezone, name)
+            self.assertIn('Europe/Stockholm', turoboro.tz.all_timezones())
+            self.assertNotIn('localtime', turoboro.tz.all_timezones())
+            self.assertRaises(voluptuous.MultipleInvalid, turoboro.DailyRule(datetime(2014, 1, 1)).set_if_valid,
+                              'timezone', 'Europe/Nowhere')
+
+    def test_localize_as_pytz(self):
+        timezone = turoboro.tz.timezone('America/New_York')
+        reference = pytz.timezone('America/New_York')
+        # Regular, skipped and repeated wall clock times
+        for dt in (datetime(2014, 7, 1, 8), datetime(2014, 3, 9, 2, 30), datetime(2014, 11, 2, 1, 30)):
+            for is_dst in (False, True):
+                localized = timezone.localize(dt, is_dst=is_dst)
+                self.assertEqual(localized.replace(tzinfo=None), dt)
+                self.assertEqual(localized.utcoffset(), reference.localize(dt, is_dst=is_dst).utcoffset())
+        self.assertRaises(ValueError, timezone.localize, timezone.localize(datetime(2014, 1, 1)))
+        self.assertEqual(timezone.normalize(datetime(2014, 7, 1, 12, tzinfo=turoboro.tz.UTC)).hour, 8)
+        self.assertEqual(timezone.zone, 'America/New_York')
+        self.assertIs(pickle.loads(pickle.dumps(timezone)), timezone)
+
+    def test_same_occurrences(self):
+        def compute():
+            # The second and third rules start and end on opposite sides of a daylight saving time change
+            rules = [
+                turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, timezone='Australia/Sydney', on_hour=2,
+                                    end_on=datetime(2016, 1, 1)),
+                turoboro.DailyRule(datetime(2014, 3, 30), on_hour=5, end_on=datetime(2014, 10, 26),
+                                   timezone='Europe/Stockholm'),
+                turoboro.DailyRule(datetime(2014, 3, 29), on_hour=5, end_on=datetime(2014, 10, 25),
+                                   timezone='Europe/Stockholm'),
+            ]
+            return rules, [rule.compute(return_as=turoboro.POSIX).all for rule in rules]
+
+        rules, occurrences = compute()
+        turoboro.tz.set_backend(turoboro.tz.PYTZ)
+        pytz_rules, pytz_occurrences = compute()
+        self.assertEqual(occurrences, pytz_occurrences)
+        self.assertEqual(rules[1].spec['start'], '2014-03-30T05:00:00+02:00')
+        self.assertEqual(rules[1].spec['end'], '2014-10-27T05:00:00+01:00')
+        for rule, pytz_rule in zip(rules, pytz_rules):
+            self.assertEqual(repr(rule), repr(pytz_rule))
+            self.assertEqual(rule.to_bytes(), pytz_rule.to_bytes())
+
+
+@unittest.skipIf(turoboro.tz.zoneinfo is None, 'zoneinfo requires Python 3.9')
+class ZoneInfoOffsetTableTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = turoboro.tz.get_backend()
+        turoboro.tz.set_backend(turoboro.tz.ZONEINFO)
+
+    def tearDown(self):
+        turoboro.tz.set_backend(self.backend)
+
+    def assertLocalized(self, table, timezone, dt):
+        self.assertEqual(table.to_utc(turoboro.offsets.wall_seconds(dt)),
+                         calendar.timegm(timezone.localize(dt).utctimetuple()), dt)
+
+    def test_same_as_localize(self):
+        timezone = turoboro.tz.ZoneInfo('Europe/Stockholm')
+        table = turoboro.offsets.build(timezone)
+        since_1900 = [offset for time, offset in zip(table.transitions, table.offsets) if time > -2208988800]
+        self.assertEqual(set(since_1900), set([3600, 7200]))
+        dt = datetime(1960, 1, 1, 0, 30)
+        while dt.year < 2060:
+            self.assertLocalized(table, timezone, dt)
+            dt += timedelta(hours=37)
+
+    def test_beyond_the_listed_transitions(self):
+        timezone = turoboro.tz.ZoneInfo('Europe/Stockholm')
+        table = turoboro.offsets.build(timezone)
+        # Worked out from the rule of the timezone, and beyond HORIZON_YEAR asked of the timezone
+        for year in (2040, 2101, turoboro.offsets.HORIZON_YEAR - 1, turoboro.offsets.HORIZON_YEAR, 9999):
+            for dt in (datetime(year, 1, 1, 12), datetime(year, 7, 1, 12)):
+                self.assertLocalized(table, timezone, dt)
+        rule = turoboro.DailyRule(datetime(2101, 7, 1), on_hour=12, timezone='Europe/Stockholm')
+        self.assertEqual(rule.nth(0), '2101-07-01T10:00:00+00:00')
+
+    def test_southern_hemisphere(self):
+        timezone = turoboro.tz.ZoneInfo('Australia/Sydney')
+        table = turoboro.offsets.build(timezone)
+        for dt in (datetime(2061, 1, 1, 12), datetime(2061, 4, 3, 2, 30), datetime(2061, 10, 2, 2, 30)):
+            self.assertLocalized(table, timezone, dt)
+
+    def test_fixed_offset(self):
+        self.assertEqual(turoboro.offsets.build(turoboro.tz.UTC).fixed_offset, 0)
+        self.assertEqual(turoboro.offsets.build(turoboro.tz.ZoneInfo('Etc/GMT-3')).fixed_offset, 10800)
+        # No daylight saving time since 1951, and none to come
+        table = turoboro.offsets.build(turoboro.tz.ZoneInfo('Asia/Tokyo'))
+        self.assertEqual(table.end, float('inf'))
+        self.assertEqual(table.to_utc(turoboro.offsets.wall_seconds(datetime(3000, 7, 1, 9))),
+                         calendar.timegm((3000, 7, 1, 0, 0, 0)))
@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime
+import turoboro
+import turoboro.vectorized
+
+
+@unittest.skipIf(turoboro.vectorized.numpy is None, 'numpy is not installed')
+class VectorizedComputeTests(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            turoboro.DailyRule(datetime(2014, 1, 1), end_on=datetime(2016, 12, 31), every_nth_day=3,
+                               except_weekdays=turoboro.WEEKEND, except_months=(turoboro.FEBRUARY,), on_hour=8,
+                               timezone='Asia/Kathmandu'),
+            turoboro.WeeklyRule(datetime(2014, 1, 1), turoboro.WEEKEND, repeat_n_times=40, every_nth_week=3),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31, every_nth_month=1),
+            turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=5, weekday=turoboro.FRIDAY, every_nth_month=2,
+                                 except_months=(turoboro.MAY,), repeat_n_times=10),
+        ]
+
+    def test_same_as_compute(self):
+        for rule in self.rules:
+            for return_as in (turoboro.ISO, turoboro.POSIX, turoboro.DATETIME_INSTANCE):
+                for from_dt in (None, datetime(2015, 2, 3)):
+                    expected = rule.compute(from_dt=from_dt, return_as=return_as)
+                    result = turoboro.vectorized.compute(rule, from_dt=from_dt, return_as=return_as)
+                    self.assertEqual(result.all, expected.all)
+                    self.assertEqual(result.count, expected.count)
+                    self.assertEqual(result.first, expected.first)
+                    self.assertEqual(result.last, expected.last)
+                    self.assertEqual(result.infinite, expected.infinite)
+
+    def test_array(self):
+        result = turoboro.vectorized.compute(self.rules[1])
+        self.assertEqual(str(result.datetimes.dtype), 'datetime64[s]')
+        self.assertEqual(len(result.datetimes), 40)
+        self.assertEqual(result.segment(datetime(2014, 1, 10), datetime(2014, 1, 26)),
+                         ['2014-01-25T00:00:00+00:00', '2014-01-26T00:00:00+00:00'])
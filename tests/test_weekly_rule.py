@@ -224,6 +224,14 @@ class WeeklyRuleWithRepeatNTimesTests(unittest.TestCase):
         self.assertEqual(next(result), '2014-01-02T08:15:00+00:00')
         self.assertEqual(next(result), '2014-01-05T08:15:00+00:00')
 
+    def test_sparse_every_nth_week(self):
+        """ Mondays of every 4th week, the first week being the one of Wednesday 2014-01-01 """
+        weekly_rule = turoboro.WeeklyRule(
+            datetime(2014, 1, 1), repeat_n_times=4, every_nth_week=4, on_days=(turoboro.MONDAY,)
+        )
+        self.assertEqual(weekly_rule.compute().all, ['2014-01-27T00:00:00+00:00', '2014-02-24T00:00:00+00:00',
+                                                     '2014-03-24T00:00:00+00:00', '2014-04-21T00:00:00+00:00'])
+
 
 class WeeklyInfiniteRuleTests(unittest.TestCase):
     def test(self):
@@ -301,5 +309,5 @@ class WeeklyInfiniteRuleTests(unittest.TestCase):
         )
 
         result = daily_rule.result(datetime.utcnow())
-        for res in result:
-            daily_rule._is_allowed(turoboro.common.datetime_from_isoformat(res))
+        for res in itertools.islice(result, 5000):
+            self.assertTrue(daily_rule._is_allowed(turoboro.common.datetime_from_isoformat(res)))
@@ -0,0 +1,95 @@
+import threading
+import unittest
+from datetime import date, datetime
+import turoboro
+import turoboro.year_cache
+
+
+class YearCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = turoboro.year_cache.YearCache(maxsize=4)
+        self.lo = date(2015, 6, 1).toordinal()
+        self.hi = date(2017, 3, 1).toordinal()
+
+    def assertOrdinals(self, rule, lo=None, hi=None):
+        pattern = rule._pattern()
+        lo = self.lo if lo is None else lo
+        hi = self.hi if hi is None else hi
+        self.assertEqual(list(self.cache.ordinals(pattern, lo, hi)), list(pattern.iterate(lo, hi)))
+
+    def test_ordinals(self):
+        self.assertOrdinals(turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=3, except_weekdays=turoboro.WEEKEND,
+                                               except_months=(turoboro.JULY,)))
+        self.assertOrdinals(turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.MONDAY,), every_nth_week=5))
+        self.assertOrdinals(turoboro.MonthlyRule(datetime(2014, 1, 1), day_of_month=31, every_nth_month=5))
+        self.assertOrdinals(turoboro.MonthlyRule(datetime(2014, 1, 1), weekday_count=5, weekday=turoboro.FRIDAY))
+        # Starting within the window, and at both ends of time
+        self.assertOrdinals(turoboro.DailyRule(datetime(2016, 2, 29), every_nth_day=2))
+        self.assertOrdinals(turoboro.DailyRule(datetime(1, 1, 1)), 1, 400)
+        self.assertOrdinals(turoboro.WeeklyRule(datetime(9999, 1, 1), (turoboro.FRIDAY,)),
+                            date(9998, 6, 1).toordinal(), date.max.toordinal() + 1)
+
+    def test_shared_shapes(self):
+        self.cache.resize(100)
+        for day in range(6, 11):
+            self.assertOrdinals(turoboro.DailyRule(datetime(2014, 1, day), except_weekdays=turoboro.WEEKEND))
+        for day in range(1, 15):
+            self.assertOrdinals(turoboro.WeeklyRule(datetime(2014, 1, day), (turoboro.MONDAY,), every_nth_week=2,
+                                                    on_hour=day, timezone='Asia/Tokyo'))
+        # Three years for the weekdays, and three for each of the two fortnightly phases
+        self.assertEqual(self.cache.info().misses, 9)
+
+    def test_lru(self):
+        pattern = turoboro.DailyRule(datetime(2014, 1, 1))._pattern()
+        list(self.cache.ordinals(pattern, date(2014, 1, 1).toordinal(), date(2018, 1, 1).toordinal()))
+        self.assertEqual(self.cache.info(), turoboro.year_cache.CacheInfo(0, 4, 4, 4))
+        self.cache.calendar(pattern, 2014)
+        self.cache.calendar(pattern, 2018)
+        self.cache.calendar(pattern, 2014)
+        self.cache.calendar(pattern, 2015)
+        self.assertEqual(self.cache.info(), turoboro.year_cache.CacheInfo(2, 6, 4, 4))
+
+        self.cache.resize(2)
+        self.assertEqual(self.cache.info().currsize, 2)
+        self.cache.calendar(pattern, 2014)
+        self.assertEqual(self.cache.info().hits, 3)
+        self.cache.clear()
+        self.assertEqual(self.cache.info(), turoboro.year_cache.CacheInfo(0, 0, 2, 0))
+
+    def test_bitmap(self):
+        weekdays = turoboro.DailyRule(datetime(2014, 1, 1), except_weekdays=turoboro.WEEKEND)._pattern()
+        mondays = turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.MONDAY, turoboro.SATURDAY))._pattern()
+        both = self.cache.calendar(weekdays, 2014).bitmap & self.cache.calendar(mondays, 2014).bitmap
+        self.assertEqual([day for day in range(366) if both >> day & 1][:3], [5, 12, 19])
+
+    def test_threads(self):
+        pattern = turoboro.DailyRule(datetime(2014, 1, 1), every_nth_day=2)._pattern()
+        expected = list(pattern.iterate(self.lo, self.hi))
+        results = []
+
+        def compute():
+            for _ in range(20):
+                results.append(list(self.cache.ordinals(pattern, self.lo, self.hi)) == expected)
+
+        threads = [threading.Thread(target=compute) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [True] * 80)
+
+    def test_process_wide_cache(self):
+        turoboro.year_cache.clear()
+        rules = [turoboro.DailyRule(datetime(2014, 1, 1), on_hour=hour) for hour in range(24)]
+        turoboro.compute_many(rules, datetime(2015, 1, 1), datetime(2016, 1, 1))
+        info = turoboro.year_cache.cache_info()
+        self.assertEqual((info.misses, info.currsize), (1, 1))
+
+    def test_compute_through_the_cache(self):
+        turoboro.year_cache.clear()
+        rules = [turoboro.WeeklyRule(datetime(2014, 1, 1), (turoboro.MONDAY,), end_on=datetime(2014, 12, 31),
+                                     on_hour=hour) for hour in range(3)]
+        self.assertEqual([len(rule.compute().all) for rule in rules], [52] * 3)
+        self.assertEqual(len(list(rules[0].result())), 52)
+        info = turoboro.year_cache.cache_info()
+        self.assertEqual((info.hits, info.misses), (3, 1))
@@ -3,3 +3,4 @@ from turoboro.daily_rule import DailyRule
 from turoboro.weekly_rule import WeeklyRule
 from turoboro.monthly_rule import MonthlyRule
 from turoboro.rules import Rule
+from turoboro.batch import compute_many
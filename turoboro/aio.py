@@ -0,0 +1,166 @@
+"""
+asyncio counterparts of `Rule.result`, `turoboro.compute_many` and `turoboro.scheduler.Scheduler`, that keep the event
+loop responsive (Python 3 only).
+
+    >>> async for occurrence in rule.aiter(from_dt=datetime.utcnow()):
+    ...     print(occurrence)
+
+    >>> scheduler = turoboro.aio.AsyncScheduler()
+    >>> scheduler.add('standup', rule, remind_standup)
+    >>> await scheduler.run()
+"""
+from collections import deque
+import asyncio
+import functools
+import inspect
+import time
+import turoboro
+import turoboro.scheduler
+
+CHUNK_SIZE = 100
+# Chunks of occurrences up to this size are computed on the event loop, bigger ones in an executor
+INLINE_LIMIT = 1000
+
+
+class OccurrenceStream(object):
+    """
+    Asynchronously iterates over a `turoboro.result.OccurrenceIterator`, a chunk of occurrences at a time. Between
+    chunks the event loop gets to run other tasks, and chunks bigger than `INLINE_LIMIT` are computed in `executor`
+    rather than on the loop.
+    :param iterator: The iterator, as returned by `Rule.result`
+    :type iterator: turoboro.result.OccurrenceIterator
+    :param chunk_size: The number of occurrences to compute at a time
+    :type chunk_size: int
+    :param executor: The executor for big chunks, defaults to the loop's default (thread pool) executor
+    :type executor: concurrent.futures.Executor | None
+    """
+    def __init__(self, iterator, chunk_size=CHUNK_SIZE, executor=None):
+        self.iterator = iterator
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self._buffer = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def _fill(self):
+        if self.chunk_size <= INLINE_LIMIT:
+            await asyncio.sleep(0)
+            return self.iterator.take(self.chunk_size)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self.iterator.take, self.chunk_size)
+
+    async def __anext__(self):
+        if not self._buffer:
+            self._buffer.extend(await self._fill())
+            if not self._buffer:
+                raise StopAsyncIteration
+        return self._buffer.popleft()
+
+
+async def compute_many(rules, window_start, window_end, return_as=turoboro.ISO, executor=None):
+    """
+    `turoboro.compute_many`, run in an executor so that the event loop carries on meanwhile.
+    :param executor: The executor, defaults to the loop's default (thread pool) executor. A process pool works too, as
+    rules can be pickled
+    :type executor: concurrent.futures.Executor | None
+    :return: turoboro.batch.Columns
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, functools.partial(
+        turoboro.compute_many, rules, window_start, window_end, return_as=return_as
+    ))
+
+
+class AsyncScheduler(object):
+    """
+    Sleeps until the earliest next occurrence among its rules, and then calls back every rule that is due, see
+    `turoboro.scheduler.Scheduler`. Callbacks are called with the key of the rule and the occurrence. Coroutine
+    functions are scheduled as tasks, so a slow callback does not hold up the others.
+    :param return_as: How to represent the occurrences passed to the callbacks
+    :type return_as: str
+    :param clock: Returns the current time as a POSIX timestamp
+    :type clock: callable
+    """
+    def __init__(self, return_as=turoboro.DATETIME_INSTANCE, clock=time.time):
+        self.return_as = return_as
+        self.clock = clock
+        self.scheduler = turoboro.scheduler.Scheduler(clock)
+        self._callbacks = {}
+        self._changed = None
+        self._running = False
+
+    def __len__(self):
+        return len(self.scheduler)
+
+    def __contains__(self, key):
+        return key in self.scheduler
+
+    def _wake_up(self):
+        if self._changed is not None:
+            self._changed.set()
+
+    def add(self, key, rule, callback, since=None):
+        """
+        Schedules a rule, see `turoboro.scheduler.Scheduler.add`.
+        :param callback: Called with the key and the occurrence whenever the rule is due
+        :type callback: callable
+        :return: int | None, the timestamp of the first occurrence
+        """
+        timestamp = self.scheduler.add(key, rule, since)
+        if timestamp is not None:
+            self._callbacks[key] = callback
+            self._wake_up()
+        return timestamp
+
+    def remove(self, key):
+        """ Unschedules a rule, see `turoboro.scheduler.Scheduler.remove` """
+        del self._callbacks[key]
+        self._wake_up()
+        return self.scheduler.remove(key)
+
+    def update(self, key, rule, callback=None, since=None):
+        """ Replaces the rule (and the callback, if given) of a key, see `turoboro.scheduler.Scheduler.update` """
+        callback = self._callbacks.get(key) if callback is None else callback
+        if key in self.scheduler:
+            self.remove(key)
+        return self.add(key, rule, callback, since)
+
+    def _dispatch(self, now):
+        for key, occurrence in self.scheduler.pop_due(now, self.return_as):
+            if key in self.scheduler:
+                callback = self._callbacks.get(key)
+            else:
+                # That was its last occurrence, or an earlier callback removed the rule
+                callback = self._callbacks.pop(key, None)
+            if callback is None:
+                continue
+            if inspect.iscoroutinefunction(callback):
+                asyncio.ensure_future(callback(key, occurrence))
+            else:
+                callback(key, occurrence)
+
+    async def run(self):
+        """
+        Calls back rules as they are due, until `stop` is called.
+        """
+        self._changed = asyncio.Event()
+        self._running = True
+        try:
+            while self._running:
+                self._changed.clear()
+                self._dispatch(self.clock())
+                timestamp = self.scheduler.next_timestamp()
+                timeout = None if timestamp is None else max(0, timestamp - self.clock())
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._changed = None
+
+    def stop(self):
+        """ Makes `run` return """
+        self._running = False
+        self._wake_up()
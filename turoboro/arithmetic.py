@@ -0,0 +1,499 @@
+from bisect import bisect_left
+from calendar import timegm
+from copy import copy
+from datetime import date
+from itertools import islice
+import turoboro.year_cache
+
+MAX_ORDINAL = date.max.toordinal()
+MAX_MONTH = date.max.year * 12 + date.max.month - 1
+# Weekdays and months as the bits of an int: bit 0 is Monday, and January respectively
+WEEKDAY_MASK = 0x7f
+MONTH_MASK = 0xfff
+_DAYS_BEFORE_MONTH = (None, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_MONTH_LENGTHS = ((1, 31), (2, 28), (3, 31), (4, 30), (5, 31), (6, 30), (7, 31), (8, 31), (9, 30), (10, 31), (11, 30),
+                  (12, 31))
+
+
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def lcm(a, b):
+    return a * b // gcd(a, b)
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_before_year(year):
+    y = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400
+
+
+def month_start(year, month):
+    """
+    The ordinal of the first day of a month. Months past December roll over into the following years.
+    :param year: The year
+    :type year: int
+    :param month: The month, 1-based, may be larger than 12
+    :type month: int
+    :return: int
+    """
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return days_before_year(year) + _DAYS_BEFORE_MONTH[month] + (month > 2 and is_leap(year)) + 1
+
+
+def weekday(ordinal):
+    return (ordinal + 6) % 7
+
+
+def day_filter(weekday_mask, month_mask):
+    """
+    Combines a mask of weekdays and a mask of months into a table of the days that pass both, where bit
+    `7 * month + weekday` (months from 1) is set for each such day, so that a day is tested with a single shift.
+    :param weekday_mask: The allowed weekdays, bit 0 is Monday
+    :type weekday_mask: int
+    :param month_mask: The allowed months, bit 0 is January
+    :type month_mask: int
+    :return: int
+    """
+    table = 0
+    for month in range(12):
+        if month_mask >> month & 1:
+            table |= (weekday_mask & WEEKDAY_MASK) << 7 * (month + 1)
+    return table
+
+
+def month_index(ordinal):
+    """ The number of months since year 0 of the month that the ordinal falls in """
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+class OrdinalPattern(object):
+    """
+    Describes the days of a recurring rule as integer ordinals (as per `date.toordinal()`). Candidate days are
+    `anchor + n * period + offset` for every offset in `offsets`, and a candidate is an occurrence if it is on or after
+    `first` and does not fall in one of `except_months`.
+
+    Since candidates repeat with a fixed period we never have to visit the days in between occurrences: counting
+    and indexing is done with integer division, one calendar month at a time when months are excluded.
+    """
+    def __init__(self, anchor, period, offsets, first, except_months=None):
+        self.anchor = anchor
+        self.period = period
+        self.offsets = tuple(sorted(set(offsets)))
+        self.first = first
+        self.except_months = frozenset(except_months or ())
+        self.except_month_mask = sum(1 << (month - 1) for month in self.except_months)
+        self._sorted_except_months = sorted(self.except_months)
+
+    @property
+    def shape(self):
+        """
+        Everything the candidates depend on, but not `first`: patterns of the same shape have the same candidates,
+        whatever day they start on.
+        :return: tuple
+        """
+        phases = tuple(sorted((self.anchor + offset) % self.period for offset in self.offsets))
+        return 'days', self.period, phases, self.except_month_mask
+
+    def unbounded(self, first=1):
+        """
+        A pattern of the same shape that occurs from `first` on, by default from the start of time (`date.min`).
+        :return: turoboro.arithmetic.OrdinalPattern
+        """
+        phases = [(self.anchor + offset) % self.period for offset in self.offsets]
+        return OrdinalPattern(0, self.period, phases, first, self.except_months)
+
+    @property
+    def weekday_mask(self):
+        """ The weekdays that occurrences can fall on, as the bits of an int (bit 0 is Monday) """
+        if not self.offsets:
+            return 0
+        if self.period % 7:
+            return WEEKDAY_MASK
+
+        mask = 0
+        for offset in self.offsets:
+            mask |= 1 << weekday(self.anchor + offset)
+        return mask
+
+    @property
+    def month_mask(self):
+        """ The months that occurrences can fall in, as the bits of an int (bit 0 is January) """
+        return MONTH_MASK & ~self.except_month_mask if self.offsets else 0
+
+    def _index(self, ordinal):
+        """ The number of candidates in [anchor, ordinal), negative if ordinal is before anchor """
+        q, r = divmod(ordinal - self.anchor, self.period)
+        return q * len(self.offsets) + bisect_left(self.offsets, r)
+
+    def _candidate(self, index):
+        q, r = divmod(index, len(self.offsets))
+        return self.anchor + q * self.period + self.offsets[r]
+
+    def _excluded(self, lo, hi):
+        """
+        Yields (lo, hi) pairs of consecutive days in excluded months within [lo, hi), jumping from one excluded month
+        to the next so that the months in between are never visited.
+        """
+        year = date.fromordinal(lo).year
+        run_lo = run_hi = None
+        while True:
+            for month in self._sorted_except_months:
+                month_lo = month_start(year, month)
+                if month_lo >= hi:
+                    if run_lo is not None:
+                        yield max(run_lo, lo), min(run_hi, hi)
+                    return
+                month_hi = month_start(year, month + 1)
+                if month_hi <= lo:
+                    continue
+                if month_lo == run_hi:
+                    run_hi = month_hi
+                    continue
+                if run_lo is not None:
+                    yield max(run_lo, lo), min(run_hi, hi)
+                run_lo, run_hi = month_lo, month_hi
+            year += 1
+
+    def _segments(self, lo, hi=None):
+        """
+        Yields (lo, hi) pairs of consecutive days that are not in an excepted month.
+        """
+        hi = MAX_ORDINAL + 1 if hi is None else min(hi, MAX_ORDINAL + 1)
+        if lo >= hi:
+            return
+        if not self.except_months:
+            yield lo, hi
+            return
+
+        cursor = lo
+        for excluded_lo, excluded_hi in self._excluded(lo, hi):
+            if cursor < excluded_lo:
+                yield cursor, excluded_lo
+            cursor = excluded_hi
+        if cursor < hi:
+            yield cursor, hi
+
+    def count(self, lo, hi=None):
+        """
+        The number of occurrences in [lo, hi).
+        :param lo: The first ordinal to consider
+        :type lo: int
+        :param hi: The first ordinal to not consider, None means until the end of time (`date.max`)
+        :type hi: int | None
+        :return: int
+        """
+        return sum(
+            self._index(segment_hi) - self._index(segment_lo)
+            for segment_lo, segment_hi in self._segments(max(lo, self.first), hi)
+        )
+
+    def nth(self, n, lo=None):
+        """
+        The `n`th (zero based) occurrence on or after `lo`.
+        :param n: The number of occurrences to skip
+        :type n: int
+        :param lo: The ordinal to count from, defaults to the first occurrence
+        :type lo: int | None
+        :return: int | None, None if the occurrence is beyond `date.max`
+        """
+        lo = self.first if lo is None else max(lo, self.first)
+        for segment_lo, segment_hi in self._segments(lo):
+            index = self._index(segment_lo)
+            available = self._index(segment_hi) - index
+            if n < available:
+                return self._candidate(index + n)
+            n -= available
+
+        return None
+
+    def last_before(self, hi):
+        """
+        The last occurrence before `hi`.
+        :param hi: The first ordinal to not consider
+        :type hi: int
+        :return: int | None, None if there is no occurrence before `hi`
+        """
+        hi = min(hi, MAX_ORDINAL + 1)
+        while self.offsets and hi > self.first:
+            candidate = self._candidate(self._index(hi) - 1)
+            if candidate < self.first:
+                return None
+            if not self.except_months:
+                return candidate
+            day = date.fromordinal(candidate)
+            if not self.except_month_mask >> (day.month - 1) & 1:
+                return candidate
+            hi = month_start(day.year, day.month)
+
+        return None
+
+    def iterate(self, lo=None, hi=None):
+        """
+        Yields every occurrence in [lo, hi) in order.
+        """
+        lo = self.first if lo is None else max(lo, self.first)
+        offsets, period = self.offsets, self.period
+        for segment_lo, segment_hi in self._segments(lo, hi):
+            index = self._index(segment_lo)
+            remaining = self._index(segment_hi) - index
+            if remaining <= 0:
+                continue
+            q, r = divmod(index, len(offsets))
+            base = self.anchor + q * period
+            while remaining > 0:
+                # One period at a time, rather than a divmod per occurrence
+                for offset in offsets[r:r + remaining]:
+                    yield base + offset
+                remaining -= len(offsets) - r
+                base += period
+                r = 0
+
+
+class MonthPattern(object):
+    """
+    Describes the days of a monthly rule as integer ordinals: a given `day` of the month, or the `weekday_count`th
+    `weekday` of the month, in every `every_nth` month from the month of `first`, except `except_months`. Months that
+    do not have such a day (the 31st of April, or a fifth Monday) are skipped.
+
+    Candidate months are found with an OrdinalPattern over month indexes, so we jump from one included month to the
+    next without visiting the days in between.
+    """
+    def __init__(self, first, every_nth, except_months=None, day=None, weekday=None, weekday_count=None):
+        self.first = first
+        self.day = day
+        self.weekday = weekday
+        self.weekday_count = weekday_count
+        first_month = month_index(first)
+        period = lcm(every_nth, 12)
+        except_months = set(except_months or ())
+        if day is not None and day > 29:
+            # Months that never have the day can be left out up front (the 29th of February comes and goes)
+            except_months.update(month for month, length in _MONTH_LENGTHS if length < day)
+        self.months = OrdinalPattern(first_month, period, [
+            offset for offset in range(0, period, every_nth) if (first_month + offset) % 12 + 1 not in except_months
+        ], first_month)
+        # Every candidate month holds exactly one occurrence unless the day may be missing from some months
+        self.regular = (day is not None and day != 29) or (weekday_count is not None and weekday_count <= 4)
+
+    @property
+    def shape(self):
+        """ See `OrdinalPattern.shape` """
+        return 'months', self.months.shape, self.day, self.weekday, self.weekday_count
+
+    def unbounded(self):
+        """ See `OrdinalPattern.unbounded` """
+        pattern = copy(self)
+        pattern.first = 1
+        pattern.months = self.months.unbounded(month_index(1))
+        return pattern
+
+    @property
+    def weekday_mask(self):
+        """ The weekdays that occurrences can fall on, as the bits of an int (bit 0 is Monday) """
+        if not self.months.offsets:
+            return 0
+        return WEEKDAY_MASK if self.weekday is None else 1 << self.weekday
+
+    @property
+    def month_mask(self):
+        """ The months that occurrences can fall in, as the bits of an int (bit 0 is January) """
+        mask = 0
+        for offset in self.months.offsets:
+            mask |= 1 << (self.months.anchor + offset) % 12
+        return mask
+
+    def day_in(self, month):
+        """
+        The ordinal of the rule's day in a month, whether or not the month is a candidate.
+        :param month: A month index, as given by `month_index`
+        :type month: int
+        :return: int | None, None if the month does not have such a day
+        """
+        year, month = divmod(month, 12)
+        start = month_start(year, month + 1)
+        length = month_start(year, month + 2) - start
+        if self.day is not None:
+            return start + self.day - 1 if self.day <= length else None
+
+        ordinal = start + (self.weekday - weekday(start)) % 7 + 7 * (self.weekday_count - 1)
+        return ordinal if ordinal < start + length else None
+
+    def _month_bound(self, ordinal):
+        """ The first month index whose day (if any) is on or after the ordinal """
+        if ordinal > MAX_ORDINAL:
+            return MAX_MONTH + 1
+        month = month_index(ordinal)
+        day = self.day_in(month)
+        return month + 1 if day is None or day < ordinal else month
+
+    def _months(self, lo, hi=None):
+        hi = MAX_MONTH + 1 if hi is None else self._month_bound(hi)
+        return self._month_bound(max(lo, self.first)), hi
+
+    def count(self, lo, hi=None):
+        """
+        The number of occurrences in [lo, hi).
+        :param lo: The first ordinal to consider
+        :type lo: int
+        :param hi: The first ordinal to not consider, None means until the end of time (`date.max`)
+        :type hi: int | None
+        :return: int
+        """
+        lo, hi = self._months(lo, hi)
+        if self.regular:
+            return self.months.count(lo, hi)
+
+        return sum(1 for _ in self._days(lo, hi))
+
+    def nth(self, n, lo=None):
+        """
+        The `n`th (zero based) occurrence on or after `lo`.
+        :param n: The number of occurrences to skip
+        :type n: int
+        :param lo: The ordinal to count from, defaults to the first occurrence
+        :type lo: int | None
+        :return: int | None, None if the occurrence is beyond `date.max`
+        """
+        lo, hi = self._months(self.first if lo is None else lo)
+        if self.regular:
+            month = self.months.nth(n, lo)
+            return None if month is None or month > MAX_MONTH else self.day_in(month)
+
+        for ordinal in self._days(lo, hi):
+            if n == 0:
+                return ordinal
+            n -= 1
+
+        return None
+
+    def last_before(self, hi):
+        """
+        The last occurrence before `hi`.
+        :param hi: The first ordinal to not consider
+        :type hi: int
+        :return: int | None, None if there is no occurrence before `hi`
+        """
+        month = self._month_bound(hi)
+        while True:
+            month = self.months.last_before(month)
+            if month is None:
+                return None
+            ordinal = self.day_in(month)
+            if ordinal is not None:
+                return ordinal if ordinal >= self.first else None
+
+    def _days(self, lo, hi):
+        """ Yields the occurrences in the candidate months from month index `lo` up to `hi` """
+        for month in self.months.iterate(lo, hi):
+            ordinal = self.day_in(month)
+            if ordinal is not None:
+                yield ordinal
+
+    def iterate(self, lo=None, hi=None):
+        """
+        Yields every occurrence in [lo, hi) in order.
+        """
+        return self._days(*self._months(self.first if lo is None else lo, hi))
+
+
+class OccurrenceSequence(object):
+    """
+    A sorted, read only sequence of `length` occurrences of a pattern starting on or after ordinal `lo`. Items are
+    computed when accessed, so that `len()`, the first and the last item can be had without building a list.
+    `to_timestamp`, when given, turns an ordinal straight into the POSIX timestamp of its occurrence.
+    """
+    def __init__(self, pattern, lo, length, to_datetime, to_timestamp=None):
+        self.pattern = pattern
+        self.lo = lo
+        self.length = length
+        self.to_datetime = to_datetime
+        self.to_timestamp = to_timestamp
+
+    @classmethod
+    def until(cls, pattern, lo, hi, to_datetime, to_timestamp=None):
+        return cls(pattern, lo, pattern.count(lo, hi), to_datetime, to_timestamp)
+
+    @classmethod
+    def at_most(cls, pattern, lo, max_count, to_datetime, to_timestamp=None):
+        if max_count > 0 and pattern.nth(max_count - 1, lo) is None:
+            max_count = pattern.count(lo)
+        return cls(pattern, lo, max_count, to_datetime, to_timestamp)
+
+    def ordinals(self):
+        return islice(turoboro.year_cache.ordinals(self.pattern, self.lo, MAX_ORDINAL + 1), self.length)
+
+    def timestamps(self):
+        """
+        The POSIX timestamps of the occurrences, without creating a datetime for any of them.
+        :return: list
+        """
+        return list(map(self.to_timestamp, self.ordinals()))
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for ordinal in self.ordinals():
+            yield self.to_datetime(ordinal)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.length)
+            if step != 1:
+                return list(self)[item]
+            lo = self.lo if stop <= start else self.pattern.nth(start, self.lo)
+            return OccurrenceSequence(self.pattern, lo, max(stop - start, 0), self.to_datetime, self.to_timestamp)
+        if item < 0:
+            item += self.length
+        if not 0 <= item < self.length:
+            raise IndexError('Occurrence index out of range')
+
+        return self.to_datetime(self.pattern.nth(item, self.lo))
+
+    def _first_ordinal(self, dt, after):
+        """
+        The first ordinal from `lo` whose datetime is on or after (or strictly after) `dt`, found by binary search
+        over the ordinals so that no occurrence has to be indexed.
+        """
+        if self.to_timestamp is None:
+            key, target = self.to_datetime, dt
+        else:
+            to_timestamp = self.to_timestamp
+            key, target = lambda ordinal: (to_timestamp(ordinal), 0), (timegm(dt.utctimetuple()), dt.microsecond)
+
+        lo, hi = self.lo, MAX_ORDINAL + 1
+        while lo < hi:
+            middle = (lo + hi) // 2
+            candidate = key(middle)
+            if candidate < target or (after and candidate == target):
+                lo = middle + 1
+            else:
+                hi = middle
+        return lo
+
+    def bisect_left(self, dt):
+        """
+        The index of the first occurrence on or after `dt`, like `bisect.bisect_left` on a list of the occurrences.
+        :param dt: An aware datetime
+        :type dt: datetime
+        :return: int
+        """
+        return min(self.pattern.count(self.lo, self._first_ordinal(dt, False)), self.length)
+
+    def bisect_right(self, dt):
+        """
+        The index of the first occurrence after `dt`, like `bisect.bisect_right` on a list of the occurrences.
+        :param dt: An aware datetime
+        :type dt: datetime
+        :return: int
+        """
+        return min(self.pattern.count(self.lo, self._first_ordinal(dt, True)), self.length)
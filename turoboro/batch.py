@@ -0,0 +1,120 @@
+from collections import namedtuple
+import calendar
+import turoboro
+import turoboro.common
+import turoboro.offsets
+import turoboro.year_cache
+
+Columns = namedtuple('Columns', ('rule_index', 'occurrence'))
+
+_DAY = 86400
+
+
+def _pattern_key(rule):
+    """
+    The parts of a spec that the pattern of a rule depends on: everything but the time of day and the end of the rule.
+    """
+    spec = rule.spec
+    return (type(rule), spec['start'][:10]) + tuple(
+        (field, repr(spec[field])) for field in sorted(spec)
+        if field not in ('start', 'end', 'repeat', 'on_hour', 'timezone')
+    )
+
+
+def _window_timestamp(dt, timezone):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = timezone.localize(dt)
+    return calendar.timegm(dt.utctimetuple())
+
+
+def _ceil_days(seconds):
+    return -(-seconds // _DAY)
+
+
+def _first_day_at(rule, working_date, timestamp):
+    """
+    The first day (as an ordinal) on which the rule would occur at or after a POSIX timestamp. Occurrences are at the
+    same wall clock time every day, so the day is found by the wall clock and then adjusted for the odd hour that is
+    skipped or repeated by a daylight saving time transition.
+    """
+    to_timestamp = rule._timestamp_converter(working_date)
+    wall = rule._offsets().to_wall(timestamp)
+    ordinal = working_date.toordinal() + _ceil_days(wall - turoboro.offsets.wall_seconds(working_date))
+    while to_timestamp(ordinal - 1) >= timestamp:
+        ordinal -= 1
+    while to_timestamp(ordinal) < timestamp:
+        ordinal += 1
+    return ordinal
+
+
+def _window_bounds(rule, pattern, window_lo, window_hi):
+    """
+    The ordinals [lo, hi) that hold the occurrences of a rule within a window of POSIX timestamps, where either end of
+    the window may be None for no bound. `hi` is None when neither the rule nor the window ends.
+    :return: tuple
+    """
+    working_date = rule.start_datetime
+    lo, hi = rule._bounds(pattern, None, working_date)
+    if window_lo is not None:
+        lo = max(lo, _first_day_at(rule, working_date, window_lo))
+    if window_hi is not None:
+        window_days = _first_day_at(rule, working_date, window_hi)
+        hi = window_days if hi is None else min(hi, window_days)
+    return lo, hi
+
+
+def compute_many(rules, window_start, window_end, return_as=turoboro.ISO):
+    """
+    Computes the occurrences of many rules within a window of time, in one go. Rules are grouped by timezone and
+    type, so that the timezone, the window and the pattern of identically shaped rules are only worked out once per
+    group, and occurrences are computed as timestamps without creating a datetime for each.
+
+    The result is columnar: `rule_index[i]` is the index in `rules` of the rule that occurs at `occurrence[i]`.
+    Occurrences are ordered by rule index and then by time.
+    :param rules: The rules to compute
+    :type rules: list
+    :param window_start: The start of the window, naive datetimes are taken to be in each rule's timezone. None for
+    the start of each rule
+    :type window_start: datetime | None
+    :param window_end: The end of the window (exclusive). None for the end of each rule, in which case none of the
+    rules may be infinite
+    :type window_end: datetime | None
+    :param return_as: How to represent the occurrences
+    :type return_as: str
+    :return: turoboro.batch.Columns
+    """
+    groups = {}
+    for index, rule in enumerate(rules):
+        groups.setdefault((rule.spec['timezone'], type(rule)), []).append((index, rule))
+
+    computed = [None] * len(rules)
+    for members in groups.values():
+        timezone = members[0][1].timezone
+        window_lo = _window_timestamp(window_start, timezone)
+        window_hi = _window_timestamp(window_end, timezone)
+        patterns = {}
+        for index, rule in members:
+            key = _pattern_key(rule)
+            pattern = patterns.get(key)
+            if pattern is None:
+                pattern = patterns[key] = rule._pattern()
+
+            lo, hi = _window_bounds(rule, pattern, window_lo, window_hi)
+            if hi is None:
+                raise ValueError('Rule %d is infinite, give a window_end to compute it' % index)
+            computed[index] = list(map(
+                rule._timestamp_converter(rule.start_datetime), turoboro.year_cache.ordinals(pattern, lo, hi)
+            ))
+
+    rule_index = []
+    occurrence = []
+    for index, timestamps in enumerate(computed):
+        rule_index.extend([index] * len(timestamps))
+        if return_as == turoboro.POSIX:
+            occurrence.extend(timestamps)
+        else:
+            occurrence.extend(turoboro.common.convert_timestamp_to(ts, return_as) for ts in timestamps)
+
+    return Columns(rule_index, occurrence)
@@ -0,0 +1,221 @@
+"""
+A compact, fixed-size binary representation of rules: every rule packs into a record of `RECORD_SIZE` (42) bytes,
+where its JSON spec takes about 250, and a catalog of rules is simply their records one after the other.
+
+    >>> data = turoboro.binary.dumps(rules)
+    >>> rules = list(turoboro.binary.decode(data))
+    >>> for rule in turoboro.binary.load('catalog.bin'):
+    ...     schedule(rule)
+
+A record holds, little-endian:
+
+    B  format version          B  rule type (1 daily, 2 weekly, 3 monthly)
+    B  flags (has an end, monthly by weekday)
+    B  hour                    B  weekday mask (except_days, on_days or the weekday of a monthly rule)
+    B  day of month, or weekday count
+    H  every nth day, week or month
+    H  month mask (except_months)
+    I  timezone id (the CRC-32 of its name)
+    I  repeat (0 for none)
+    q  start, as a POSIX timestamp   i  UTC offset of the start, in seconds
+    q  end, as a POSIX timestamp     i  UTC offset of the end, in seconds
+
+Lists of weekdays and months come back sorted and without duplicates, otherwise a spec round trips exactly.
+"""
+from datetime import datetime, timedelta
+import calendar
+import mmap
+import os
+import re
+import struct
+import zlib
+import turoboro
+import turoboro.common
+import turoboro.tz
+
+VERSION = 1
+RECORD = struct.Struct('<BBBBBBHHIIqiqi')
+RECORD_SIZE = RECORD.size
+RULE_TYPES = (turoboro.constants.RULE_DAILY, turoboro.constants.RULE_WEEKLY, turoboro.constants.RULE_MONTHLY)
+
+HAS_END = 1
+WEEKDAY_RULE = 2
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_UTC_OFFSET = re.compile(r'([+-])(\d{2}):(\d{2})(?::(\d{2}))?$')
+_TIMEZONES = {}
+
+
+def timezone_id(name):
+    """
+    :param name: The name of a timezone
+    :type name: str
+    :return: int, the id of the timezone in a record
+    """
+    return zlib.crc32(name.encode('ascii')) & 0xffffffff
+
+
+def timezone_name(tz_id):
+    """
+    :param tz_id: The id of a timezone in a record
+    :type tz_id: int
+    :return: str, the name of the timezone
+    """
+    if not _TIMEZONES:
+        _TIMEZONES.update((timezone_id(name), name) for name in turoboro.tz.all_timezones())
+    try:
+        return _TIMEZONES[tz_id]
+    except KeyError:
+        raise ValueError('Unknown timezone id %d' % tz_id)
+
+
+def _encode_datetime(iso_timestamp, timezone):
+    """ The POSIX timestamp and UTC offset of a datetime in a spec """
+    wall = turoboro.common.datetime_from_isoformat(iso_timestamp)
+    match = _UTC_OFFSET.match(iso_timestamp[19:])
+    if match is None:
+        offset = turoboro.tz.localize(timezone, wall).utcoffset()
+        offset = offset.days * turoboro.common.DAY + offset.seconds
+    else:
+        sign, hours, minutes, seconds = match.groups()
+        offset = (int(hours) * 3600 + int(minutes) * 60 + int(seconds or 0)) * (-1 if sign == '-' else 1)
+
+    return calendar.timegm(wall.timetuple()) - offset, offset
+
+
+def _decode_datetime(timestamp, offset):
+    """ The datetime of a spec, formatted as `datetime.isoformat` formats an aware datetime """
+    minutes, seconds = divmod(abs(offset), 60)
+    hours, minutes = divmod(minutes, 60)
+    return '%s%s%02d:%02d%s' % (
+        (_NAIVE_EPOCH + timedelta(seconds=timestamp + offset)).isoformat(), '-' if offset < 0 else '+', hours,
+        minutes, ':%02d' % seconds if seconds else ''
+    )
+
+
+def pack(rule):
+    """
+    :param rule: The rule to pack
+    :type rule: turoboro.rules.Rule
+    :return: bytes, the record of the rule
+    """
+    spec = rule.spec
+    weekday_mask, day, step, flags = rule._binary_fields()
+    start, start_offset = _encode_datetime(spec['start'], rule.timezone)
+    end = end_offset = 0
+    if spec['end'] is not None:
+        end, end_offset = _encode_datetime(spec['end'], rule.timezone)
+        flags |= HAS_END
+
+    try:
+        return RECORD.pack(
+            VERSION, RULE_TYPES.index(spec['rule']) + 1, flags, spec['on_hour'], weekday_mask, day, step,
+            turoboro.common.to_mask(spec['except_months'], turoboro.JANUARY), timezone_id(spec['timezone']),
+            spec['repeat'] or 0, start, start_offset, end, end_offset
+        )
+    except struct.error as e:
+        raise ValueError('%r does not fit in a record: %s' % (rule, e))
+
+
+def _unpack(values, validate):
+    """ Builds a rule from the unpacked fields of a record """
+    (version, rule_type, flags, hour, weekday_mask, day, step, month_mask, tz_id, repeat, start, start_offset, end,
+     end_offset) = values
+    if version != VERSION:
+        raise ValueError('Unsupported record version %d' % version)
+    if not 0 < rule_type <= len(RULE_TYPES):
+        raise ValueError('Unknown rule type %d' % rule_type)
+
+    rule_class = turoboro.Rule.rule_class(RULE_TYPES[rule_type - 1])
+    spec = rule_class._spec_from_binary_fields(weekday_mask, day, step, flags)
+    spec.update({
+        'rule': RULE_TYPES[rule_type - 1],
+        'start': _decode_datetime(start, start_offset),
+        'end': _decode_datetime(end, end_offset) if flags & HAS_END else None,
+        'repeat': repeat or None,
+        'except_months': turoboro.common.from_mask(month_mask, turoboro.JANUARY),
+        'on_hour': hour,
+        'timezone': timezone_name(tz_id),
+    })
+    if validate:
+        return rule_class.factory(spec)
+    return rule_class._from_validated_spec(spec)
+
+
+def from_bytes(data, validate=True):
+    """
+    :param data: The record of a rule
+    :type data: bytes
+    :param validate: Whether to validate the spec of the rule. Records packed by `pack` always hold valid specs
+    :type validate: bool
+    :return: turoboro.rules.Rule
+    """
+    if len(data) != RECORD_SIZE:
+        raise ValueError('A record is %d bytes, not %d' % (RECORD_SIZE, len(data)))
+
+    return _unpack(RECORD.unpack(data), validate)
+
+
+def dumps(rules):
+    """
+    :param rules: The rules to pack
+    :type rules: iterable
+    :return: bytes, the records of the rules one after the other
+    """
+    return b''.join(rule.to_bytes() for rule in rules)
+
+
+def _check_size(size):
+    if size % RECORD_SIZE:
+        raise ValueError('%d bytes is not a whole number of %d byte records' % (size, RECORD_SIZE))
+
+
+def decode(buffer, validate=True):
+    """
+    Lazily unpacks the rules of consecutive records straight out of a buffer (bytes, a memoryview, an mmap), without
+    copying it.
+    :param buffer: The records
+    :param validate: See `from_bytes`
+    :type validate: bool
+    :return: generator
+    """
+    if not hasattr(RECORD, 'iter_unpack'):  # pragma: no cover, Python 2
+        # Python 2 can't take the size of a memoryview in bytes, or a memoryview of a memory map
+        _check_size(len(buffer))
+        for offset in range(0, len(buffer), RECORD_SIZE):
+            yield _unpack(RECORD.unpack_from(buffer, offset), validate)
+        return
+
+    view = memoryview(buffer)
+    _check_size(view.nbytes)
+    records = RECORD.iter_unpack(view)
+    try:
+        for values in records:
+            yield _unpack(values, validate)
+    finally:
+        # Let go of the buffer, so that a memory map can be closed as soon as decoding stops
+        del records
+        view.release()
+
+
+def load(path, validate=True):
+    """
+    Lazily unpacks the rules of a file of records, memory-mapped rather than read.
+    :param path: The path of the file
+    :type path: str
+    :param validate: See `from_bytes`
+    :type validate: bool
+    :return: generator
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return  # An empty file can't be mapped
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        rules = decode(mapped, validate)
+        try:
+            for rule in rules:
+                yield rule
+        finally:
+            rules.close()
+            mapped.close()
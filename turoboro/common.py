@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta, tzinfo
 import turoboro
 import calendar
+import turoboro.tz
+import re
+
+EPOCH = datetime(1970, 1, 1, tzinfo=turoboro.tz.UTC)
+DAY = 86400
+_ISO_DATETIME = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})$')
 
 
 def is_iso_datetime(iso_timestamp):
-    return iso_timestamp if datetime.strptime(iso_timestamp[0:19], '%Y-%m-%dT%H:%M:%S') else None
+    return iso_timestamp if datetime_from_isoformat(iso_timestamp) else None
 
 
 def is_list_of_days(days):
@@ -37,8 +43,37 @@ def is_list_of_months(months):
     return months
 
 
+def to_mask(values, first=0):
+    """
+    Represents weekdays (counted from 0) or months (counted from 1) as the bits of an int
+    :param values: The weekdays or months, or None
+    :type values: list | tuple | None
+    :param first: The value represented by the lowest bit
+    :type first: int
+    :return: int
+    """
+    mask = 0
+    for value in values or ():
+        mask |= 1 << (value - first)
+    return mask
+
+
+def from_mask(mask, first=0):
+    """
+    The values represented by the bits of `mask`, see `to_mask`
+    :return: list | None, the sorted values, or None if there are none
+    """
+    values = [bit + first for bit in range(mask.bit_length()) if mask >> bit & 1]
+    return values or None
+
+
 def datetime_from_isoformat(ts):
-    return datetime.strptime(ts[:19], '%Y-%m-%dT%H:%M:%S')
+    match = _ISO_DATETIME.match(ts[:19])
+    if match is None:
+        # Let strptime accept or reject anything unusual, as it always has
+        return datetime.strptime(ts[:19], '%Y-%m-%dT%H:%M:%S')
+
+    return datetime(*[int(part) for part in match.groups()])
 
 
 def convert_datetime_to(dt, to=turoboro.ISO):
@@ -48,3 +83,24 @@ def convert_datetime_to(dt, to=turoboro.ISO):
         return int(calendar.timegm(dt.timetuple()))
 
     return dt
+
+
+def convert_timestamp_to(ts, to=turoboro.ISO):
+    """
+    Represents a POSIX timestamp the way `convert_datetime_to` represents the equivalent UTC datetime.
+    """
+    if to == turoboro.POSIX:
+        return ts
+
+    return convert_datetime_to(EPOCH + timedelta(seconds=ts), to)
+
+
+def datetime_from_timestamp(ts, timezone=turoboro.tz.UTC):
+    """
+    :param ts: A POSIX timestamp
+    :type ts: int
+    :param timezone: The timezone of the datetime
+    :type timezone: datetime.tzinfo
+    :return: datetime, the aware datetime of the timestamp
+    """
+    return (EPOCH + timedelta(seconds=ts)).astimezone(timezone)
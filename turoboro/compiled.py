@@ -0,0 +1,129 @@
+"""
+Immutable snapshots of rules, that can be shared between threads without locking or copying.
+
+    >>> compiled = rule.compile()
+    >>> compiled.next_after(datetime.utcnow())
+    '2019-06-28T08:00:00+00:00'
+
+Changing the rule afterwards does not change what it was compiled into. Everything a compiled rule needs (the
+timezone, the start and end, the pattern of days it occurs on) is worked out when it is compiled, so computing its
+occurrences only ever reads its state, and any number of threads can do so at once. Compiled rules are hashable, and
+equal when their specs are (days and months in any order).
+"""
+import calendar
+import copy
+import json
+import turoboro
+
+
+def _compile_spec(name, spec):
+    """ Unpickles a compiled rule """
+    return turoboro.Rule.rule_class(name).factory(spec).compile()
+
+
+def _key(spec):
+    """ The spec as JSON, with its lists of days and months (sets, really) sorted """
+    return json.dumps(dict(
+        (field, sorted(set(value)) if isinstance(value, (list, tuple)) else value) for field, value in spec.items()
+    ), sort_keys=True)
+
+
+class CompiledRule(object):
+    """
+    A frozen copy of a rule, see `turoboro.rules.Rule.compile`.
+    :param rule: The rule to compile
+    :type rule: turoboro.rules.Rule
+    """
+    __slots__ = ('_rule', '_key', 'timezone', 'start', 'end', 'weekday_mask', 'month_mask')
+
+    def __init__(self, rule):
+        rule = type(rule)._from_validated_spec(copy.deepcopy(rule.spec))
+        working_date = rule.start_datetime
+        end = rule.end_datetime
+        # Derive all the state that computing occurrences needs now, so that afterwards it is only ever read
+        rule._end_ordinal(working_date)
+        rule._timestamp_converter(working_date)
+        rule._is_allowed(working_date)
+        values = {
+            '_rule': rule,
+            '_key': _key(rule.spec),
+            'timezone': rule.timezone,
+            'start': rule._start_timestamp(working_date),
+            'end': None if end is None else calendar.timegm(end.utctimetuple()),
+            'weekday_mask': rule.weekday_mask,
+            'month_mask': rule.month_mask,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s is immutable' % type(self).__name__)
+
+    def __reduce__(self):
+        return _compile_spec, (self._rule.spec['rule'], self.spec)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self._key)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledRule):
+            return NotImplemented
+        return self._key == other._key
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self._key)
+
+    @property
+    def spec(self):
+        """
+        :return: dict, a copy of the spec the rule was compiled from
+        """
+        return copy.deepcopy(self._rule.spec)
+
+    def _detached_rule(self):
+        """
+        A copy of the rule for results to refer to, so that changing `result.rule` leaves the compiled rule as it is.
+        The copy starts out with the derived state of the rule rather than working it out again.
+        """
+        rule = self._rule
+        detached = object.__new__(type(rule))
+        detached.__dict__.update(rule.__dict__)
+        detached.__dict__.update(_spec=copy.deepcopy(rule.spec), _derived=dict(rule._derived))
+        return detached
+
+    def to_rule(self):
+        """
+        :return: turoboro.rules.Rule, a new (mutable) rule of the same spec
+        """
+        return type(self._rule)._from_validated_spec(self.spec)
+
+    def compute(self, from_dt=None, max_count_if_infinite=100, return_as=turoboro.ISO):
+        """ See `turoboro.rules.Rule.compute` """
+        return self._detached_rule().compute(from_dt, max_count_if_infinite, return_as)
+
+    def result(self, from_dt=None, return_as=turoboro.ISO, cursor=None):
+        """ See `turoboro.rules.Rule.result` """
+        return self._detached_rule().result(from_dt, return_as=return_as, cursor=cursor)
+
+    def next_after(self, dt, return_as=turoboro.ISO):
+        """ See `turoboro.rules.Rule.next_after` """
+        return self._rule.next_after(dt, return_as)
+
+    def previous_before(self, dt, return_as=turoboro.ISO):
+        """ See `turoboro.rules.Rule.previous_before` """
+        return self._rule.previous_before(dt, return_as)
+
+    def nth(self, k, return_as=turoboro.ISO):
+        """ See `turoboro.rules.Rule.nth` """
+        return self._rule.nth(k, return_as)
+
+    def index_of(self, dt):
+        """ See `turoboro.rules.Rule.index_of` """
+        return self._rule.index_of(dt)
@@ -1,9 +1,9 @@
 import voluptuous
 from turoboro.rules import Rule
-from turoboro.result import Result
+import turoboro.arithmetic
 import turoboro.common
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime
+import turoboro.tz
 
 
 class DailyRule(Rule):
@@ -32,7 +32,7 @@ class DailyRule(Rule):
             )
         ),
         'on_hour': voluptuous.Range(min=0, max=23),
-        'timezone': voluptuous.In(pytz.all_timezones)
+        'timezone': turoboro.tz.is_timezone
     })
 
     def __init__(self, start, end_on=None, repeat_n_times=None, every_nth_day=1, except_weekdays=None,
@@ -40,7 +40,7 @@ class DailyRule(Rule):
         if not isinstance(start, datetime):
             raise ValueError('You must specify a datetime')
 
-        tz = pytz.timezone(timezone)
+        tz = turoboro.tz.timezone(timezone)
         start = start.replace(hour=0, minute=0, second=0, microsecond=0)
         start = tz.localize(start)
 
@@ -82,21 +82,26 @@ class DailyRule(Rule):
 
     @classmethod
     def factory(cls, spec):
-        daily_rule = cls(datetime.utcnow())
-        if daily_rule.validate_spec(spec):
-            daily_rule.spec = spec
+        daily_rule = cls.__new__(cls)
+        daily_rule.spec = spec
 
         return daily_rule
 
-    def validate_spec(self, spec):
+    def _binary_fields(self):
+        return turoboro.common.to_mask(self.spec['except_days']), 0, self.spec['every_nth_day'], 0
+
+    @classmethod
+    def _spec_from_binary_fields(cls, weekday_mask, day, step, flags):
+        return {'except_days': turoboro.common.from_mask(weekday_mask), 'every_nth_day': step}
+
+    def _check_invariants(self, spec, starting_day):
         """
-        Validates the rule specification
+        Checks the constraints between the fields of the rule specification
         :param spec: The spec we are attempting to accept
         :type spec: dict
-        :return: dict
+        :param starting_day: The start of the spec, as a naive datetime
+        :type starting_day: datetime
         """
-        starting_day = turoboro.common.datetime_from_isoformat(spec['start'])
-
         if spec['end'] is not None and spec['end'] <= spec['start']:
             raise ValueError("End date (%s) must be None or after start date (%s)" % (spec['end'], spec['start']))
 
@@ -109,8 +114,6 @@ class DailyRule(Rule):
         if spec['end'] is not None and spec['repeat'] is not None:
             raise ValueError('You may not specify both an end date and a repeat count')
 
-        return self.SPEC_SCHEMA(spec)
-
     def every_nth_day(self, n):
         """
         Where `n` is the number of days between two occurrences
@@ -134,46 +137,28 @@ class DailyRule(Rule):
         self.set_if_valid('except_days', days)
         return self
 
+    def _day_filter(self):
+        return turoboro.arithmetic.day_filter(
+            turoboro.arithmetic.WEEKDAY_MASK & ~turoboro.common.to_mask(self.spec['except_days']),
+            turoboro.arithmetic.MONTH_MASK & ~turoboro.common.to_mask(self.spec['except_months'], turoboro.JANUARY)
+        )
+
     def _is_allowed(self, dt):
-        if self.spec['except_days'] is not None and dt.weekday() in self.spec['except_days']:
-            return False
-
-        if self.spec['except_months'] is not None and dt.month in self.spec['except_months']:
-            return False
-
-        return True
-
-    def _stagger_forward(self, from_dt):
-        from_dt = from_dt.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-        period = from_dt - self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
-        rest = period.days % self.spec['every_nth_day']
-        return from_dt + timedelta(days=self.spec['every_nth_day'] - rest)
-
-    def _compute_with_end_date(self, from_dt, working_date, return_as):
-        result = []
-        if from_dt is not None and from_dt != working_date:
-            working_date = self._stagger_forward(from_dt)
-        end_date = self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['end']))
-        while working_date < end_date:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-            working_date = working_date + timedelta(days=self.spec['every_nth_day'])
-
-        return Result(result, self, return_as=return_as)
-
-    def _compute_n_times(self, from_dt, working_date, return_as):
-        result = []
-        count = 0
-        if from_dt is not None:
-            from_dt = from_dt.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-        while count < self.spec['repeat']:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-                count += 1
-            working_date = working_date + timedelta(days=self.spec['every_nth_day'])
-
-        return Result(result, self, return_as=return_as, segment_from=from_dt)
-
-    def _bounce(self, working_date):
-        return working_date + timedelta(days=self.spec['every_nth_day'])
+        return bool(self._derived_state('day_filter', self._day_filter) >> (7 * dt.month + dt.weekday()) & 1)
 
+    def _compile_pattern(self):
+        """
+        Candidate days are every `every_nth_day` day from the start. Whether a candidate falls on an excepted weekday
+        repeats every lcm(every_nth_day, 7) days, so that is the period of the pattern and the offsets within it are
+        the candidates that are not excepted.
+        :return: turoboro.arithmetic.OrdinalPattern
+        """
+        start = turoboro.common.datetime_from_isoformat(self.spec['start']).toordinal()
+        step = self.spec['every_nth_day']
+        period = turoboro.arithmetic.lcm(step, 7)
+        except_days = turoboro.common.to_mask(self.spec['except_days'])
+        offsets = [
+            offset for offset in range(0, period, step)
+            if not except_days >> turoboro.arithmetic.weekday(start + offset) & 1
+        ]
+        return turoboro.arithmetic.OrdinalPattern(start, period, offsets, start, self.spec['except_months'])
@@ -0,0 +1,166 @@
+"""
+Streams the occurrences of one or many rules to a file-like object as NDJSON or CSV, a chunk of rows at a time, so
+that memory use stays bounded however many occurrences there are.
+
+    >>> with turoboro.export.open_output('occurrences.ndjson.gz') as f:
+    ...     turoboro.export.write_ndjson({'standup': rule}, f, datetime(2019, 1, 1), datetime(2020, 1, 1))
+    >>> turoboro.export.export({'standup': rule}, 'standup.csv', turoboro.export.CSV, window_end=datetime(2020, 1, 1))
+
+Each row holds the id of a rule (its key when rules are given as a dict, its position otherwise) and an occurrence,
+as an ISO 8601 string or a POSIX timestamp.
+"""
+import calendar
+import csv
+import gzip
+import json
+import sys
+import turoboro
+import turoboro.batch
+import turoboro.common
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+FORMATS = (NDJSON, CSV)
+CHUNK_SIZE = 10000
+
+
+def _identified(rules):
+    if isinstance(rules, dict):
+        return rules.items()
+    return enumerate(rules)
+
+
+def _window_timestamp(dt, timezone):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = timezone.localize(dt)
+    return calendar.timegm(dt.utctimetuple())
+
+
+def occurrences(rules, window_start=None, window_end=None, return_as=turoboro.ISO):
+    """
+    Lazily yields (rule id, occurrence) pairs for every occurrence of every rule within the window, rule by rule.
+    :param rules: The rules, as a dict of rules by id or as an iterable of rules
+    :type rules: dict | iterable
+    :param window_start: The start of the window, naive datetimes are taken to be in each rule's timezone. Defaults to
+    the start of each rule
+    :type window_start: datetime | None
+    :param window_end: The end of the window (exclusive). Must be given if any of the rules is infinite
+    :type window_end: datetime | None
+    :param return_as: turoboro.ISO or turoboro.POSIX
+    :type return_as: str
+    :return: generator
+    """
+    if return_as not in (turoboro.ISO, turoboro.POSIX):
+        raise ValueError('Occurrences can only be exported as turoboro.ISO or turoboro.POSIX')
+
+    for rule_id, rule in _identified(rules):
+        pattern = rule._pattern()
+        timezone = rule.timezone
+        lo, hi = turoboro.batch._window_bounds(
+            rule, pattern, _window_timestamp(window_start, timezone), _window_timestamp(window_end, timezone)
+        )
+        if hi is None:
+            raise ValueError('Rule %r is infinite, give a window_end to export it' % rule_id)
+
+        to_timestamp = rule._timestamp_converter(rule.start_datetime)
+        if return_as == turoboro.POSIX:
+            for ordinal in pattern.iterate(lo, hi):
+                yield rule_id, to_timestamp(ordinal)
+        else:
+            for ordinal in pattern.iterate(lo, hi):
+                yield rule_id, turoboro.common.convert_timestamp_to(to_timestamp(ordinal), return_as)
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_ndjson(rules, f, window_start=None, window_end=None, return_as=turoboro.ISO, chunk_size=CHUNK_SIZE):
+    """
+    Writes every occurrence within the window as a line of JSON, `{"rule": <rule id>, "occurrence": <occurrence>}`.
+    Takes the same arguments as `occurrences`, plus:
+    :param f: A file-like object open for writing text
+    :param chunk_size: The number of lines to write at a time
+    :type chunk_size: int
+    :return: int, the number of occurrences written
+    """
+    # ISO strings and timestamps never need escaping, so lines are formatted directly rather than through json.dumps
+    line = '{"occurrence": %s, "rule": %%s}\n' % ('"%s"' if return_as == turoboro.ISO else '%d')
+    last_id = encoded_id = None
+    written = 0
+    for chunk in _chunks(occurrences(rules, window_start, window_end, return_as), chunk_size):
+        lines = []
+        for rule_id, occurrence in chunk:
+            if encoded_id is None or rule_id != last_id:
+                last_id, encoded_id = rule_id, json.dumps(rule_id)
+            lines.append(line % (occurrence, encoded_id))
+        f.write(''.join(lines))
+        written += len(chunk)
+
+    return written
+
+
+def write_csv(rules, f, window_start=None, window_end=None, return_as=turoboro.ISO, chunk_size=CHUNK_SIZE,
+              header=True):
+    """
+    Writes every occurrence within the window as a `rule,occurrence` row of CSV. Takes the same arguments as
+    `occurrences`, plus:
+    :param f: A file-like object open for writing text (with `newline=''` on Python 3)
+    :param chunk_size: The number of rows to write at a time
+    :type chunk_size: int
+    :param header: Whether to start with a header row
+    :type header: bool
+    :return: int, the number of occurrences written
+    """
+    writer = csv.writer(f, lineterminator='\n')
+    if header:
+        writer.writerow(('rule', 'occurrence'))
+
+    written = 0
+    for chunk in _chunks(occurrences(rules, window_start, window_end, return_as), chunk_size):
+        writer.writerows(chunk)
+        written += len(chunk)
+
+    return written
+
+
+def open_output(path, compress=None):
+    """
+    Opens a file to export to, gzipped if `compress` is true or, by default, if the path ends with `.gz`.
+    :param path: The path of the file
+    :type path: str
+    :param compress: Whether to gzip the output
+    :type compress: bool | None
+    :return: A file-like object open for writing text
+    """
+    if compress is None:
+        compress = path.endswith('.gz')
+    if sys.version_info[0] < 3:  # pragma: no cover
+        return gzip.open(path, 'wb') if compress else open(path, 'wb')
+
+    return gzip.open(path, 'wt', newline='') if compress else open(path, 'w', newline='')
+
+
+def export(rules, path, format=NDJSON, window_start=None, window_end=None, return_as=turoboro.ISO,
+           chunk_size=CHUNK_SIZE, compress=None):
+    """
+    Exports every occurrence within the window to a file, see `write_ndjson`, `write_csv` and `open_output`.
+    :param format: turoboro.export.NDJSON or turoboro.export.CSV
+    :type format: str
+    :return: int, the number of occurrences written
+    """
+    if format not in FORMATS:
+        raise ValueError('Unknown export format %r, expected one of %r' % (format, FORMATS))
+
+    write = write_ndjson if format == NDJSON else write_csv
+    with open_output(path, compress) as f:
+        return write(rules, f, window_start, window_end, return_as=return_as, chunk_size=chunk_size)
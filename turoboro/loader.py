@@ -0,0 +1,154 @@
+"""
+Loads rule catalogs, JSON rule specs (as taken by `Rule.from_spec`) one per line, into rules. Each spec is validated
+exactly once, and a line that fails to load is reported rather than stopping the rest from loading.
+
+    >>> for loaded in turoboro.loader.load_jsonl('catalog.jsonl'):
+    ...     if loaded.error is not None:
+    ...         log.warning('line %d: %s', loaded.line_number, loaded.error)
+
+Large catalogs can be memory-mapped rather than read, and validated on all cores with `processes`.
+"""
+from collections import deque, namedtuple
+import json
+import mmap
+import multiprocessing
+import os
+import turoboro
+import voluptuous
+
+CHUNK_SIZE = 1000
+ERRORS = (ValueError, TypeError, KeyError, voluptuous.Invalid)
+
+# A line of a catalog (numbered from 1), with either the rule it holds or the exception it failed to load with
+Loaded = namedtuple('Loaded', ('line_number', 'rule', 'error'))
+
+
+def _validate(line):
+    """ Parses and validates a spec, returning the class of rule it is for along with the validated spec """
+    spec = json.loads(line)
+    rule_class = turoboro.Rule.rule_class(spec['rule'])
+    if rule_class is None:
+        raise ValueError('Unknown rule %r' % spec['rule'])
+
+    return rule_class, rule_class.__new__(rule_class).validate_spec(spec)
+
+
+def _load_line(line_number, line):
+    try:
+        rule_class, spec = _validate(line)
+    except ERRORS as e:
+        return Loaded(line_number, None, e)
+    return Loaded(line_number, rule_class._from_validated_spec(spec), None)
+
+
+def _validate_chunk(chunk):
+    """ Validates a chunk of (line number, line) pairs in a worker, leaving the rules to be built by the caller """
+    validated = []
+    for line_number, line in chunk:
+        try:
+            _, spec = _validate(line)
+        except ERRORS as e:
+            validated.append((line_number, None, None, e))
+        else:
+            validated.append((line_number, spec['rule'], spec, None))
+    return validated
+
+
+def _numbered(lines):
+    """ Numbers the lines from 1, skipping blank ones """
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def _chunks(numbered, chunk_size):
+    chunk = []
+    for item in numbered:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _load_in_processes(numbered, processes, chunk_size):
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_in_flight = 2 * processes
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        chunks = _chunks(numbered, chunk_size)
+        while True:
+            for chunk in chunks:
+                in_flight.append(executor.submit(_validate_chunk, chunk))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return
+
+            for line_number, name, spec, error in in_flight.popleft().result():
+                if error is not None:
+                    yield Loaded(line_number, None, error)
+                else:
+                    yield Loaded(line_number, turoboro.Rule.rule_class(name)._from_validated_spec(spec), None)
+
+
+def load(lines, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Lazily loads rules from JSON specs, yielding a `Loaded` for every line that isn't blank, in order.
+    :param lines: The specs, as str or bytes
+    :type lines: iterable
+    :param processes: The number of worker processes to validate specs in, 0 for as many as there are cores (Python 3
+    only). By default, specs are validated in this process
+    :type processes: int | None
+    :param chunk_size: The number of specs each worker process validates at a time
+    :type chunk_size: int
+    :return: generator
+    """
+    numbered = _numbered(lines)
+    if processes is None:
+        return (_load_line(line_number, line) for line_number, line in numbered)
+
+    return _load_in_processes(numbered, processes or multiprocessing.cpu_count(), chunk_size)
+
+
+def _mapped_lines(f):
+    if not os.fstat(f.fileno()).st_size:
+        return  # An empty file can't be mapped
+
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for line in iter(mapped.readline, b''):
+            yield line
+    finally:
+        mapped.close()
+
+
+def load_jsonl(path, processes=None, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """
+    Lazily loads the rules of a JSONL catalog, see `load`.
+    :param path: The path of the catalog
+    :type path: str
+    :param use_mmap: Whether to memory-map the file rather than read it
+    :type use_mmap: bool
+    :return: generator
+    """
+    with open(path, 'rb') as f:
+        for loaded in load(_mapped_lines(f) if use_mmap else f, processes, chunk_size):
+            yield loaded
+
+
+def load_catalog(path, processes=None, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """
+    Loads every rule of a JSONL catalog, see `load_jsonl`.
+    :return: tuple, the list of rules that loaded and the list of `Loaded` lines that failed to
+    """
+    rules = []
+    errors = []
+    for loaded in load_jsonl(path, processes, chunk_size, use_mmap):
+        if loaded.error is None:
+            rules.append(loaded.rule)
+        else:
+            errors.append(loaded)
+    return rules, errors
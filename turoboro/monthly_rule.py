@@ -1,9 +1,10 @@
 from turoboro.rules import Rule
+import turoboro.arithmetic
+import turoboro.binary
 import turoboro.common
 import voluptuous
-import pytz
-from datetime import datetime, timedelta
-from turoboro.result import Result
+import turoboro.tz
+from datetime import datetime
 
 
 class MonthlyRule(Rule):
@@ -35,7 +36,7 @@ class MonthlyRule(Rule):
             )
         ),
         'on_hour': voluptuous.Range(min=0, max=23),
-        'timezone': voluptuous.In(pytz.all_timezones)
+        'timezone': turoboro.tz.is_timezone
     })
 
     def __init__(self, start, day_of_month=None, every_nth_month=None, end_on=None, repeat_n_times=None, weekday_count=None, weekday=None,
@@ -43,7 +44,7 @@ class MonthlyRule(Rule):
         if not isinstance(start, datetime):
             raise ValueError('You must specify a datetime')
 
-        tz = pytz.timezone(timezone)
+        tz = turoboro.tz.timezone(timezone)
         start = start.replace(hour=0, minute=0, second=0, microsecond=0)
         start = tz.localize(start)
 
@@ -70,11 +71,14 @@ class MonthlyRule(Rule):
 
         if day_of_month:
             self.day_of_month(day_of_month, every_nth_month)
-        elif weekday_count and weekday:
+        elif weekday_count and weekday is not None:
             self.weekday(weekday_count, weekday, every_nth_month)
         else:
             raise ValueError('You must specify either day of month, or weekday_count and weekday')
 
+        if repeat_n_times:
+            self.repeat_n_times(repeat_n_times)
+
         try:
             self.except_months(*except_months)
         except TypeError:
@@ -103,21 +107,37 @@ class MonthlyRule(Rule):
 
     @classmethod
     def factory(cls, spec):
-        weekly_rule = cls(datetime.utcnow(), (0,))
-        if weekly_rule.validate_spec(spec):
-            weekly_rule.spec = spec
+        monthly_rule = cls.__new__(cls)
+        monthly_rule.spec = spec
+
+        return monthly_rule
+
+    def _binary_fields(self):
+        weekday_rule = self.spec['weekday_rule']
+        if weekday_rule is not None:
+            return 1 << weekday_rule['weekday'], weekday_rule['count'], weekday_rule['every_nth'], \
+                turoboro.binary.WEEKDAY_RULE
 
-        return weekly_rule
+        day_of_month_rule = self.spec['day_of_month_rule']
+        return 0, day_of_month_rule['day'], day_of_month_rule['every_nth'], 0
 
-    def validate_spec(self, spec):
+    @classmethod
+    def _spec_from_binary_fields(cls, weekday_mask, day, step, flags):
+        if flags & turoboro.binary.WEEKDAY_RULE:
+            return {
+                'day_of_month_rule': None,
+                'weekday_rule': {'count': day, 'weekday': weekday_mask.bit_length() - 1, 'every_nth': step},
+            }
+        return {'day_of_month_rule': {'day': day, 'every_nth': step}, 'weekday_rule': None}
+
+    def _check_invariants(self, spec, starting_day):
         """
-        Validates the rule specification
+        Checks the constraints between the fields of the rule specification
         :param spec: The spec we are attempting to accept
         :type spec: dict
-        :return: dict
+        :param starting_day: The start of the spec, as a naive datetime
+        :type starting_day: datetime
         """
-        starting_day = turoboro.common.datetime_from_isoformat(spec['start'])
-
         if spec['end'] is not None and spec['end'] <= spec['start']:
             raise ValueError("End date (%s) must be None or after start date (%s)" % (spec['end'], spec['start']))
 
@@ -130,71 +150,23 @@ class MonthlyRule(Rule):
         if spec['end'] is not None and spec['repeat'] is not None:
             raise ValueError('You may not specify both an end date and a repeat count')
 
-        return self.SPEC_SCHEMA(spec)
-
-    def _day_of_month_stagger(self, from_dt, start_dt):
-        start_dt_calc = (start_dt.year, start_dt.month)
-        from_dt_calc = (from_dt.year, from_dt.month)
-
-        months = (from_dt_calc[0] - start_dt_calc[0]) * 12 + from_dt_calc[1] - start_dt_calc[1]
-
-        # We've a from date before the earliest possible start date - return that instead
-        if months < 0:
-            return self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
-
-        rest = months % self.spec['day_of_month_rule']['every_nth']
-
-        # No rest - we're already in the correct month, if we have not passed the day - we return the day
-        if rest == 0 and from_dt.day <= self.spec['day_of_month_rule']['day']:
-            return from_dt.replace(day=self.spec['day_of_month_rule']['day'])
-
-        month_pad = rest - self.spec['day_of_month_rule']['every_nth']
-
-        # If we pass a new year, we need to pad the year
-        stagger_to_year = from_dt.year + 1 if from_dt.month + month_pad > 12 else from_dt.year
-        # If we pass a new year, we need to stagger forward months - 12,
-        stagger_to_month = from_dt.month + month_pad - 12 if stagger_to_year > from_dt.year else from_dt.month + month_pad
+    def _is_allowed(self, dt):
+        return self._pattern().count(dt.toordinal(), dt.toordinal() + 1) == 1
 
-        return from_dt.replace(year=stagger_to_year, month=stagger_to_month, day=1)
-
-    def _stagger_forward(self, from_dt):
+    def _compile_pattern(self):
         """
-        :param from_dt: the datetime we want to stagger forward from
-        :type from_dt: datetime
-        :return: datetime
+        Occurrences are found by jumping from one included month to the next, see turoboro.arithmetic.MonthPattern
+        :return: turoboro.arithmetic.MonthPattern
         """
-        from_dt = from_dt.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-
-        start_dt = self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
-        start_dt = start_dt.replace(day=1, hour=self.spec['on_hour'])
-
-        # 1. Day of month:
+        start = turoboro.common.datetime_from_isoformat(self.spec['start']).toordinal()
         if self.spec['day_of_month_rule'] is not None:
-            return self._day_of_month_stagger(from_dt, start_dt)
-
-    def _compute_with_end_date(self, from_dt, working_date, return_as):
-        result = []
-        if from_dt is not None and from_dt != working_date:
-            working_date = self._stagger_forward(from_dt)
-
-        end_date = self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['end']))
-
-        while working_date < end_date:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-            working_date = self._bounce(working_date)
-
-        return Result(result, self, return_as=return_as)
-
-    def _compute_n_times(self, from_dt, working_date, return_as):
-        pass
-
-    def _stagger_forward(self, from_dt):
-        pass
-
-    def _is_allowed(self, working_date):
-        pass
-
-    def _bounce(self, working_date):
-        pass
+            rule = self.spec['day_of_month_rule']
+            return turoboro.arithmetic.MonthPattern(
+                start, rule['every_nth'], self.spec['except_months'], day=rule['day']
+            )
 
+        rule = self.spec['weekday_rule']
+        return turoboro.arithmetic.MonthPattern(
+            start, rule['every_nth'], self.spec['except_months'], weekday=rule['weekday'],
+            weekday_count=rule['count']
+        )
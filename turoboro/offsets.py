@@ -0,0 +1,336 @@
+"""
+Tables of the UTC offsets of timezones, so that the wall clock time of an occurrence turns into its POSIX timestamp
+with a bisect and an add, rather than by localizing a datetime.
+
+    >>> table = turoboro.offsets.table(turoboro.tz.timezone('Europe/Stockholm'))
+    >>> table.to_utc(calendar.timegm(datetime(2014, 7, 1, 8).timetuple()))
+    1404194400
+
+Occurrences fall at the same time of day in their timezone all year round, so their offset from UTC changes across
+daylight saving time transitions. Wall clock times that are skipped or repeated by a transition are resolved the way
+`pytz` localizes them (with `is_dst=False`): a time that is skipped keeps the offset from before the transition, and a
+time that is repeated gets the standard time offset.
+
+The transitions of pytz timezones are read from the timezone. Those of `zoneinfo` timezones are read from their TZif
+file, where the last few are often left to a rule (the POSIX TZ string at the end of the file) that the transitions
+are worked out from until `HORIZON_YEAR`. Beyond the transitions a table knows of, the offsets are asked of the
+timezone itself, which is slower but just as right.
+"""
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+import calendar
+import os
+import re
+import struct
+import turoboro.tz
+
+# The year from which the offsets of timezones with daylight saving time rules are asked of the timezone
+HORIZON_YEAR = 2200
+
+_DAY = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_TABLES = {}
+
+# The POSIX TZ string of a TZif file, e.g. CET-1CEST,M3.5.0,M10.5.0/3
+_NAME = r'(?:<[^>]*>|[A-Za-z]+)'
+_DURATION = r'[+-]?\d+(?::\d+){0,2}'
+_DATE = r'(?:M\d+\.\d+\.\d+|J\d+|\d+)'
+_RULE = r'({date})(?:/({duration}))?'.format(date=_DATE, duration=_DURATION)
+_TZ_STRING = re.compile(r'^{name}({duration})(?:{name}({duration})?,{rule},{rule})?$'.format(
+    name=_NAME, duration=_DURATION, rule=_RULE
+))
+
+
+class OffsetTable(object):
+    """
+    The UTC offsets of a timezone over time, in seconds.
+    :param transitions: The POSIX timestamps from which each offset is in effect, ascending
+    :type transitions: list
+    :param offsets: The offsets
+    :type offsets: list
+    :param walls: The wall clock times (in seconds since 1970-01-01T00:00 local time) from which each offset is used to
+    turn wall clock times into timestamps, ascending
+    :type walls: list
+    :param end: The POSIX timestamp from which the offsets are asked of `timezone` instead, None if the last offset
+    stays in effect for good
+    :type end: int | None
+    :param timezone: The timezone
+    :type timezone: datetime.tzinfo | None
+    """
+    __slots__ = ('transitions', 'offsets', 'walls', 'segments', 'fixed_offset', 'end', 'wall_end', 'timezone')
+
+    def __init__(self, transitions, offsets, walls, end=None, timezone=None):
+        self.transitions = transitions
+        self.offsets = offsets
+        self.walls = walls
+        self.end = float('inf') if end is None else end
+        # Wall clock times are two days clear of the end, whatever the offset
+        self.wall_end = self.end - 2 * _DAY
+        self.timezone = timezone
+        # The wall clock times [lo, hi) that each offset is used for
+        self.segments = list(zip(walls, walls[1:] + [self.wall_end], offsets))
+        self.fixed_offset = offsets[0] if end is None and len(set(offsets)) == 1 else None
+
+    def utc_offset(self, timestamp):
+        """
+        :param timestamp: A POSIX timestamp
+        :type timestamp: int
+        :return: int, the UTC offset at that instant
+        """
+        if timestamp >= self.end:
+            return _offset_at(self.timezone, timestamp)[0]
+        return self.offsets[bisect_right(self.transitions, timestamp) - 1]
+
+    def to_wall(self, timestamp):
+        """
+        :param timestamp: A POSIX timestamp
+        :type timestamp: int
+        :return: int, the wall clock time at that instant, in seconds since 1970-01-01T00:00 local time
+        """
+        return timestamp + self.utc_offset(timestamp)
+
+    def to_utc(self, wall):
+        """
+        :param wall: A wall clock time, in seconds since 1970-01-01T00:00 local time
+        :type wall: int
+        :return: int, the POSIX timestamp of that wall clock time
+        """
+        if wall >= self.wall_end:
+            return wall - self._localized_offset(wall)
+        return wall - self.offsets[bisect_right(self.walls, wall) - 1]
+
+    def segment(self, wall):
+        """
+        :param wall: A wall clock time, in seconds since 1970-01-01T00:00 local time
+        :type wall: int
+        :return: tuple, the wall clock times [lo, hi) around `wall` that share its offset, and the offset
+        """
+        if wall >= self.wall_end:
+            return wall, wall + 1, self._localized_offset(wall)
+        return self.segments[bisect_right(self.walls, wall) - 1]
+
+    def _localized_offset(self, wall):
+        """ The offset of a wall clock time beyond the end of the table, by localizing it """
+        dt = turoboro.tz.localize(self.timezone, _NAIVE_EPOCH + timedelta(0, wall))
+        return _seconds(dt.utcoffset())
+
+
+def _seconds(delta):
+    return delta.days * _DAY + delta.seconds
+
+
+def _offset_at(timezone, timestamp):
+    """ The UTC offset, in seconds, of a timezone at a POSIX timestamp, and whether it is daylight saving time """
+    dt = (datetime(1970, 1, 1, tzinfo=turoboro.tz.UTC) + timedelta(0, timestamp)).astimezone(timezone)
+    return _seconds(dt.utcoffset()), bool(dt.dst())
+
+
+def _pytz_transitions(timezone):
+    times = getattr(timezone, '_utc_transition_times', None)
+    if not times:
+        # A timezone with a fixed offset
+        return [(None, _seconds(timezone.utcoffset(datetime(1970, 1, 1))), False)], None
+
+    return [
+        (None if index == 0 else calendar.timegm(time.timetuple()), _seconds(offset), bool(dst))
+        for index, (time, (offset, dst, _)) in enumerate(zip(times, timezone._transition_info))
+    ], None
+
+
+def _read_tzif(key):
+    """ The contents of the TZif file of a timezone, looked for where `zoneinfo` looks, None if there is none """
+    for path in turoboro.tz.zoneinfo.TZPATH:
+        filename = os.path.join(path, key)
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                return f.read()
+    try:
+        import importlib.resources
+        components = key.split('/')
+        package = '.'.join(['tzdata', 'zoneinfo'] + components[:-1])
+        return importlib.resources.files(package).joinpath(components[-1]).read_bytes()
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def _parse_tzif(data):
+    """
+    The POSIX timestamps of the transitions listed in TZif data (RFC 8536), and the POSIX TZ string of the rule that
+    goes after the last of them.
+    """
+    header = struct.Struct('>4sc15x6l')
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = header.unpack_from(data)
+    if magic != b'TZif':
+        raise ValueError('Not TZif data')
+
+    time_size = 4
+    offset = header.size
+    if version != b'\x00':
+        # Skip the 32 bit data, to the header of the 64 bit data
+        offset += timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+        _, _, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = header.unpack_from(data, offset)
+        offset += header.size
+        time_size = 8
+
+    times = list(struct.unpack_from('>%d%s' % (timecnt, 'q' if time_size == 8 else 'l'), data, offset))
+    if version == b'\x00':
+        return times, ''
+
+    offset += timecnt * (time_size + 1) + typecnt * 6 + charcnt + leapcnt * 12 + isstdcnt + isutcnt
+    return times, data[offset:].strip().decode('ascii')
+
+
+def _duration(text, default=None):
+    if text is None:
+        return default
+    sign = -1 if text.startswith('-') else 1
+    parts = [int(part) for part in text.lstrip('+-').split(':')] + [0, 0]
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+
+def _rule_date(rule, year):
+    """ The ordinal of the day in a year that a date of a POSIX TZ string is on """
+    if rule.startswith('M'):
+        month, week, weekday = [int(part) for part in rule[1:].split('.')]
+        first = date(year, month, 1)
+        # Days of the week count from Sunday
+        day = 1 + (weekday - (first.weekday() + 1)) % 7 + (week - 1) * 7
+        if day > calendar.monthrange(year, month)[1]:
+            day -= 7
+        return first.toordinal() + day - 1
+    if rule.startswith('J'):
+        # From 1, never counting the 29th of February
+        day = int(rule[1:])
+        return date(year, 1, 1).toordinal() + day - 1 + (1 if calendar.isleap(year) and day >= 60 else 0)
+    return date(year, 1, 1).toordinal() + int(rule)
+
+
+def _rule_transitions(tz_string, since):
+    """
+    The transitions, as `_transitions` has them, that a POSIX TZ string makes after `since` and before
+    `HORIZON_YEAR`. An empty list if it makes none, and None if it can't be read.
+    """
+    match = _TZ_STRING.match(tz_string)
+    if match is None:
+        return None
+    std_offset, dst_offset, start, start_time, end, end_time = match.groups()
+    if start is None:
+        return []
+
+    # POSIX offsets are west of Greenwich
+    std_offset = -_duration(std_offset)
+    dst_offset = -_duration(dst_offset, -std_offset - 3600)
+    start_time = _duration(start_time, 7200)
+    end_time = _duration(end_time, 7200)
+    transitions = []
+    for year in range(datetime.utcfromtimestamp(max(since, 0)).year - 1, HORIZON_YEAR):
+        # The start is given in standard time, the end in daylight saving time
+        start_timestamp = (_rule_date(start, year) - _EPOCH_ORDINAL) * _DAY + start_time - std_offset
+        end_timestamp = (_rule_date(end, year) - _EPOCH_ORDINAL) * _DAY + end_time - dst_offset
+        transitions.append((start_timestamp, dst_offset, True))
+        transitions.append((end_timestamp, std_offset, False))
+
+    # Sorting is stable, so where a year ends as the next starts (daylight saving time all year) the start wins
+    transitions.sort(key=lambda transition: transition[0])
+    return [transition for transition in transitions if transition[0] > since]
+
+
+def _zoneinfo_transitions(timezone):
+    """
+    The transitions of a `zoneinfo.ZoneInfo`, at the times its TZif file lists, with the offset after each asked of
+    the timezone itself, followed by those its rule works out. Returns them along with the timestamp that they are
+    known until.
+    """
+    if timezone.utcoffset(None) is not None:
+        # A timezone with a fixed offset
+        return [(None, _seconds(timezone.utcoffset(None)), False)], None
+
+    data = _read_tzif(timezone.key) if getattr(timezone, 'key', None) else None
+    try:
+        times, tz_string = _parse_tzif(data)
+    except (TypeError, ValueError, struct.error):
+        # No TZif data to go by, every offset is asked of the timezone
+        return [(None, 0, False)], float('-inf')
+
+    current = _offset_at(timezone, times[0] - 1) if times else _offset_at(timezone, 0)
+    transitions = [(None,) + current]
+    for timestamp in times:
+        offset = _offset_at(timezone, timestamp)
+        if offset != current:
+            transitions.append((timestamp,) + offset)
+            current = offset
+
+    if not times:
+        return transitions, None
+
+    rule_transitions = _rule_transitions(tz_string, times[-1])
+    if rule_transitions is None:
+        return transitions, times[-1] + 1
+    if not rule_transitions:
+        return transitions, None
+
+    for transition in rule_transitions:
+        if transition[1:] != current:
+            transitions.append(transition)
+            current = transition[1:]
+    return transitions, calendar.timegm((HORIZON_YEAR, 1, 1, 0, 0, 0))
+
+
+def _transitions(timezone):
+    """
+    (POSIX timestamp, offset, whether it is daylight saving time) from every transition of a timezone on, and the
+    POSIX timestamp that they are known until (None if the last offset stays in effect for good)
+    """
+    if turoboro.tz.is_pytz(timezone):
+        return _pytz_transitions(timezone)
+    return _zoneinfo_transitions(timezone)
+
+
+def build(timezone):
+    """
+    Builds the table of a timezone, from every transition it knows of.
+    :param timezone: The timezone
+    :type timezone: datetime.tzinfo
+    :return: turoboro.offsets.OffsetTable
+    """
+    changes, end = _transitions(timezone)
+    _, offset, dst = changes[0]
+    transitions, offsets, walls = [float('-inf')], [offset], [float('-inf')]
+    for timestamp, new_offset, new_dst in changes[1:]:
+        if new_offset > offset:
+            # Wall clock times in [timestamp + offset, timestamp + new_offset) are skipped
+            wall = timestamp + new_offset
+        elif not dst and new_dst:
+            # Wall clock times in [timestamp + new_offset, timestamp + offset) are repeated, standard time wins
+            wall = timestamp + offset
+        else:
+            wall = timestamp + new_offset
+        transitions.append(timestamp)
+        offsets.append(new_offset)
+        walls.append(max(wall, walls[-1]))
+        offset, dst = new_offset, new_dst
+
+    return OffsetTable(transitions, offsets, walls, end, timezone)
+
+
+def table(timezone):
+    """
+    The table of a timezone, built once per process.
+    :param timezone: The timezone
+    :type timezone: datetime.tzinfo
+    :return: turoboro.offsets.OffsetTable
+    """
+    offset_table = _TABLES.get(timezone)
+    if offset_table is None:
+        offset_table = _TABLES[timezone] = build(timezone)
+    return offset_table
+
+
+def wall_seconds(dt):
+    """
+    :param dt: A datetime
+    :type dt: datetime
+    :return: int, the wall clock time of `dt`, ignoring its timezone, in seconds since 1970-01-01T00:00
+    """
+    return calendar.timegm(dt.timetuple())
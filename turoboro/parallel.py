@@ -0,0 +1,128 @@
+"""
+Expands large numbers of JSON rule specs (as taken by `Rule.from_spec`) on all cores, using a pool of worker
+processes that stay warm between calls.
+
+    >>> with turoboro.parallel.ParallelExpander() as expander:
+    ...     for columns in expander.expand(specs, datetime(2019, 1, 1), datetime(2019, 2, 1)):
+    ...         insert(columns.rule_index, columns.occurrence)
+"""
+from collections import deque
+import multiprocessing
+import turoboro
+from turoboro.batch import Columns
+
+try:
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+except ImportError:  # pragma: no cover, Python 2
+    ProcessPoolExecutor = None
+
+
+def _initialize_worker():
+    """ Imports everything a worker needs (turoboro, and thereby voluptuous) and loads UTC before any work arrives """
+    import turoboro.tz
+    import turoboro.batch
+    turoboro.tz.timezone('UTC')
+
+
+def _expand_chunk(offset, specs, window_start, window_end, return_as):
+    rules = [turoboro.Rule.from_spec(spec) for spec in specs]
+    columns = turoboro.compute_many(rules, window_start, window_end, return_as=return_as)
+    return Columns([offset + index for index in columns.rule_index], columns.occurrence)
+
+
+class ParallelExpander(object):
+    """
+    A pool of warm worker processes that expand chunks of JSON specs with `turoboro.compute_many`.
+    :param max_workers: The number of worker processes, defaults to the number of cores
+    :type max_workers: int | None
+    :param chunk_size: The number of specs each worker expands at a time
+    :type chunk_size: int
+    """
+    def __init__(self, max_workers=None, chunk_size=1000):
+        if ProcessPoolExecutor is None:
+            raise ImportError('turoboro.parallel requires concurrent.futures (Python 3)')
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        # Starts the workers, and has them import what they need, before any work arrives
+        wait([self._executor.submit(_initialize_worker) for _ in range(self.max_workers)])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _chunks(self, specs):
+        chunk = []
+        offset = 0
+        for spec in specs:
+            chunk.append(spec)
+            if len(chunk) == self.chunk_size:
+                yield offset, chunk
+                offset += len(chunk)
+                chunk = []
+        if chunk:
+            yield offset, chunk
+
+    def expand(self, specs, window_start, window_end, return_as=turoboro.POSIX, ordered=True):
+        """
+        Yields the occurrences of every spec within the window, one `turoboro.batch.Columns` per chunk, with rule
+        indexes counted from the start of `specs`. At most two chunks per worker are in flight at a time, so `specs`
+        may be a generator over more specs than fit in memory.
+        :param specs: JSON rule specs
+        :type specs: iterable
+        :param window_start: The start of the window, naive datetimes are taken to be in each rule's timezone
+        :type window_start: datetime
+        :param window_end: The end of the window (exclusive)
+        :type window_end: datetime
+        :param return_as: How to represent the occurrences
+        :type return_as: str
+        :param ordered: Whether to yield chunks in the order of `specs`, or as soon as they are done
+        :type ordered: bool
+        :return: generator
+        """
+        in_flight = deque()
+        max_in_flight = 2 * self.max_workers
+        for offset, chunk in self._chunks(specs):
+            in_flight.append(
+                self._executor.submit(_expand_chunk, offset, chunk, window_start, window_end, return_as)
+            )
+            while len(in_flight) >= max_in_flight:
+                for columns in self._collect(in_flight, ordered):
+                    yield columns
+
+        while in_flight:
+            for columns in self._collect(in_flight, ordered):
+                yield columns
+
+    @staticmethod
+    def _collect(in_flight, ordered):
+        """ Waits for and removes the next finished chunk(s) from `in_flight` """
+        if ordered:
+            return [in_flight.popleft().result()]
+
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            in_flight.remove(future)
+        return [future.result() for future in done]
+
+
+def expand(specs, window_start, window_end, return_as=turoboro.POSIX, max_workers=None, chunk_size=1000,
+           ordered=True):
+    """
+    Expands JSON rule specs in parallel with a short lived `ParallelExpander`, returning all occurrences as a single
+    `turoboro.batch.Columns`. Keep a `ParallelExpander` around instead when expanding repeatedly.
+    :return: turoboro.batch.Columns
+    """
+    rule_index = []
+    occurrence = []
+    with ParallelExpander(max_workers=max_workers, chunk_size=chunk_size) as expander:
+        for columns in expander.expand(specs, window_start, window_end, return_as=return_as, ordered=ordered):
+            rule_index.extend(columns.rule_index)
+            occurrence.extend(columns.occurrence)
+
+    return Columns(rule_index, occurrence)
@@ -1,8 +1,92 @@
-from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import islice
+import calendar
 import turoboro
+import turoboro.arithmetic
+import turoboro.common
+import turoboro.tz
+import turoboro.year_cache
+
+try:
+    array('q')
+    _TIMESTAMP_TYPECODE = 'q'
+except ValueError:  # Python 2, where a long is 64 bits on the platforms we care about
+    _TIMESTAMP_TYPECODE = 'l'
+
+
+def convert_timestamps_to(timestamps, to=turoboro.ISO):
+    """
+    Represents POSIX timestamps the way `Rule.repr_dt` represents the equivalent datetimes, creating no datetimes at
+    all for POSIX output.
+    :param timestamps: POSIX timestamps
+    :type timestamps: iterable
+    :param to: How to represent the timestamps
+    :type to: str
+    :return: list
+    """
+    if to == turoboro.POSIX:
+        return list(timestamps)
+
+    convert = turoboro.common.convert_timestamp_to
+    return [convert(timestamp, to) for timestamp in timestamps]
+
+
+class TimestampArray(object):
+    """
+    A sorted, read only sequence of occurrences stored as POSIX timestamps in an `array`, 8 bytes each, with a single
+    timezone shared by all of them. Items are decoded into aware datetimes when accessed.
+    """
+    __slots__ = ('timestamps', 'timezone')
+
+    def __init__(self, timestamps, timezone=turoboro.tz.UTC):
+        if not isinstance(timestamps, array):
+            timestamps = array(_TIMESTAMP_TYPECODE, timestamps)
+        self.timestamps = timestamps
+        self.timezone = timezone
+
+    def _decode(self, timestamp):
+        return (turoboro.common.EPOCH + timedelta(seconds=timestamp)).astimezone(self.timezone)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        for timestamp in self.timestamps:
+            yield self._decode(timestamp)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TimestampArray(self.timestamps[item], self.timezone)
+
+        return self._decode(self.timestamps[item])
+
+    def bisect_left(self, dt):
+        """ The index of the first occurrence on or after the aware datetime `dt` """
+        timestamp = calendar.timegm(dt.utctimetuple())
+        return bisect_left(self.timestamps, timestamp + 1 if dt.microsecond else timestamp)
+
+    def bisect_right(self, dt):
+        """ The index of the first occurrence after the aware datetime `dt` """
+        return bisect_right(self.timestamps, calendar.timegm(dt.utctimetuple()))
+
+    def convert_to(self, to=turoboro.ISO):
+        """
+        Represents every occurrence the way `Rule.repr_dt` does, straight from the timestamps.
+        :param to: How to represent the occurrences
+        :type to: str
+        :return: list
+        """
+        if to == turoboro.POSIX:
+            return self.timestamps.tolist()
+
+        return convert_timestamps_to(self.timestamps, to)
 
 
 class Result(object):
+    __slots__ = ('datetimes', 'rule', 'infinite', 'return_as')
+
     def __init__(self, datetimes, rule, infinite=False, segment_from=None, return_as=turoboro.ISO):
         self.datetimes = datetimes
         self.rule = rule
@@ -17,15 +101,15 @@ class Result(object):
 
     @property
     def first(self):
-        if self.datetimes:
-            return self.rule.repr_dt(self.datetimes[0], self.return_as, self.rule.timezone)
+        if len(self.datetimes):
+            return self.formatted_list(self.datetimes[:1])[0]
 
         return None
 
     @property
     def last(self):
-        if self.datetimes:
-            return self.rule.repr_dt(self.datetimes[-1], self.return_as, self.rule.timezone)
+        if len(self.datetimes):
+            return self.formatted_list(self.datetimes[-1:])[0]
 
         return None
 
@@ -34,21 +118,132 @@ class Result(object):
         return self.formatted_list(self.datetimes)
 
     def formatted_list(self, _list):
+        if isinstance(_list, TimestampArray):
+            return _list.convert_to(self.return_as)
+        if isinstance(_list, turoboro.arithmetic.OccurrenceSequence) and _list.to_timestamp is not None:
+            return convert_timestamps_to(_list.timestamps(), self.return_as)
+
+        timezone = self.rule.timezone
         return [
-            self.rule.repr_dt(n, self.return_as, self.rule.timezone) for n in _list
+            self.rule.repr_dt(n, self.return_as, timezone) for n in _list
         ]
 
+    def compact(self):
+        """
+        A copy of this result that holds its occurrences as POSIX timestamps in an array (8 bytes per occurrence)
+        instead of computing them on access. Handy for results that are kept around and read repeatedly.
+        :return: turoboro.result.Result
+        """
+        timezone = self.rule.timezone
+        if isinstance(self.datetimes, turoboro.arithmetic.OccurrenceSequence) and self.datetimes.to_timestamp:
+            timestamps = TimestampArray(self.datetimes.timestamps(), timezone)
+        else:
+            timestamps = TimestampArray((calendar.timegm(dt.utctimetuple()) for dt in self.datetimes), timezone)
+
+        return Result(timestamps, self.rule, infinite=self.infinite, return_as=self.return_as)
+
+    def _localize(self, dt):
+        if dt.tzinfo is None:
+            return self.rule.timezone.localize(dt)
+        return dt
+
+    def _bisect(self, dt, right=False):
+        """
+        The index of the first occurrence on or after `dt` (or after `dt` if `right`), by binary search over the sorted
+        occurrences.
+        """
+        dt = self._localize(dt)
+        if hasattr(self.datetimes, 'bisect_left'):
+            return self.datetimes.bisect_right(dt) if right else self.datetimes.bisect_left(dt)
+        return bisect_right(self.datetimes, dt) if right else bisect_left(self.datetimes, dt)
+
     def _raw_segment(self, _from, to=None):
-        if _from.tzinfo is None:
-            _from = self.rule.timezone.localize(_from)
-        if to is not None and to.tzinfo is None:
-            to = self.rule.timezone.localize(to)
-        if isinstance(_from, datetime):
-            if to is None:
-                return [dt for dt in self.datetimes if dt >= _from]
-            return [dt for dt in self.datetimes if to >= dt >= _from]
+        if not isinstance(_from, datetime):
+            return self.datetimes[:0]
 
-        return []
+        return self.datetimes[self._bisect(_from):len(self.datetimes) if to is None else self._bisect(to, right=True)]
 
     def segment(self, _from, to=None):
-        return self.formatted_list(self._raw_segment(_from, to))
\ No newline at end of file
+        return self.formatted_list(self._raw_segment(_from, to))
+
+    def count_between(self, _from, to):
+        """
+        The number of occurrences from `_from` up to and including `to`, without computing them.
+        :param _from: The start of the segment, naive datetimes are taken to be in the rule's timezone
+        :type _from: datetime
+        :param to: The end of the segment (inclusive)
+        :type to: datetime
+        :return: int
+        """
+        return max(self._bisect(to, right=True) - self._bisect(_from), 0)
+
+    def before(self, dt):
+        """
+        The occurrences before `dt`
+        :param dt: A datetime, naive datetimes are taken to be in the rule's timezone
+        :type dt: datetime
+        :return: list
+        """
+        return self.formatted_list(self.datetimes[:self._bisect(dt)])
+
+    def after(self, dt):
+        """
+        The occurrences after `dt`
+        :param dt: A datetime, naive datetimes are taken to be in the rule's timezone
+        :type dt: datetime
+        :return: list
+        """
+        return self.formatted_list(self.datetimes[self._bisect(dt, right=True):])
+
+
+class OccurrenceIterator(object):
+    """
+    Yields the occurrences of a rule one at a time. The only state carried from one occurrence to the next is
+    `cursor`, the ordinal of the first day not yet looked at, so memory use and stack depth stay constant however far
+    you iterate. Pass `cursor` to `Rule.result` to resume iterating later.
+    """
+    def __init__(self, rule, pattern, cursor, hi, to_timestamp, return_as=turoboro.ISO):
+        self.rule = rule
+        self.cursor = cursor
+        self.hi = hi
+        self.return_as = return_as
+        self._pattern = pattern
+        self._to_timestamp = to_timestamp
+        self._ordinals = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._ordinals is None:
+            hi = turoboro.arithmetic.MAX_ORDINAL + 1 if self.hi is None else self.hi
+            self._ordinals = turoboro.year_cache.ordinals(self._pattern, self.cursor, hi)
+        ordinal = next(self._ordinals)
+        self.cursor = ordinal + 1
+        return turoboro.common.convert_timestamp_to(self._to_timestamp(ordinal), self.return_as)
+
+    next = __next__  # Python 2
+
+    def skip(self, n):
+        """
+        Skips the next `n` occurrences without computing the ones in between.
+        :param n: The number of occurrences to skip
+        :type n: int
+        :return: turoboro.result.OccurrenceIterator
+        """
+        if n > 0:
+            ordinal = self._pattern.nth(n, self.cursor)
+            if ordinal is None or (self.hi is not None and ordinal >= self.hi):
+                ordinal = turoboro.arithmetic.MAX_ORDINAL + 1 if self.hi is None else self.hi
+            self.cursor = ordinal
+            self._ordinals = None
+        return self
+
+    def take(self, n):
+        """
+        The next `n` occurrences, or fewer if the rule ends before that.
+        :param n: The number of occurrences to take
+        :type n: int
+        :return: list
+        """
+        return list(islice(self, n))
@@ -1,19 +1,18 @@
 import abc
+import calendar
+import turoboro.arithmetic
+import turoboro.binary
 import turoboro.common
+import turoboro.compiled
 import turoboro.constants
-from turoboro.result import Result
-from copy import deepcopy
-import pytz
+import turoboro.offsets
+from turoboro.result import OccurrenceIterator, Result
+import turoboro.tz
+import voluptuous
 from datetime import timedelta
 import json
 
 # <PYTHON2COMPATIBILITY>
-try:
-    RecursionError()
-except:
-    RecursionError = RuntimeError
-
-
 class abstractclassmethod(classmethod):
 
     __isabstractmethod__ = True
@@ -37,51 +36,181 @@ class Rule:
     @spec.setter
     def spec(self, spec):
         setattr(self, '_spec', self.validate_spec(spec))
+        setattr(self, '_derived', {})
+
+    def __getstate__(self):
+        # Derived state is recomputed rather than pickled, it holds closures
+        state = dict(self.__dict__)
+        state.pop('_derived', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._derived = {}
+
+    def _derived_state(self, name, derive):
+        """
+        State derived from the spec (the timezone, the localized start and end, the pattern) is computed once and kept
+        until the spec changes.
+        :param name: The name of the state
+        :type name: str
+        :param derive: Computes the state from the spec
+        :type derive: callable
+        """
+        derived = self._derived
+        if name not in derived:
+            derived[name] = derive()
+        return derived[name]
 
     @property
     def timezone(self):
-        return pytz.timezone(self.spec['timezone'])
+        return self._derived_state('timezone', lambda: turoboro.tz.timezone(self.spec['timezone']))
 
     @abc.abstractmethod
-    def _compute_with_end_date(self, from_dt, working_date, return_as):
+    def _compile_pattern(self):
+        """
+        Describes the days on which the rule occurs, so that occurrences can be counted and indexed arithmetically
+        instead of stepping through the calendar.
+        :return: turoboro.arithmetic.OrdinalPattern
+        """
         pass
 
-    @abc.abstractmethod
-    def _compute_n_times(self, from_dt, working_date, return_as):
-        pass
+    def _pattern(self):
+        return self._derived_state('pattern', self._compile_pattern)
 
-    @abc.abstractmethod
-    def _stagger_forward(self, from_dt):
-        pass
+    @property
+    def weekday_mask(self):
+        """
+        The weekdays the rule can occur on, whatever its start and end, as the bits of an int where bit 0 is Monday.
+        Masks of different rules can be combined with `&` and `|`, and read with `turoboro.common.from_mask`.
+        :return: int
+        """
+        return self._derived_state('weekday_mask', lambda: self._pattern().weekday_mask)
+
+    @property
+    def month_mask(self):
+        """
+        The months the rule can occur in, whatever its start and end, as the bits of an int where bit 0 is January.
+        See `weekday_mask`, and pass `turoboro.JANUARY` as the first month to `turoboro.common.from_mask`.
+        :return: int
+        """
+        return self._derived_state('month_mask', lambda: self._pattern().month_mask)
+
+    def compile(self):
+        """
+        An immutable snapshot of the rule, that threads can share and compute occurrences of without locking, see
+        `turoboro.compiled`.
+        :return: turoboro.compiled.CompiledRule
+        """
+        return turoboro.compiled.CompiledRule(self)
 
     @abc.abstractmethod
     def _is_allowed(self, working_date):
         pass
 
-    @abc.abstractmethod
-    def _bounce(self, working_date):
-        pass
+    def _lower_bound(self, from_dt, working_date):
+        """
+        The first day (as an ordinal) that may hold an occurrence when computing from `from_dt`. Occurrences are
+        looked for on the days after `from_dt`, unless `from_dt` is the start of the rule.
+        """
+        start = working_date.toordinal()
+        if from_dt is None or from_dt == working_date:
+            return start
 
-    def _compute_infinite(self, from_dt, working_date, max_count, return_as):
-        result = []
-        count = 0
-        if working_date.tzinfo is None:
-            working_date = self.timezone.localize(working_date)
-        if from_dt is not None and from_dt.tzinfo is None:
-            from_dt = self.timezone.localize(from_dt)
-        if from_dt is not None and from_dt != working_date:
-            working_date = self._stagger_forward(from_dt)
+        return max(start, from_dt.astimezone(self.timezone).toordinal() + 1)
+
+    def _upper_bound(self, working_date):
+        """
+        The first day (as an ordinal) on which an occurrence would no longer fall before the end date, going by the
+        wall clock in the rule's timezone.
+        """
+        delta = self.end_datetime.replace(tzinfo=None) - working_date.replace(tzinfo=None)
+        return working_date.toordinal() + delta.days + (1 if delta.seconds or delta.microseconds else 0)
+
+    def _offsets(self):
+        return self._derived_state('offsets', lambda: turoboro.offsets.table(self.timezone))
 
-        while count < max_count:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-                count += 1
-            working_date = self._bounce(working_date)
+    def _ordinal_converter(self, working_date):
+        to_timestamp = self._timestamp_converter(working_date)
+        timezone = self.timezone
 
-        return Result(result, self, return_as=return_as, infinite=True)
+        def to_datetime(ordinal):
+            return turoboro.common.datetime_from_timestamp(to_timestamp(ordinal), timezone)
+
+        return to_datetime
+
+    def _timestamp_converter(self, working_date):
+        """
+        Turns the ordinal of an occurrence straight into its POSIX timestamp, without creating a datetime. Occurrences
+        are at the same wall clock time every day, so in timezones with daylight saving time the UTC offset of each is
+        looked up in the `turoboro.offsets.OffsetTable` of the timezone.
+        """
+        return self._derived_state('to_timestamp', lambda: self._compile_timestamp_converter(working_date))
+
+    def _compile_timestamp_converter(self, working_date):
+        start = working_date.toordinal()
+        start_timestamp = self._start_timestamp(working_date)
+        day = turoboro.common.DAY
+        offsets = self._offsets()
+        if offsets.fixed_offset is not None:
+            def to_timestamp(ordinal):
+                return start_timestamp + (ordinal - start) * day
+
+            return to_timestamp
+
+        # The wall clock time, in seconds, that the rule would occur at on ordinal 0
+        wall = turoboro.offsets.wall_seconds(working_date) - start * day
+        # Occurrences mostly come in order, so the offset of the last one usually goes for the next one too. The
+        # segment is replaced as a whole, which keeps the converter safe to share between threads
+        last = [offsets.segment(wall + start * day)]
+
+        def to_timestamp(ordinal):
+            local = wall + ordinal * day
+            lo, hi, offset = last[0]
+            if not lo <= local < hi:
+                lo, hi, offset = last[0] = offsets.segment(local)
+            return local - offset
+
+        return to_timestamp
+
+    def _bounds(self, pattern, from_dt, working_date):
+        """
+        The ordinals [lo, hi) that hold the occurrences of the rule when computing from `from_dt`. `hi` is None for
+        infinite rules. For rules that repeat n times, occurrences on the day of `from_dt` are included.
+        :return: tuple
+        """
+        if self.spec['end'] is not None:
+            return self._lower_bound(from_dt, working_date), self._upper_bound(working_date)
+
+        if self.spec['repeat'] is not None:
+            last = self._derived_state('last', lambda: pattern.nth(self.spec['repeat'] - 1))
+            lo = pattern.first
+            if from_dt is not None:
+                lo = max(lo, from_dt.astimezone(self.timezone).toordinal())
+            return lo, None if last is None else last + 1
+
+        return self._lower_bound(from_dt, working_date), None
+
+    def _compute_with_end_date(self, from_dt, working_date, return_as):
+        pattern = self._pattern()
+        lo, hi = self._bounds(pattern, from_dt, working_date)
+        occurrences = turoboro.arithmetic.OccurrenceSequence.until(
+            pattern, lo, hi, self._ordinal_converter(working_date), self._timestamp_converter(working_date)
+        )
+        return Result(occurrences, self, return_as=return_as)
+
+    _compute_n_times = _compute_with_end_date
+
+    def _compute_infinite(self, from_dt, working_date, max_count, return_as):
+        pattern = self._pattern()
+        lo, _ = self._bounds(pattern, from_dt, working_date)
+        occurrences = turoboro.arithmetic.OccurrenceSequence.at_most(
+            pattern, lo, max_count, self._ordinal_converter(working_date), self._timestamp_converter(working_date)
+        )
+        return Result(occurrences, self, return_as=return_as, infinite=True)
 
     def compute(self, from_dt=None, max_count_if_infinite=100, return_as=turoboro.ISO):
-        working_date = self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
+        working_date = self.start_datetime
 
         if from_dt is not None and from_dt.tzinfo is None:
             from_dt = self.timezone.localize(from_dt)
@@ -93,18 +222,95 @@ class Rule:
         return self._compute_infinite(from_dt, working_date, max_count_if_infinite, return_as)
 
     @abc.abstractmethod
-    def validate_spec(self, spec):
+    def _check_invariants(self, spec, starting_day):
         pass
 
+    def validate_spec(self, spec):
+        """
+        Validates the rule specification
+        :param spec: The spec we are attempting to accept
+        :type spec: dict
+        :return: dict
+        """
+        self._check_invariants(spec, turoboro.common.datetime_from_isoformat(spec['start']))
+        return self.SPEC_SCHEMA(spec)
+
+    @classmethod
+    def _field_schema(cls, field):
+        """
+        A schema that validates a single field of the spec, with the same validator as `SPEC_SCHEMA` and hence the same
+        errors. Compiled once per rule class.
+        """
+        schemas = cls.__dict__.get('_FIELD_SCHEMAS')
+        if schemas is None:
+            schemas = dict(
+                (key, voluptuous.Schema({key: validator})) for key, validator in cls.SPEC_SCHEMA.schema.items()
+            )
+            setattr(cls, '_FIELD_SCHEMAS', schemas)
+        return schemas[field]
+
     @abstractclassmethod
     def factory(cls, spec):
         pass
 
+    @abc.abstractmethod
+    def _binary_fields(self):
+        """
+        The fields of the spec that are particular to the type of rule, as they are packed into a binary record
+        :return: tuple, the weekday mask, the day, the step and the flags of the record (see `turoboro.binary`)
+        """
+        pass
+
+    @abstractclassmethod
+    def _spec_from_binary_fields(cls, weekday_mask, day, step, flags):
+        """
+        The inverse of `_binary_fields`
+        :return: dict, the fields of the spec that are particular to the type of rule
+        """
+        pass
+
+    def to_bytes(self):
+        """
+        Packs the rule into a fixed-size binary record, see `turoboro.binary`
+        :return: bytes
+        """
+        return turoboro.binary.pack(self)
+
+    @classmethod
+    def from_bytes(cls, data, validate=True):
+        """
+        Unpacks a rule from a binary record made by `to_bytes`
+        :param data: The record
+        :type data: bytes
+        :param validate: Whether to validate the spec of the rule
+        :type validate: bool
+        :return: turoboro.rules.Rule
+        """
+        rule = turoboro.binary.from_bytes(data, validate)
+        if not isinstance(rule, cls):
+            raise ValueError('The record is of a %s rule, not a %s' % (rule.spec['rule'], cls.__name__))
+        return rule
+
     def set_if_valid(self, field, value):
-        spec = deepcopy(self.spec)
+        """
+        Sets a field of the spec if the spec stays valid. Since the rest of the spec has already been validated, only
+        the field itself and the constraints between fields are checked.
+        """
+        spec = dict(self.spec)
         spec[field] = value
-        self.validate_spec(spec)
-        self.spec = spec
+        if field not in self.SPEC_SCHEMA.schema:
+            self.spec = spec
+            return
+        if field == 'start':
+            starting_day = turoboro.common.datetime_from_isoformat(value)
+        else:
+            starting_day = self._derived_state(
+                'starting_day', lambda: turoboro.common.datetime_from_isoformat(self.spec['start'])
+            )
+        self._check_invariants(spec, starting_day)
+        spec[field] = self._field_schema(field)({field: value})[field]
+        setattr(self, '_spec', spec)
+        setattr(self, '_derived', {} if field == 'start' else {'starting_day': starting_day})
 
     def repeat_n_times(self, n):
         """
@@ -138,9 +344,12 @@ class Rule:
         :return: turoboro.rules.DailyRule
         """
         self.set_if_valid('on_hour', hour)
-        self.spec['start'] = self.start_datetime.replace(hour=hour).isoformat()
+        # Localize the new wall clock time afresh, the UTC offset of the old one may not apply to it
         if self.spec['end'] is not None:
-            self.spec['end'] = self.end_datetime.replace(hour=hour).isoformat()
+            end = self.end_datetime.replace(tzinfo=None, hour=hour)
+            self.set_if_valid('end', self.timezone.localize(end).isoformat())
+        start = self.start_datetime.replace(tzinfo=None, hour=hour)
+        self.set_if_valid('start', self.timezone.localize(start).isoformat())
         return self
 
     def _end_before(self, end):
@@ -168,59 +377,217 @@ class Rule:
         if end is None:
             self.set_if_valid('end', None)
             return self
-        end = end.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-        if end.tzinfo is None:
-            end = self.timezone.localize(end)
-        self._end_before(end + timedelta(days=1))
+        if end.tzinfo is not None:
+            end = end.astimezone(self.timezone).replace(tzinfo=None)
+        end = end.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self._end_before(self.timezone.localize(end))
         return self
 
     @property
     def start_datetime(self):
-        dt = turoboro.common.datetime_from_isoformat(self.spec['start'])
-        return self.timezone.localize(dt)
+        return self._derived_state('start_datetime', lambda: self._localize_spec_field('start'))
 
     @property
     def end_datetime(self):
-        if self.spec['end'] is not None:
-            dt = turoboro.common.datetime_from_isoformat(self.spec['end'])
+        return self._derived_state('end_datetime', lambda: self._localize_spec_field('end'))
+
+    def _localize_spec_field(self, field):
+        if self.spec[field] is not None:
+            dt = turoboro.common.datetime_from_isoformat(self.spec[field])
             return self.timezone.localize(dt)
         return None
 
     @classmethod
-    def repr_dt(cls, dt, to=turoboro.ISO, timezone=pytz.UTC):
-        try:
-            localized_dt = timezone.localize(dt)
-        except ValueError:  # dt is probably already localized
-            localized_dt = dt
-        dt = localized_dt.astimezone(pytz.UTC)
+    def repr_dt(cls, dt, to=turoboro.ISO, timezone=turoboro.tz.UTC):
+        if dt.tzinfo is None:
+            dt = turoboro.tz.localize(timezone, dt)
+        dt = dt.astimezone(turoboro.tz.UTC)
         return turoboro.common.convert_datetime_to(dt, to)
 
-    def result(self, from_dt=None, max_count_if_infinite=3, return_as=turoboro.ISO):
-        result = self.compute(from_dt=from_dt, max_count_if_infinite=max_count_if_infinite,
-                              return_as=turoboro.DATETIME_INSTANCE)
-        count = 0
-        last_dt = None
-        for dt in result.all:
-            count += 1
-            last_dt = dt
-            yield self.repr_dt(dt, return_as, self.timezone)
-
-        if count == len(result.all) and result.infinite:
-            try:
-                _r = self.result(from_dt=last_dt, max_count_if_infinite=max_count_if_infinite, return_as=return_as)
-                count += 1
-                for r in _r:
-                    yield r
-            except (RecursionError, OverflowError):
-                pass
+    def result(self, from_dt=None, max_count_if_infinite=None, return_as=turoboro.ISO, cursor=None):
+        """
+        Lazily iterates over the occurrences of the rule, one at a time and for as long as you like, infinite rules
+        included (until `date.max`).
+        :param from_dt: Iterate from this datetime, as with `compute`
+        :type from_dt: datetime | None
+        :param max_count_if_infinite: Unused, the iterator does not compute occurrences in batches
+        :param return_as: How to represent the occurrences
+        :type return_as: str
+        :param cursor: The `cursor` of an earlier iterator over this rule, to resume where it left off
+        :type cursor: int | None
+        :return: turoboro.result.OccurrenceIterator
+        """
+        working_date = self.start_datetime
+        if from_dt is not None and from_dt.tzinfo is None:
+            from_dt = self.timezone.localize(from_dt)
+        pattern = self._pattern()
+        lo, hi = self._bounds(pattern, from_dt, working_date)
+        return OccurrenceIterator(
+            self, pattern, lo if cursor is None else cursor, hi, self._timestamp_converter(working_date), return_as
+        )
+
+    def aiter(self, from_dt=None, return_as=turoboro.ISO, cursor=None, chunk_size=None, executor=None):
+        """
+        Asynchronously iterates over the occurrences of the rule, as `result` does, with `async for` (Python 3 only).
+        See `turoboro.aio.OccurrenceStream`.
+        :param chunk_size: The number of occurrences to compute at a time
+        :type chunk_size: int | None
+        :param executor: Where to compute chunks too big to compute on the event loop
+        :type executor: concurrent.futures.Executor | None
+        :return: turoboro.aio.OccurrenceStream
+        """
+        import turoboro.aio  # Python 3 only
+        return turoboro.aio.OccurrenceStream(
+            self.result(from_dt, return_as=return_as, cursor=cursor), chunk_size or turoboro.aio.CHUNK_SIZE, executor
+        )
+
+    def _start_timestamp(self, working_date):
+        return self._derived_state('start_timestamp', lambda: calendar.timegm(working_date.utctimetuple()))
+
+    def _wall_ordinal(self, dt):
+        """ The day (as an ordinal) of `dt` by the wall clock in the rule's timezone """
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(self.timezone)
+        return dt.toordinal()
+
+    def _posix_timestamp(self, dt):
+        """ The POSIX timestamp of `dt` in whole seconds (rounded down), and whether `dt` is on a whole second """
+        if dt.tzinfo is None:
+            dt = turoboro.tz.localize(self.timezone, dt)
+        return calendar.timegm(dt.utctimetuple()), dt.microsecond == 0
+
+    def _end_ordinal(self, working_date):
+        """ The first ordinal after the last occurrence of the rule, None for infinite rules """
+        return self._derived_state('hi', lambda: self._bounds(self._pattern(), None, working_date)[1])
+
+    def _occurrence(self, ordinal, working_date, return_as):
+        if ordinal is None:
+            return None
+
+        return turoboro.common.convert_timestamp_to(self._timestamp_converter(working_date)(ordinal), return_as)
+
+    def next_after(self, dt, return_as=turoboro.ISO):
+        """
+        The first occurrence after `dt`, worked out arithmetically without computing any other occurrence.
+        :param dt: A datetime, naive datetimes are taken to be in the rule's timezone
+        :type dt: datetime
+        :param return_as: How to represent the occurrence
+        :type return_as: str
+        :return: str | int | datetime | None, None if the rule does not occur after `dt`
+        """
+        working_date = self.start_datetime
+        pattern = self._pattern()
+        to_timestamp = self._timestamp_converter(working_date)
+        timestamp, _ = self._posix_timestamp(dt)
+        # The day of `dt` only narrows it down, occurrences keep their wall clock time when a transition skips it, so
+        # they are compared by timestamp, starting from the day before
+        ordinal = pattern.nth(0, self._wall_ordinal(dt) - 1)
+        while ordinal is not None and to_timestamp(ordinal) <= timestamp:
+            ordinal = pattern.nth(0, ordinal + 1)
+        hi = self._end_ordinal(working_date)
+        if hi is not None and ordinal is not None and ordinal >= hi:
+            return None
+        return self._occurrence(ordinal, working_date, return_as)
+
+    def previous_before(self, dt, return_as=turoboro.ISO):
+        """
+        The last occurrence before `dt`, worked out arithmetically without computing any other occurrence.
+        :param dt: A datetime, naive datetimes are taken to be in the rule's timezone
+        :type dt: datetime
+        :param return_as: How to represent the occurrence
+        :type return_as: str
+        :return: str | int | datetime | None, None if the rule does not occur before `dt`
+        """
+        working_date = self.start_datetime
+        pattern = self._pattern()
+        to_timestamp = self._timestamp_converter(working_date)
+        timestamp, whole_second = self._posix_timestamp(dt)
+        # Occurrences before `dt` have a timestamp below this
+        limit = timestamp if whole_second else timestamp + 1
+        hi = self._wall_ordinal(dt) + 2
+        end = self._end_ordinal(working_date)
+        ordinal = pattern.last_before(hi if end is None else min(hi, end))
+        while ordinal is not None and to_timestamp(ordinal) >= limit:
+            ordinal = pattern.last_before(ordinal)
+        return self._occurrence(ordinal, working_date, return_as)
+
+    def nth(self, k, return_as=turoboro.ISO):
+        """
+        The `k`th (zero based) occurrence of the rule, counted arithmetically instead of computing the occurrences
+        before it. Negative indexes count from the last occurrence of rules that end.
+        :param k: The index of the occurrence
+        :type k: int
+        :param return_as: How to represent the occurrence
+        :type return_as: str
+        :return: str | int | datetime
+        """
+        working_date = self.start_datetime
+        pattern = self._pattern()
+        hi = self._end_ordinal(working_date)
+        if k < 0:
+            if hi is None:
+                raise IndexError('Infinite rules can not be indexed from the end')
+            k += pattern.count(pattern.first, hi)
+
+        ordinal = pattern.nth(k) if k >= 0 else None
+        if ordinal is None or (hi is not None and ordinal >= hi):
+            raise IndexError('Occurrence index out of range')
+
+        return self._occurrence(ordinal, working_date, return_as)
+
+    def index_of(self, dt):
+        """
+        The (zero based) index of an occurrence of the rule, such that `rule.nth(rule.index_of(dt))` is `dt`.
+        :param dt: An occurrence of the rule, naive datetimes are taken to be in the rule's timezone
+        :type dt: datetime
+        :return: int
+        """
+        working_date = self.start_datetime
+        pattern = self._pattern()
+        to_timestamp = self._timestamp_converter(working_date)
+        timestamp, whole_second = self._posix_timestamp(dt)
+        hi = self._end_ordinal(working_date)
+        wall_ordinal = self._wall_ordinal(dt)
+        # An occurrence at a wall clock time that a transition skips may fall on the day before or after by the clock
+        for ordinal in (wall_ordinal, wall_ordinal - 1, wall_ordinal + 1):
+            occurs = whole_second and (hi is None or ordinal < hi) and pattern.count(ordinal, ordinal + 1) == 1
+            if occurs and to_timestamp(ordinal) == timestamp:
+                return pattern.count(pattern.first, ordinal)
+
+        raise ValueError('%s is not an occurrence of the rule' % dt)
+
+    @staticmethod
+    def rule_class(name):
+        """
+        The class of rule that a spec is for
+        :param name: The `rule` field of the spec
+        :type name: str
+        :return: type | None
+        """
+        if name == turoboro.RULE_DAILY:
+            return turoboro.DailyRule
+        if name == turoboro.RULE_WEEKLY:
+            return turoboro.WeeklyRule
+        if name == turoboro.RULE_MONTHLY:
+            return turoboro.MonthlyRule
+
+    @classmethod
+    def _from_validated_spec(cls, spec):
+        """
+        Builds a rule around a spec that has already been through `validate_spec`, without validating it again
+        :param spec: The validated spec
+        :type spec: dict
+        :return: turoboro.rules.Rule
+        """
+        rule = cls.__new__(cls)
+        rule._spec = spec
+        rule._derived = {}
+        return rule
 
     @classmethod
     def from_spec(cls, spec):
         spec = json.loads(spec)
-        if spec['rule'] == turoboro.RULE_DAILY:
-            return turoboro.DailyRule.factory(spec)
-        if spec['rule'] == turoboro.RULE_WEEKLY:
-            return turoboro.WeeklyRule.factory(spec)
-        if spec['rule'] == turoboro.RULE_MONTHLY:
-            return turoboro.MonthlyRule.factory(spec)
+        rule_class = Rule.rule_class(spec['rule'])
+        if rule_class is not None:
+            return rule_class.factory(spec)
 
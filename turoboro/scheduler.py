@@ -0,0 +1,183 @@
+"""
+Keeps track of when many rules occur next, so that a polling loop only does work for the rules that are due.
+
+    >>> scheduler = turoboro.scheduler.Scheduler()
+    >>> scheduler.add('standup', standup_rule)
+    >>> scheduler.add('backup', backup_rule)
+    >>> while True:
+    ...     for key, occurrence in scheduler.pop_due():
+    ...         fire(key, occurrence)
+    ...     time.sleep(1)
+
+Rules are kept in a min-heap by their next occurrence, as a POSIX timestamp. `pop_due` pops the k occurrences that are
+due in O(k log n), and works out the occurrence after each of them from the one before, without recomputing the rule.
+Rules can be added, removed and updated at any time. A scheduler is not thread safe.
+"""
+from itertools import count
+import calendar
+import heapq
+import numbers
+import time
+import turoboro
+import turoboro.common
+
+
+def to_timestamp(when):
+    """
+    :param when: A POSIX timestamp, or a datetime (naive datetimes are taken to be in UTC)
+    :type when: int | float | datetime
+    :return: int | float
+    """
+    if isinstance(when, numbers.Real):
+        return when
+    if when.tzinfo is not None:
+        when = when.utctimetuple()
+    else:
+        when = when.timetuple()
+    return calendar.timegm(when)
+
+
+class _Entry(object):
+    """ A rule in the scheduler, and the ordinal and timestamp of its next occurrence """
+    __slots__ = ('key', 'rule', 'pattern', 'hi', 'to_timestamp', 'ordinal', 'timestamp', 'sequence')
+
+    def __init__(self, key, rule):
+        working_date = rule.start_datetime
+        self.key = key
+        self.rule = rule
+        self.pattern = rule._pattern()
+        self.hi = rule._end_ordinal(working_date)
+        self.to_timestamp = rule._timestamp_converter(working_date)
+        self.ordinal = self.timestamp = self.sequence = None
+
+    def _seek(self, ordinal):
+        if ordinal is not None and self.hi is not None and ordinal >= self.hi:
+            ordinal = None
+        self.ordinal = ordinal
+        self.timestamp = None if ordinal is None else self.to_timestamp(ordinal)
+
+    def seek(self, since):
+        """ Moves to the first occurrence at or after the POSIX timestamp `since` """
+        working_date = self.rule.start_datetime
+        days = (since - self.rule._start_timestamp(working_date)) // turoboro.common.DAY
+        self._seek(self.pattern.nth(0, working_date.toordinal() + int(days)))
+        while self.timestamp is not None and self.timestamp < since:
+            self._seek(self.pattern.nth(0, self.ordinal + 1))
+
+    def advance(self):
+        """ Moves to the occurrence after the current one """
+        self._seek(self.pattern.nth(0, self.ordinal + 1))
+
+
+class Scheduler(object):
+    """
+    A min-heap of rules by their next occurrence.
+    :param clock: Returns the current time as a POSIX timestamp, when no time is given
+    :type clock: callable
+    """
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._entries = {}
+        self._heap = []
+        self._sequence = count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _now(self, now):
+        return self.clock() if now is None else to_timestamp(now)
+
+    def _push(self, entry):
+        if entry.timestamp is None:
+            # The rule has no more occurrences
+            del self._entries[entry.key]
+            return
+
+        entry.sequence = next(self._sequence)
+        heapq.heappush(self._heap, (entry.timestamp, entry.sequence, entry))
+
+    def add(self, key, rule, since=None):
+        """
+        Schedules a rule, from its first occurrence at or after `since`.
+        :param key: What the occurrences of the rule are reported by, unique within the scheduler
+        :type key: hashable
+        :param rule: The rule
+        :type rule: turoboro.rules.Rule
+        :param since: A POSIX timestamp or a datetime, defaults to now
+        :type since: int | float | datetime | None
+        :return: int | None, the timestamp of the first occurrence, None if the rule no longer occurs (and was not
+        scheduled)
+        """
+        if key in self._entries:
+            raise KeyError('%r is already scheduled, use update() to replace its rule' % (key,))
+
+        entry = _Entry(key, rule)
+        entry.seek(self._now(since))
+        self._entries[key] = entry
+        self._push(entry)
+        return entry.timestamp
+
+    def remove(self, key):
+        """
+        Unschedules a rule.
+        :param key: The key the rule was added with
+        :type key: hashable
+        :return: turoboro.rules.Rule, the rule
+        """
+        entry = self._entries.pop(key)
+        # The entry is left in the heap, and skipped when it comes up
+        entry.sequence = None
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [item for item in self._heap if item[1] == item[2].sequence]
+            heapq.heapify(self._heap)
+        return entry.rule
+
+    def update(self, key, rule, since=None):
+        """
+        Replaces the rule of a key (or schedules it, if the key is new), see `add`.
+        :return: int | None, the timestamp of the first occurrence of the new rule
+        """
+        if key in self._entries:
+            self.remove(key)
+        return self.add(key, rule, since)
+
+    def _top(self):
+        """ The entry of the earliest occurrence, dropping entries of removed and updated rules on the way """
+        heap = self._heap
+        while heap:
+            _, sequence, entry = heap[0]
+            if sequence == entry.sequence:
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def next_timestamp(self):
+        """
+        :return: int | None, the timestamp of the earliest scheduled occurrence, None if nothing is scheduled
+        """
+        entry = self._top()
+        return None if entry is None else entry.timestamp
+
+    def pop_due(self, now=None, return_as=turoboro.POSIX):
+        """
+        Pops every occurrence at or before `now`, in order, and schedules the occurrence that follows each of them.
+        :param now: A POSIX timestamp or a datetime, defaults to now
+        :type now: int | float | datetime | None
+        :param return_as: How to represent the occurrences
+        :type return_as: str
+        :return: list, of (key, occurrence) pairs
+        """
+        now = self._now(now)
+        due = []
+        while True:
+            entry = self._top()
+            if entry is None or entry.timestamp > now:
+                return due
+
+            heapq.heappop(self._heap)
+            due.append((entry.key, turoboro.common.convert_timestamp_to(entry.timestamp, return_as)))
+            entry.advance()
+            self._push(entry)
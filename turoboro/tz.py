@@ -0,0 +1,225 @@
+"""
+Where timezones come from. Timezones are looked up by name with the standard library's `zoneinfo` (Python 3.9+), or
+with `pytz` where `zoneinfo` or its timezone database is not available:
+
+    >>> turoboro.tz.get_backend()
+    'zoneinfo'
+    >>> turoboro.tz.set_backend('pytz')
+
+Either way `Rule.timezone` localizes and normalizes datetimes the way a pytz timezone does (`timezone.localize(dt)`),
+and pytz is only imported when it is the backend.
+"""
+import sys
+
+try:
+    from datetime import timezone as _timezone
+    UTC = _timezone.utc
+except ImportError:  # pragma: no cover, Python 2
+    import pytz
+    UTC = pytz.UTC
+
+try:
+    import zoneinfo
+except ImportError:  # pragma: no cover, Python < 3.9
+    zoneinfo = None
+
+ZONEINFO = 'zoneinfo'
+PYTZ = 'pytz'
+BACKENDS = (ZONEINFO, PYTZ)
+# Found in some timezone databases, but not timezones as far as pytz is concerned
+NOT_TIMEZONES = frozenset(['Factory', 'localtime', 'posixrules'])
+
+_backend = None
+
+
+if zoneinfo is not None:
+    class ZoneInfo(zoneinfo.ZoneInfo):
+        """
+        A `zoneinfo.ZoneInfo` that also localizes and normalizes datetimes the way pytz timezones do, so that either
+        backend can stand in for the other.
+        """
+        @property
+        def zone(self):
+            """ The name of the timezone, as pytz names it """
+            return self.key
+
+        def localize(self, dt, is_dst=False):
+            """
+            Attaches the timezone to a naive datetime, resolving wall clock times that a transition skips or repeats
+            as `pytz` does.
+            :param dt: A naive datetime
+            :type dt: datetime
+            :param is_dst: Whether to prefer daylight saving time for skipped and repeated times
+            :type is_dst: bool
+            :return: datetime
+            """
+            if dt.tzinfo is not None:
+                raise ValueError('Not naive datetime (tzinfo is already set)')
+
+            earlier = dt.replace(tzinfo=self, fold=0)
+            later = dt.replace(tzinfo=self, fold=1)
+            earlier_offset, later_offset = earlier.utcoffset(), later.utcoffset()
+            if earlier_offset == later_offset:
+                return earlier
+            if earlier_offset < later_offset:
+                # Skipped, the earlier has the offset from before the transition
+                return later if is_dst else earlier
+
+            # Repeated, prefer the one that is (or is not) daylight saving time, and otherwise the earlier (or later)
+            preferred = [candidate for candidate in (earlier, later) if bool(candidate.dst()) == bool(is_dst)]
+            if len(preferred) == 1:
+                return preferred[0]
+            return earlier if is_dst else later
+
+        def normalize(self, dt):
+            """
+            :param dt: An aware datetime
+            :type dt: datetime
+            :return: datetime, `dt` in this timezone
+            """
+            return dt.astimezone(self)
+else:  # pragma: no cover
+    ZoneInfo = None
+
+
+class ZoneInfoBackend(object):
+    """ Looks timezones up with `zoneinfo` """
+    name = ZONEINFO
+
+    def __init__(self):
+        if zoneinfo is None:
+            raise ImportError('The zoneinfo backend requires Python 3.9 or later')
+        try:
+            ZoneInfo('UTC')
+        except zoneinfo.ZoneInfoNotFoundError:
+            raise ImportError('The zoneinfo backend requires a timezone database, install it with `pip install tzdata`')
+        self._names = None
+
+    @staticmethod
+    def timezone(name):
+        return ZoneInfo(name)
+
+    def is_timezone(self, name):
+        try:
+            return name in self.names
+        except TypeError:
+            return False
+
+    def all_timezones(self):
+        return sorted(self.names)
+
+    @property
+    def names(self):
+        """
+        The names of every timezone, less the files of the timezone database that pytz does not count as timezones
+        (`localtime`, `Factory`...). Both backends then accept the same names, see `Rule.from_bytes`.
+        """
+        if self._names is None:
+            self._names = frozenset(zoneinfo.available_timezones()) - NOT_TIMEZONES
+        return self._names
+
+
+class PytzBackend(object):
+    """ Looks timezones up with `pytz` """
+    name = PYTZ
+
+    def __init__(self):
+        import pytz
+        self.pytz = pytz
+
+    def timezone(self, name):
+        return self.pytz.timezone(name)
+
+    def is_timezone(self, name):
+        return name in self.pytz.all_timezones_set
+
+    def all_timezones(self):
+        return list(self.pytz.all_timezones)
+
+
+def _create_backend(name):
+    if name == ZONEINFO:
+        return ZoneInfoBackend()
+    if name == PYTZ:
+        return PytzBackend()
+    raise ValueError('Unknown timezone backend %r, expecting one of %s' % (name, ', '.join(BACKENDS)))
+
+
+def _get():
+    global _backend
+    if _backend is None:
+        try:
+            _backend = ZoneInfoBackend()
+        except ImportError:
+            _backend = PytzBackend()
+    return _backend
+
+
+def get_backend():
+    """
+    :return: str, the name of the backend timezones are looked up with
+    """
+    return _get().name
+
+
+def set_backend(name):
+    """
+    Looks timezones up with another backend from now on. Rules that have already looked up their timezone keep it.
+    :param name: turoboro.tz.ZONEINFO or turoboro.tz.PYTZ
+    :type name: str
+    """
+    global _backend
+    _backend = _create_backend(name)
+
+
+def timezone(name):
+    """
+    :param name: The name of a timezone, e.g. 'Europe/Stockholm'
+    :type name: str
+    :return: datetime.tzinfo, the timezone
+    """
+    return _get().timezone(name)
+
+
+def is_timezone(name):
+    """
+    Validates the name of a timezone. Both backends accept the same names, those of pytz.
+    :param name: The name
+    :type name: str
+    :return: str
+    """
+    if not _get().is_timezone(name):
+        raise ValueError('Expecting the name of a timezone, not %r' % (name,))
+    return name
+
+
+def all_timezones():
+    """
+    :return: list, the names of every timezone
+    """
+    return _get().all_timezones()
+
+
+def localize(timezone, dt):
+    """
+    Attaches a timezone to a naive datetime, as `localize` of a pytz timezone does, for any timezone.
+    :param timezone: The timezone
+    :type timezone: datetime.tzinfo
+    :param dt: A naive datetime
+    :type dt: datetime
+    :return: datetime
+    """
+    if hasattr(timezone, 'localize'):
+        return timezone.localize(dt)
+    return dt.replace(tzinfo=timezone)
+
+
+def is_pytz(timezone):
+    """
+    :param timezone: A timezone
+    :type timezone: datetime.tzinfo
+    :return: bool, whether it is a pytz timezone
+    """
+    pytz_tzinfo = sys.modules.get('pytz.tzinfo')
+    return pytz_tzinfo is not None and isinstance(timezone, pytz_tzinfo.BaseTzInfo)
+
@@ -0,0 +1,215 @@
+"""
+An optional numpy backend that expands rules into arrays of occurrences, for when you need a lot of them at once.
+
+    >>> import turoboro.vectorized
+    >>> result = turoboro.vectorized.compute(rule)
+    >>> result.datetimes
+    array(['2014-01-01T08:00:00', '2014-01-03T08:00:00', ...], dtype='datetime64[s]')
+
+Requires numpy (`pip install turoboro[numpy]`).
+"""
+from datetime import date
+import calendar
+import turoboro
+import turoboro.arithmetic
+import turoboro.offsets
+import turoboro.tz
+from turoboro.result import Result
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH_MONTH = 1970 * 12
+SECONDS_PER_DAY = 86400
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('turoboro.vectorized requires numpy, install it with `pip install numpy`')
+
+
+def _months_of(ordinals):
+    """ The month (1-12) of every ordinal in an array """
+    days = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+    return days.astype('datetime64[M]').astype(numpy.int64) % 12 + 1
+
+
+def _month_starts(months):
+    """ The ordinal of the first day of every month index (as per `turoboro.arithmetic.month_index`) in an array """
+    return (months - EPOCH_MONTH).astype('datetime64[M]').astype('datetime64[D]').astype(numpy.int64) + EPOCH_ORDINAL
+
+
+def _grid(pattern, lo, hi):
+    """
+    Every occurrence of a turoboro.arithmetic.OrdinalPattern in [lo, hi): a grid of every period in range times every
+    offset, with the excepted months masked out.
+    """
+    lo = max(lo, pattern.first)
+    if hi <= lo:
+        return numpy.empty(0, dtype=numpy.int64)
+
+    periods = numpy.arange((lo - pattern.anchor) // pattern.period, (hi - 1 - pattern.anchor) // pattern.period + 1,
+                           dtype=numpy.int64)
+    offsets = numpy.array(pattern.offsets, dtype=numpy.int64)
+    ordinals = (pattern.anchor + periods[:, None] * pattern.period + offsets[None, :]).ravel()
+    ordinals = ordinals[(ordinals >= lo) & (ordinals < hi)]
+    if pattern.except_months:
+        allowed = numpy.ones(13, dtype=bool)
+        allowed[list(pattern.except_months)] = False
+        ordinals = ordinals[allowed[_months_of(ordinals)]]
+
+    return ordinals
+
+
+def _month_grid(pattern, lo, hi):
+    """
+    Every occurrence of a turoboro.arithmetic.MonthPattern in [lo, hi): the rule's day in every candidate month, with
+    the months that do not have such a day masked out.
+    """
+    months = _grid(pattern.months, *pattern._months(lo, hi))
+    starts = _month_starts(months)
+    ends = _month_starts(months + 1)
+    if pattern.day is not None:
+        ordinals = starts + pattern.day - 1
+    else:
+        ordinals = starts + (pattern.weekday - (starts + 6) % 7) % 7 + 7 * (pattern.weekday_count - 1)
+
+    return ordinals[ordinals < ends]
+
+
+def ordinals(pattern, lo, hi):
+    """
+    Every occurrence of a pattern in [lo, hi) as an array of day ordinals.
+    :param pattern: The pattern of a rule, see `Rule._pattern`
+    :type pattern: turoboro.arithmetic.OrdinalPattern | turoboro.arithmetic.MonthPattern
+    :param lo: The first ordinal to consider
+    :type lo: int
+    :param hi: The first ordinal to not consider
+    :type hi: int
+    :return: numpy.ndarray
+    """
+    _require_numpy()
+    hi = min(hi, turoboro.arithmetic.MAX_ORDINAL + 1)
+    if isinstance(pattern, turoboro.arithmetic.MonthPattern):
+        return _month_grid(pattern, lo, hi)
+
+    return _grid(pattern, lo, hi)
+
+
+def to_iso(instants):
+    """
+    Formats an array of UTC instants the way `Rule.repr_dt` does, i.e `2014-01-01T08:00:00+00:00`
+    :param instants: An array of datetime64
+    :type instants: numpy.ndarray
+    :return: list
+    """
+    _require_numpy()
+    return numpy.char.add(numpy.datetime_as_string(instants, unit='s'), '+00:00').tolist()
+
+
+def to_posix(instants):
+    """
+    Converts an array of UTC instants to POSIX timestamps.
+    :param instants: An array of datetime64
+    :type instants: numpy.ndarray
+    :return: list
+    """
+    _require_numpy()
+    return instants.astype('datetime64[s]').astype(numpy.int64).tolist()
+
+
+def to_datetimes(instants):
+    _require_numpy()
+    return [dt.replace(tzinfo=turoboro.tz.UTC) for dt in instants.astype('datetime64[us]').astype(object)]
+
+
+def convert_array_to(instants, to=turoboro.ISO):
+    if to == turoboro.ISO:
+        return to_iso(instants)
+    if to == turoboro.POSIX:
+        return to_posix(instants)
+
+    return to_datetimes(instants)
+
+
+class ArrayResult(Result):
+    """
+    A Result that holds its occurrences as a numpy array of UTC instants (datetime64[s]) and formats them all at once.
+    """
+    __slots__ = ()
+
+    def compact(self):
+        return self
+
+    def formatted_list(self, _list):
+        return convert_array_to(_list, self.return_as)
+
+    def _instant(self, dt):
+        if dt.tzinfo is None:
+            dt = self.rule.timezone.localize(dt)
+        return numpy.datetime64(calendar.timegm(dt.utctimetuple()), 's')
+
+    def _bisect(self, dt, right=False):
+        return int(numpy.searchsorted(self.datetimes, self._instant(dt), side='right' if right else 'left'))
+
+
+def to_timestamps(rule, ordinals):
+    """
+    The POSIX timestamps of the occurrences of a rule on an array of ordinals, looking the UTC offset of each up in
+    the `turoboro.offsets.OffsetTable` of the rule's timezone.
+    :param rule: The rule
+    :type rule: turoboro.rules.Rule
+    :param ordinals: The days of the occurrences
+    :type ordinals: numpy.ndarray
+    :return: numpy.ndarray
+    """
+    working_date = rule.start_datetime
+    offsets = rule._offsets()
+    if offsets.fixed_offset is not None:
+        return calendar.timegm(working_date.utctimetuple()) + (ordinals - working_date.toordinal()) * SECONDS_PER_DAY
+
+    walls = turoboro.offsets.wall_seconds(working_date) + (ordinals - working_date.toordinal()) * SECONDS_PER_DAY
+    # The first wall clock time of the table is minus infinity
+    index = numpy.searchsorted(numpy.array(offsets.walls[1:], dtype=numpy.int64), walls, side='right')
+    timestamps = walls - numpy.array(offsets.offsets, dtype=numpy.int64)[index]
+    beyond = walls >= offsets.wall_end
+    if beyond.any():
+        # Beyond the end of the table, the offsets are asked of the timezone
+        timestamps[beyond] = [offsets.to_utc(int(wall)) for wall in walls[beyond]]
+    return timestamps
+
+
+def compute(rule, from_dt=None, max_count_if_infinite=100, return_as=turoboro.ISO):
+    """
+    Computes the occurrences of a rule, exactly as `Rule.compute` does, into a numpy array.
+    :param rule: The rule to compute
+    :type rule: turoboro.rules.Rule
+    :param from_dt: Compute from this datetime
+    :type from_dt: datetime | None
+    :param max_count_if_infinite: The number of occurrences to compute for infinite rules
+    :type max_count_if_infinite: int
+    :param return_as: How `first`, `last`, `all` and `segment` of the result represent occurrences
+    :type return_as: str
+    :return: turoboro.vectorized.ArrayResult
+    """
+    _require_numpy()
+    working_date = rule.start_datetime
+    if from_dt is not None and from_dt.tzinfo is None:
+        from_dt = rule.timezone.localize(from_dt)
+
+    pattern = rule._pattern()
+    lo, hi = rule._bounds(pattern, from_dt, working_date)
+    infinite = rule.spec['end'] is None and rule.spec['repeat'] is None
+    if infinite:
+        last = pattern.nth(max_count_if_infinite - 1, lo) if max_count_if_infinite > 0 else lo - 1
+        hi = None if last is None else last + 1
+
+    days = ordinals(pattern, lo, turoboro.arithmetic.MAX_ORDINAL + 1 if hi is None else hi)
+    if infinite:
+        days = days[:max(max_count_if_infinite, 0)]
+    seconds = to_timestamps(rule, days)
+
+    return ArrayResult(seconds.astype('datetime64[s]'), rule, infinite=infinite, return_as=return_as)
@@ -1,9 +1,9 @@
 from turoboro.rules import Rule
+import turoboro.arithmetic
 import turoboro.common
 import voluptuous
-import pytz
-from datetime import datetime, timedelta
-from turoboro.result import Result
+import turoboro.tz
+from datetime import datetime
 
 
 class WeeklyRule(Rule):
@@ -32,7 +32,7 @@ class WeeklyRule(Rule):
             )
         ),
         'on_hour': voluptuous.Range(min=0, max=23),
-        'timezone': voluptuous.In(pytz.all_timezones)
+        'timezone': turoboro.tz.is_timezone
     })
 
     def __init__(self, start, on_days, end_on=None, repeat_n_times=None, every_nth_week=1,
@@ -40,7 +40,7 @@ class WeeklyRule(Rule):
         if not isinstance(start, datetime):
             raise ValueError('You must specify a datetime')
 
-        tz = pytz.timezone(timezone)
+        tz = turoboro.tz.timezone(timezone)
         start = start.replace(hour=0, minute=0, second=0, microsecond=0)
         start = tz.localize(start)
 
@@ -84,11 +84,17 @@ class WeeklyRule(Rule):
 
     @classmethod
     def factory(cls, spec):
-        daily_rule = cls(datetime.utcnow(), (0,))
-        if daily_rule.validate_spec(spec):
-            daily_rule.spec = spec
+        weekly_rule = cls.__new__(cls)
+        weekly_rule.spec = spec
 
-        return daily_rule
+        return weekly_rule
+
+    def _binary_fields(self):
+        return turoboro.common.to_mask(self.spec['on_days']), 0, self.spec['every_nth_week'], 0
+
+    @classmethod
+    def _spec_from_binary_fields(cls, weekday_mask, day, step, flags):
+        return {'on_days': turoboro.common.from_mask(weekday_mask), 'every_nth_week': step}
 
     def every_nth_week(self, n):
         """
@@ -113,15 +119,14 @@ class WeeklyRule(Rule):
         self.set_if_valid('on_days', days)
         return self
 
-    def validate_spec(self, spec):
+    def _check_invariants(self, spec, starting_day):
         """
-        Validates the rule specification
+        Checks the constraints between the fields of the rule specification
         :param spec: The spec we are attempting to accept
         :type spec: dict
-        :return: dict
+        :param starting_day: The start of the spec, as a naive datetime
+        :type starting_day: datetime
         """
-        starting_day = turoboro.common.datetime_from_isoformat(spec['start'])
-
         if spec['end'] is not None and spec['end'] <= spec['start']:
             raise ValueError("End date (%s) must be None or after start date (%s)" % (spec['end'], spec['start']))
 
@@ -134,79 +139,23 @@ class WeeklyRule(Rule):
         if spec['end'] is not None and spec['repeat'] is not None:
             raise ValueError('You may not specify both an end date and a repeat count')
 
-        return self.SPEC_SCHEMA(spec)
-
-    def _stagger_forward(self, from_dt):
-        """
-        :param from_dt: the datetime we want to stagger forward from
-        :type from_dt: datetime
-        :return: datetime
-        """
-        from_dt = from_dt.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-
-        # Always start on Monday
-        from_dt -= timedelta(from_dt.weekday())
-
-        period_delta = from_dt - self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
-
-        if period_delta.days < 0:
-            return self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['start']))
-
-        number_of_weeks_passed_since_start = int(period_delta.days/7)
-        number_of_weeks_passed_since_start += 1 if period_delta.days % 7 else 0
-        pad_with_weeks = self.spec['every_nth_week'] - number_of_weeks_passed_since_start % self.spec['every_nth_week']
-
-        from_dt = from_dt + timedelta(days=7*pad_with_weeks)
-
-        return from_dt
+    def _day_filter(self):
+        return turoboro.arithmetic.day_filter(
+            turoboro.common.to_mask(self.spec['on_days']),
+            turoboro.arithmetic.MONTH_MASK & ~turoboro.common.to_mask(self.spec['except_months'], turoboro.JANUARY)
+        )
 
     def _is_allowed(self, dt):
-        if self.spec['except_months'] is not None and dt.month in self.spec['except_months']:
-            return False
-
-        if dt.weekday() not in self.spec['on_days']:
-            return False
-
-        return True
-
-    def _compute_with_end_date(self, from_dt, working_date, return_as):
-        result = []
-        if from_dt is not None and from_dt != working_date:
-            working_date = self._stagger_forward(from_dt)
-
-        end_date = self.timezone.localize(turoboro.common.datetime_from_isoformat(self.spec['end']))
-
-        while working_date < end_date:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-            working_date = self._bounce(working_date)
-
-        return Result(result, self, return_as=return_as)
-
-    def _compute_n_times(self, from_dt, working_date, return_as):
-        result = []
-        count = 0
-        if from_dt is not None:
-            from_dt = from_dt.replace(hour=self.spec['on_hour'], minute=0, second=0, microsecond=0)
-
-        while count < self.spec['repeat']:
-            if self._is_allowed(working_date):
-                result.append(working_date)
-                count += 1
-
-            working_date = self._bounce(working_date)
-
-        return Result(result, self, return_as=return_as, segment_from=from_dt)
+        return bool(self._derived_state('day_filter', self._day_filter) >> (7 * dt.month + dt.weekday()) & 1)
 
-    def _bounce(self, working_date):
+    def _compile_pattern(self):
         """
-        Given a certain date - lets bounce ahead into the future until the next day, unless we have set every_nth_week,
-        and it happens to be a Sunday, then we bounce forward every_nth_week weeks, + one day to end up on a monday.
-        :param working_date:
-        :type: datetime
-        :return: datetime
+        Candidate days are the `on_days` of every `every_nth_week` week, counting weeks from the Monday of the week
+        the rule starts in.
+        :return: turoboro.arithmetic.OrdinalPattern
         """
-        if working_date.weekday() == turoboro.SUNDAY and self.spec['every_nth_week'] > 1:
-            working_date += timedelta(days=7 * self.spec['every_nth_week'] - 6)
-        working_date += timedelta(days=1)
-        return working_date
+        start = turoboro.common.datetime_from_isoformat(self.spec['start']).toordinal()
+        return turoboro.arithmetic.OrdinalPattern(
+            start - turoboro.arithmetic.weekday(start), 7 * self.spec['every_nth_week'], self.spec['on_days'], start,
+            self.spec['except_months']
+        )
@@ -0,0 +1,188 @@
+"""
+A process-wide cache of the days each year that a pattern occurs on, kept per (pattern shape, year) so that rules of
+the same shape share them. Two rules have the same shape when they differ only in where they start and end (and in
+their hour and timezone, which only come into play when days are turned into timestamps), like daily rules that skip
+weekends, or weekly rules on Mondays and Thursdays.
+
+    >>> list(turoboro.year_cache.ordinals(rule._pattern(), lo, hi))
+    >>> turoboro.year_cache.cache_info()
+    CacheInfo(hits=1998, misses=2, maxsize=4096, currsize=2)
+
+`Rule.compute`, `Rule.result` and `turoboro.compute_many` find occurrences through the cache (`turoboro.export`
+doesn't, as its windows may reach far beyond the years worth keeping). The number of years kept is bounded, the least recently used ones are evicted first,
+see `set_maxsize`.
+"""
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from datetime import MAXYEAR, date
+import threading
+import turoboro.arithmetic
+
+DEFAULT_MAXSIZE = 4096
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+class YearCalendar(object):
+    """
+    The days of a year that a pattern occurs on.
+    :param start: The ordinal of the 1st of January
+    :type start: int
+    :param days: The occurrences, as days since the 1st of January
+    :type days: array.array
+    """
+    __slots__ = ('start', 'days')
+
+    def __init__(self, start, days):
+        self.start = start
+        self.days = days
+
+    @property
+    def bitmap(self):
+        """
+        The occurrences as the bits of an int, where bit `n` is `n` days after the 1st of January. Bitmaps of patterns
+        combine with `&` and `|`, e.g. into the days of the year that two rules have in common.
+        :return: int
+        """
+        bitmap = 0
+        for day in self.days:
+            bitmap |= 1 << day
+        return bitmap
+
+
+def _year_start(year):
+    return turoboro.arithmetic.days_before_year(year) + 1
+
+
+def year_calendar(pattern, year):
+    """
+    Works out the days of a year that a pattern, or any pattern of the same shape, occurs on.
+    :param pattern: The pattern
+    :type pattern: turoboro.arithmetic.OrdinalPattern | turoboro.arithmetic.MonthPattern
+    :param year: The year
+    :type year: int
+    :return: turoboro.year_cache.YearCalendar
+    """
+    start = _year_start(year)
+    end = _year_start(year + 1) if year < MAXYEAR else turoboro.arithmetic.MAX_ORDINAL + 1
+    return YearCalendar(start, array('H', [ordinal - start for ordinal in pattern.unbounded().iterate(start, end)]))
+
+
+class YearCache(object):
+    """
+    A thread safe least recently used cache of `YearCalendar`s by (pattern shape, year).
+    :param maxsize: The number of years to keep
+    :type maxsize: int
+    """
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._calendars = OrderedDict()
+        self._lock = threading.Lock()
+
+    def calendar(self, pattern, year, shape=None):
+        """
+        :param pattern: The pattern
+        :type pattern: turoboro.arithmetic.OrdinalPattern | turoboro.arithmetic.MonthPattern
+        :param year: The year
+        :type year: int
+        :param shape: The shape of the pattern, if already known
+        :type shape: tuple | None
+        :return: turoboro.year_cache.YearCalendar
+        """
+        key = (pattern.shape if shape is None else shape, year)
+        with self._lock:
+            calendar = self._calendars.pop(key, None)
+            if calendar is not None:
+                self._calendars[key] = calendar
+                self.hits += 1
+                return calendar
+            self.misses += 1
+
+        calendar = year_calendar(pattern, year)
+        with self._lock:
+            self._calendars[key] = calendar
+            while len(self._calendars) > self.maxsize:
+                self._calendars.popitem(last=False)
+        return calendar
+
+    def ordinals(self, pattern, lo, hi):
+        """
+        Lazily yields every occurrence of a pattern in [lo, hi), from a slice of each year's calendar plus the ordinal
+        the year starts on. Years are only looked up as iterating reaches them.
+        :param pattern: The pattern
+        :type pattern: turoboro.arithmetic.OrdinalPattern | turoboro.arithmetic.MonthPattern
+        :param lo: The first ordinal to consider
+        :type lo: int
+        :param hi: The first ordinal to not consider
+        :type hi: int
+        :return: generator
+        """
+        lo = max(lo, pattern.first)
+        hi = min(hi, turoboro.arithmetic.MAX_ORDINAL + 1)
+        if lo >= hi:
+            return
+
+        shape = pattern.shape
+        year = date.fromordinal(lo).year
+        while year <= MAXYEAR and _year_start(year) < hi:
+            calendar = self.calendar(pattern, year, shape)
+            start, days = calendar.start, calendar.days
+            first = bisect_left(days, lo - start) if lo > start else 0
+            for day in days[first:bisect_left(days, hi - start)]:
+                yield start + day
+            year += 1
+
+    def info(self):
+        """
+        :return: turoboro.year_cache.CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._calendars))
+
+    def resize(self, maxsize):
+        """
+        :param maxsize: The number of years to keep, evicting the least recently used ones above that
+        :type maxsize: int
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._calendars) > maxsize:
+                self._calendars.popitem(last=False)
+
+    def clear(self):
+        """ Evicts every year and resets the statistics """
+        with self._lock:
+            self._calendars.clear()
+            self.hits = self.misses = 0
+
+
+CACHE = YearCache()
+
+
+def ordinals(pattern, lo, hi):
+    """ See `YearCache.ordinals`, through the process-wide cache """
+    return CACHE.ordinals(pattern, lo, hi)
+
+
+def cache_info():
+    """
+    The hits, misses, maximum and current size of the process-wide cache, as `functools.lru_cache` reports them.
+    :return: turoboro.year_cache.CacheInfo
+    """
+    return CACHE.info()
+
+
+def set_maxsize(maxsize):
+    """
+    :param maxsize: The number of years the process-wide cache keeps
+    :type maxsize: int
+    """
+    CACHE.resize(maxsize)
+
+
+def clear():
+    """ Empties the process-wide cache and resets its statistics """
+    CACHE.clear()